@@ -0,0 +1,142 @@
+"""This module evaluates many Tic Tac Toe boards at once with vectorized NumPy operations.
+
+Boards are integer arrays where 0 is an empty cell, 1 is 'X' and 2 is 'O', shaped either
+(N, rows * columns) or (N, rows, columns). Win detection gathers every line of the board for
+all N boards in one indexing operation, so millions of logged positions are evaluated without
+a Python-level loop over boards.
+
+Dependencies:
+    - numpy: Required by this module only; the rest of the game does not need it.
+    - gameboard: Provides the line tables shared with BoardClass.
+
+Usage:
+    status, legal = evaluateBatch(boards)
+    wins_for_x = boards[status == X_WINS]
+"""
+import math
+import numpy as np
+from gameboard import winningLines
+
+EMPTY = 0
+XMARK = 1
+OMARK = 2
+
+ONGOING = 0
+X_WINS = 1
+O_WINS = 2
+DRAW = 3
+
+MARK_CODES = {' ': EMPTY, 'X': XMARK, 'O': OMARK}
+# Bytes of gathered line cells per vectorized step; the comparison masks add two more of the same size.
+CHUNK_BYTES = 1 << 24
+
+
+def boardsToArray(game_boards: list) -> np.ndarray:
+    """Converts BoardClass instances of the same shape into an (N, rows, columns) array.
+
+    Args:
+        game_boards (list): BoardClass instances.
+
+    Returns:
+        np.ndarray: The boards encoded with EMPTY, XMARK and OMARK.
+    """
+    return np.array([[[MARK_CODES[game_board.getCell(row, col)] for col in range(game_board.columns)]
+                      for row in range(game_board.rows)] for game_board in game_boards], dtype=np.int8)
+
+
+def flattenBoards(boards, rows: int = None, columns: int = None) -> tuple:
+    """Reshapes a batch of boards to (N, rows * columns).
+
+    Args:
+        boards (array-like): Boards shaped (N, rows * columns) or (N, rows, columns).
+        rows (int, optional): Number of rows; inferred for 3D input or square 2D input.
+        columns (int, optional): Number of columns; inferred like rows.
+
+    Returns:
+        tuple: The flattened array, the number of rows and the number of columns.
+    """
+    boards = np.asarray(boards)
+    if boards.ndim == 3:
+        return boards.reshape(boards.shape[0], -1), boards.shape[1], boards.shape[2]
+    if boards.ndim != 2:
+        raise ValueError(f"expected a 2D or 3D array of boards, got {boards.ndim} dimensions")
+    if rows is None and columns is None:
+        rows = columns = math.isqrt(boards.shape[1])
+    elif rows is None:
+        rows = boards.shape[1] // columns
+    elif columns is None:
+        columns = boards.shape[1] // rows
+    if rows * columns != boards.shape[1]:
+        raise ValueError(f"boards of {boards.shape[1]} cells are not {rows}x{columns}")
+    return boards, rows, columns
+
+
+def evaluateBoards(boards, rows: int = None, columns: int = None, winlength: int = None, chunksize: int = None) -> np.ndarray:
+    """Returns the status of every board in a batch.
+
+    A board on which both sides hold a line cannot arise in a legal game and is reported as X_WINS.
+
+    Args:
+        boards (array-like): Boards shaped (N, rows * columns) or (N, rows, columns).
+        rows (int, optional): Number of rows for 2D input.
+        columns (int, optional): Number of columns for 2D input.
+        winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+        chunksize (int, optional): Boards evaluated per vectorized step, bounding temporary memory;
+            by default as many as gather CHUNK_BYTES of line cells.
+
+    Returns:
+        np.ndarray: An int8 array of ONGOING, X_WINS, O_WINS or DRAW per board.
+    """
+    flat, rows, columns = flattenBoards(boards, rows, columns)
+    flat = flat.astype(np.int8, copy=False)
+    if winlength is None:
+        winlength = min(rows, columns)
+    lines = np.array(winningLines(rows, columns, winlength), dtype=np.intp)
+    if chunksize is None:
+        chunksize = max(CHUNK_BYTES // max(len(lines) * winlength, 1), 1)
+    status = np.empty(flat.shape[0], dtype=np.int8)
+    for start in range(0, flat.shape[0], chunksize):
+        chunk = flat[start:start + chunksize]
+        cells = chunk[:, lines]
+        xwins = (cells == XMARK).all(axis=2).any(axis=1)
+        owins = (cells == OMARK).all(axis=2).any(axis=1)
+        full = (chunk != EMPTY).all(axis=1)
+        status[start:start + chunksize] = np.where(xwins, X_WINS, np.where(owins, O_WINS, np.where(full, DRAW, ONGOING)))
+    return status
+
+
+def legalMoves(boards, status: np.ndarray = None, rows: int = None, columns: int = None, winlength: int = None) -> np.ndarray:
+    """Returns the legal-move mask of every board in a batch.
+
+    Args:
+        boards (array-like): Boards shaped (N, rows * columns) or (N, rows, columns).
+        status (np.ndarray, optional): Result of evaluateBoards() if already computed.
+        rows (int, optional): Number of rows for 2D input.
+        columns (int, optional): Number of columns for 2D input.
+        winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+
+    Returns:
+        np.ndarray: A boolean array shaped like boards, True where a move may be played.
+            Boards whose game is over have no legal moves.
+    """
+    boards = np.asarray(boards)
+    if status is None:
+        status = evaluateBoards(boards, rows, columns, winlength)
+    ongoing = (status == ONGOING).reshape((-1,) + (1,) * (boards.ndim - 1))
+    return (boards == EMPTY) & ongoing
+
+
+def evaluateBatch(boards, rows: int = None, columns: int = None, winlength: int = None) -> tuple:
+    """Returns the status and legal-move mask of every board in a batch.
+
+    Args:
+        boards (array-like): Boards shaped (N, rows * columns) or (N, rows, columns).
+        rows (int, optional): Number of rows for 2D input.
+        columns (int, optional): Number of columns for 2D input.
+        winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+
+    Returns:
+        tuple: The status array from evaluateBoards() and the mask from legalMoves().
+    """
+    status = evaluateBoards(boards, rows, columns, winlength)
+    return status, legalMoves(boards, status)
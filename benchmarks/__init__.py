@@ -0,0 +1,60 @@
+"""Benchmarks for the Tic Tac Toe engine, wire protocol and networking paths.
+
+Each benchmark module exposes a ``run()`` function returning a list of result dicts and can be
+executed on its own with ``python -m benchmarks.<module>``. Results are written as JSON so runs
+from different versions can be compared; timing results are compared on per_op_ns, and results
+that measure something else name the field to compare in 'metric'.
+"""
+import json
+import sys
+import time
+
+
+def measure(name: str, func, number: int, repeat: int = 5, **extra) -> dict:
+    """Times a callable and keeps the best of several repeats.
+
+    Args:
+        name (str): Name of the benchmark.
+        func (callable): Zero-argument callable running `number` operations per call.
+        number (int): Operations performed by one call of func.
+        repeat (int): Number of timed calls; the fastest one is reported.
+        **extra: Additional fields copied into the result.
+
+    Returns:
+        dict: The benchmark name, operation count, best time and derived rates.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    result = {
+        'name': name,
+        'number': number,
+        'best_s': best,
+        'per_op_ns': best / number * 1e9,
+        'ops_per_s': number / best if best else float('inf'),
+    }
+    result.update(extra)
+    return result
+
+
+def writeResults(results: list, path: str = None):
+    """Writes benchmark results as JSON.
+
+    Args:
+        results (list): Result dicts produced by measure().
+        path (str, optional): Output file; results go to stdout when omitted.
+    """
+    document = {
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'timestamp': time.time(),
+        'results': results,
+    }
+    if path is None:
+        json.dump(document, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(path, 'w') as output:
+            json.dump(document, output, indent=2)
@@ -0,0 +1,60 @@
+"""Runs the benchmark suite and optionally compares it with an earlier run.
+
+Usage:
+    python -m benchmarks --output current.json
+    python -m benchmarks --compare baseline.json
+    python -m benchmarks --only bench_board bench_roundtrip
+    python -m benchmarks --only bench_memory
+    python -m benchmarks --only bench_startup
+"""
+import argparse
+import importlib
+import json
+import sys
+from benchmarks import writeResults
+
+SUITES = ['bench_board', 'bench_protocol', 'bench_roundtrip', 'bench_memory', 'bench_startup']
+
+
+def compareResults(results: list, path: str):
+    """Prints how each benchmark changed relative to a saved run.
+
+    Results are compared on per_op_ns unless they name another field in 'metric'.
+
+    Args:
+        results (list): Result dicts from the current run.
+        path (str): JSON file written by an earlier run.
+    """
+    with open(path) as baseline_file:
+        baseline = {result['name']: result for result in json.load(baseline_file)['results']}
+    for result in results:
+        metric = result.get('metric', 'per_op_ns')
+        before = baseline.get(result['name'])
+        if before is None:
+            print(f"{result['name']}: new ({result[metric]:.0f} {metric})", file=sys.stderr)
+            continue
+        ratio = result[metric] / before[metric]
+        print(f"{result['name']}: {before[metric]:.0f} -> {result[metric]:.0f} {metric} ({ratio:.2f}x)", file=sys.stderr)
+
+
+def main(argv: list = None):
+    """Parses the command line and runs the selected suites.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Run the Tic Tac Toe benchmark suite.")
+    parser.add_argument('--only', nargs='+', choices=SUITES, default=SUITES)
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare against")
+    args = parser.parse_args(argv)
+    results = []
+    for name in args.only:
+        results += importlib.import_module(f'benchmarks.{name}').run()
+    writeResults(results, args.output)
+    if args.compare:
+        compareResults(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmarks for the BoardClass engines.
+
+Measures updateGameBoard, isWinner, boardIsFull, resetGameBoard and computeStats on both
+BoardClass and BitBoardClass, plus a 15x15 five-in-a-row BoardClass to track large boards.
+
+Usage:
+    python -m benchmarks.bench_board [--output results.json]
+"""
+import argparse
+from bitboard import BitBoardClass
+from gameboard import BoardClass
+from benchmarks import measure, writeResults
+
+# A full game that ends in a tie, so no move along the way completes a line.
+TIE_GAME = [(0, 0), (1, 1), (2, 2), (0, 1), (2, 1), (2, 0), (0, 2), (1, 2), (1, 0)]
+
+
+def newBoard(factory):
+    """Returns a board with named players and a stats profile, ready to play."""
+    game_board = factory()
+    game_board.setPlayer1Name("Player1")
+    game_board.setPlayer2Name("Player2")
+    game_board.addWinLoss("Player1")
+    game_board.addWinLoss("Player2")
+    game_board.setPlayerProfile1()
+    return game_board
+
+
+def midGameBoard(factory):
+    """Returns a board four moves into TIE_GAME, with no winner and empty cells left."""
+    game_board = newBoard(factory)
+    for row, col in TIE_GAME[:4]:
+        game_board.updateGameBoard(row, col)
+        game_board.changePlayerTurn()
+    return game_board
+
+
+def benchEngine(label: str, factory, number: int) -> list:
+    """Measures the board methods of one engine."""
+    results = []
+
+    game_board = newBoard(factory)
+    def update():
+        for _ in range(number // 9):
+            for row, col in TIE_GAME:
+                game_board.updateGameBoard(row, col)
+                game_board.changePlayerTurn()
+            game_board.resetGameBoard()
+            game_board.resetDefaultTurn()
+    results.append(measure(f'{label}.updateGameBoard', update, number // 9 * 9,
+                           note='includes changePlayerTurn and one resetGameBoard per 9 moves'))
+
+    game_board = midGameBoard(factory)
+    def winner():
+        for _ in range(number):
+            game_board.isWinner()
+    results.append(measure(f'{label}.isWinner', winner, number))
+
+    def full():
+        for _ in range(number):
+            game_board.boardIsFull()
+    results.append(measure(f'{label}.boardIsFull', full, number))
+
+    def reset():
+        for _ in range(number):
+            game_board.resetGameBoard()
+    results.append(measure(f'{label}.resetGameBoard', reset, number))
+
+    game_board = newBoard(factory)
+    def stats():
+        for _ in range(number):
+            game_board.computeStats()
+    results.append(measure(f'{label}.computeStats', stats, number))
+    return results
+
+
+def benchLargeBoard(number: int) -> dict:
+    """Measures a move plus win check and undo on a 15x15 five-in-a-row board."""
+    game_board = newBoard(lambda: BoardClass(15, winlength=5))
+    def move():
+        for _ in range(number):
+            game_board.updateGameBoard(7, 7)
+            game_board.hasWinner()
+            game_board.undoMove()
+    return measure('BoardClass(15, winlength=5) move+hasWinner+undo', move, number)
+
+
+def run(number: int = 100000) -> list:
+    """Runs every board benchmark.
+
+    Args:
+        number (int): Operations per benchmark.
+
+    Returns:
+        list: Result dicts.
+    """
+    results = benchEngine('BoardClass', BoardClass, number)
+    results += benchEngine('BitBoardClass', BitBoardClass, number)
+    results.append(benchLargeBoard(number))
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    writeResults(run(args.number), args.output)
@@ -0,0 +1,127 @@
+"""Memory benchmark of the server's per-session state.
+
+Two measurements, both taken with tracemalloc as the bytes still allocated per session:
+
+    - The board alone: a BoardClass and a CompactBoard set up the way a GameSession sets up
+      its board, to compare the two engines.
+    - A live idle session: a GameServer on loopback pairs clients that connect from a separate
+      process and then stay silent. Everything the server holds for them is counted, from the
+      sockets, streams and tasks of both connections to the session, its board and its token
+      and lobby entries, which is what bounds the number of open matches per host.
+
+Usage:
+    python -m benchmarks.bench_memory [--number 1000] [--output results.json]
+"""
+import argparse
+import asyncio
+import gc
+import multiprocessing
+import socket
+import tracemalloc
+import protocol
+from benchmarks import writeResults
+from compactboard import CompactBoard
+from gameboard import BoardClass
+from server import GameServer
+
+
+def allocatedPer(name: str, number: int, build) -> dict:
+    """Measures the memory still allocated per object after building many of them.
+
+    Args:
+        name (str): Name of the benchmark.
+        number (int): Number of objects to build.
+        build (callable): Called as build(index); returns the object.
+
+    Returns:
+        dict: The benchmark name, object count and bytes per object.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [build(index) for index in range(number)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return {'name': name, 'number': number, 'bytes_per_session': (after - before) / number,
+            'metric': 'bytes_per_session'}
+
+
+def sessionBoard(factory, index: int):
+    """Returns a board set up the way GameSession sets up its own."""
+    game_board = factory()
+    game_board.setPlayer1Name(f"player{index:06d}a")
+    game_board.setPlayer2Name(f"player{index:06d}b")
+    if hasattr(game_board, 'addWinLoss'):
+        game_board.addWinLoss(game_board.player1)
+        game_board.addWinLoss(game_board.player2)
+    game_board.resetDefaultTurn()
+    return game_board
+
+
+def benchBoards(number: int) -> list:
+    """Measures the bytes per board of both engines."""
+    return [allocatedPer(f'{factory.__name__} bytes per session', number, lambda index: sessionBoard(factory, index))
+            for factory in (BoardClass, CompactBoard)]
+
+
+def idleClients(port: int, sessions: int, done):
+    """Connects two clients per session, announces them and keeps them open until done is set.
+
+    Runs in its own process so that none of the clients' memory is counted.
+    """
+    sockets = []
+    for index in range(sessions * 2):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(protocol.encodeHello(f"idle{index:06d}"))
+        sockets.append(sock)
+    done.wait()
+    for sock in sockets:
+        sock.close()
+
+
+async def measureSessions(sessions: int) -> dict:
+    """Measures the bytes the server holds per live idle session."""
+    server = GameServer('127.0.0.1', 0, backlog=sessions * 2)
+    await server.start()
+    port = server.server.sockets[0].getsockname()[1]
+    context = multiprocessing.get_context('spawn')
+    done = context.Event()
+    clients = context.Process(target=idleClients, args=(port, sessions, done))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    clients.start()
+    try:
+        while len(server.sessions) < sessions:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.2)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+        done.set()
+        clients.join()
+        server.server.close()
+    return {'name': 'idle server session', 'number': sessions, 'bytes_per_session': (after - before) / sessions,
+            'metric': 'bytes_per_session'}
+
+
+def run(number: int = 1000) -> list:
+    """Runs the memory benchmarks.
+
+    Args:
+        number (int): Number of sessions to hold at once.
+
+    Returns:
+        list: Result dicts.
+    """
+    return benchBoards(number * 10) + [asyncio.run(measureSessions(number))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=1000)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    writeResults(run(args.number), args.output)
@@ -0,0 +1,93 @@
+"""Throughput benchmarks for the framed wire protocol.
+
+Measures encoding, decoding of coalesced and byte-by-byte partial reads, and end-to-end frame
+throughput over a loopback socketpair.
+
+Usage:
+    python -m benchmarks.bench_protocol [--output results.json]
+"""
+import argparse
+import socket
+import threading
+import protocol
+from benchmarks import measure, writeResults
+
+MOVES = [(row, col) for row in range(3) for col in range(3)]
+
+
+def benchEncode(number: int) -> dict:
+    """Measures MOVE frame encoding."""
+    def run():
+        for i in range(number):
+            row, col = MOVES[i % 9]
+            protocol.encodeMove(row, col)
+    return measure('protocol.encodeMove', run, number)
+
+
+def benchDecodeCoalesced(number: int) -> dict:
+    """Measures decoding of many frames delivered in a single read."""
+    stream = b''.join(protocol.encodeMove(*MOVES[i % 9]) for i in range(number))
+    def run():
+        decoder = protocol.FrameDecoder()
+        decoder.feed(stream)
+        assert len(decoder.frames) == number
+    return measure('FrameDecoder.feed coalesced', run, number)
+
+
+def benchDecodePartial(number: int) -> dict:
+    """Measures decoding when every frame arrives one byte at a time."""
+    stream = b''.join(protocol.encodeMove(*MOVES[i % 9]) for i in range(number))
+    chunks = [stream[i:i + 1] for i in range(len(stream))]
+    def run():
+        decoder = protocol.FrameDecoder()
+        for chunk in chunks:
+            decoder.feed(chunk)
+        assert len(decoder.frames) == number
+    return measure('FrameDecoder.feed partial', run, number)
+
+
+def benchSocketpair(number: int) -> dict:
+    """Measures frames per second streamed over a loopback socketpair."""
+    frames = [protocol.encodeMove(*MOVES[i % 9]) for i in range(number)]
+    def run():
+        sender, receiver = socket.socketpair()
+        def send():
+            for frame in frames:
+                sender.sendall(frame)
+        thread = threading.Thread(target=send)
+        thread.start()
+        decoder = protocol.FrameDecoder()
+        received = 0
+        while received < number:
+            decoder.feed(receiver.recv(65536))
+            received += len(decoder.frames)
+            decoder.frames.clear()
+        thread.join()
+        sender.close()
+        receiver.close()
+    return measure('socketpair frame throughput', run, number, bytes=sum(len(frame) for frame in frames))
+
+
+def run(number: int = 100000) -> list:
+    """Runs every protocol benchmark.
+
+    Args:
+        number (int): Frames processed per benchmark.
+
+    Returns:
+        list: Result dicts.
+    """
+    return [
+        benchEncode(number),
+        benchDecodeCoalesced(number),
+        benchDecodePartial(number // 10),
+        benchSocketpair(number),
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    writeResults(run(args.number), args.output)
@@ -0,0 +1,79 @@
+"""End-to-end benchmark of the move path over a loopback socketpair.
+
+One thread plays the opponent: it reads each MOVE frame, applies it to its own board and
+answers with a move of its own. The measured side sends a move, waits for the reply and
+applies it, the same work Player1 and Player2 do per turn minus the GUI.
+
+Usage:
+    python -m benchmarks.bench_roundtrip [--output results.json]
+"""
+import argparse
+import socket
+import threading
+import protocol
+from benchmarks import measure, writeResults
+from benchmarks.bench_board import TIE_GAME, newBoard
+from gameboard import BoardClass
+
+
+def opponent(sock: socket.socket, rounds: int):
+    """Answers every move received on sock with the next move of TIE_GAME."""
+    game_board = newBoard(BoardClass)
+    decoder = protocol.FrameDecoder()
+    for _ in range(rounds):
+        for index in range(0, len(TIE_GAME) - 1, 2):
+            msgtype, payload = protocol.readFrame(sock, decoder)
+            game_board.updateGameBoard(*protocol.decodeMove(payload))
+            game_board.changePlayerTurn()
+            row, col = TIE_GAME[index + 1]
+            game_board.updateGameBoard(row, col)
+            game_board.changePlayerTurn()
+            sock.sendall(protocol.encodeMove(row, col))
+        game_board.resetGameBoard()
+        game_board.resetDefaultTurn()
+
+
+def benchRoundtrip(rounds: int) -> dict:
+    """Measures send-receive-apply round trips of MOVE frames."""
+    movesperround = (len(TIE_GAME) - 1) // 2
+    def run():
+        local, remote = socket.socketpair()
+        thread = threading.Thread(target=opponent, args=(remote, rounds))
+        thread.start()
+        game_board = newBoard(BoardClass)
+        decoder = protocol.FrameDecoder()
+        for _ in range(rounds):
+            for index in range(0, len(TIE_GAME) - 1, 2):
+                row, col = TIE_GAME[index]
+                game_board.updateGameBoard(row, col)
+                game_board.changePlayerTurn()
+                local.sendall(protocol.encodeMove(row, col))
+                msgtype, payload = protocol.readFrame(local, decoder)
+                game_board.updateGameBoard(*protocol.decodeMove(payload))
+                game_board.changePlayerTurn()
+            game_board.resetGameBoard()
+            game_board.resetDefaultTurn()
+        thread.join()
+        local.close()
+        remote.close()
+    return measure('socketpair move round trip', run, rounds * movesperround, repeat=3)
+
+
+def run(number: int = 20000) -> list:
+    """Runs the round-trip benchmark.
+
+    Args:
+        number (int): Approximate number of round trips.
+
+    Returns:
+        list: Result dicts.
+    """
+    return [benchRoundtrip(max(1, number // 4))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=20000)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    writeResults(run(args.number), args.output)
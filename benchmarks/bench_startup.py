@@ -0,0 +1,71 @@
+"""Startup benchmark of the headless command line.
+
+Each subcommand of cli.py is launched in a fresh interpreter with -h. That imports the modules
+of the mode and parses its options before exiting, which is what a short-lived server or bot
+process pays before it does any work. A bare interpreter is timed for reference. Each result
+also records how many modules the mode loads and which of the modules reserved for other modes
+(tkinter, numpy, sqlite3) it loaded, which should be none.
+
+Usage:
+    python -m benchmarks.bench_startup [--number 10] [--output results.json]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from benchmarks import measure, writeResults
+from cli import COMMANDS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNWANTED = ('tkinter', 'numpy', 'sqlite3')
+PROBE = ("import sys, cli; cli.loadCommand({command!r}); "
+         "print(len(sys.modules)); print(' '.join(name for name in {unwanted!r} if name in sys.modules))")
+
+
+def launch(args: list) -> str:
+    """Runs the interpreter from the project root and returns what it printed."""
+    return subprocess.run([sys.executable, *args], cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                          check=True, text=True).stdout
+
+
+def loadedModules(command: str) -> tuple:
+    """Returns the number of modules a subcommand loads and the unwanted ones among them."""
+    count, unwanted = launch(['-c', PROBE.format(command=command, unwanted=UNWANTED)]).split('\n')[:2]
+    return int(count), unwanted.split()
+
+
+def benchCommand(command: str, number: int) -> dict:
+    """Measures the time to start a subcommand and print its options."""
+    modules, unwanted = loadedModules(command)
+    def run():
+        for _ in range(number):
+            launch(['cli.py', command, '-h'])
+    return measure(f'cli.py {command} startup', run, number, repeat=3, modules=modules, unwanted=unwanted)
+
+
+def benchInterpreter(number: int) -> dict:
+    """Measures the time to start a bare interpreter, the floor of every subcommand."""
+    def run():
+        for _ in range(number):
+            launch(['-c', 'pass'])
+    return measure('interpreter startup', run, number, repeat=3)
+
+
+def run(number: int = 10) -> list:
+    """Runs the startup benchmarks.
+
+    Args:
+        number (int): Launches per timed repeat.
+
+    Returns:
+        list: Result dicts.
+    """
+    return [benchInterpreter(number)] + [benchCommand(command, number) for command in COMMANDS]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--number', type=int, default=10)
+    parser.add_argument('--output')
+    args = parser.parse_args()
+    writeResults(run(args.number), args.output)
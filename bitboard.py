@@ -0,0 +1,183 @@
+"""This module provides a bitboard-backed variant of the Tic Tac Toe game board.
+
+Each side's marks are stored as a 9-bit integer mask where bit ``row * 3 + column`` is set
+when that cell is taken. Every one of the 512 possible masks is classified once against the
+eight line masks, so a win check is two table lookups instead of a rescan of the board.
+
+Usage:
+    BitBoardClass is a drop-in replacement for BoardClass and can be passed to Player1 or
+    Player2 unchanged. Bots and simulators should prefer the side-effect-free queries
+    `hasWinner()` and `isFull()` and call `recordWin()`/`recordTie()` explicitly.
+"""
+from gameboard import BoardClass
+
+FULL_MASK = 0b111111111
+
+LINE_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+
+CELL_LINES = tuple(tuple(line for line in LINE_MASKS if line & (1 << cell)) for cell in range(9))
+
+HAS_LINE = bytes(any(mask & line == line for line in LINE_MASKS) for mask in range(1 << 9))
+
+
+class BitBoardClass(BoardClass):
+    """
+    Represents a 3x3 game board for a Tic Tac Toe game using one bitmask per side.
+
+    Attributes:
+        xmask (int): 9-bit mask of the cells taken by Player 1 ('X').
+        omask (int): 9-bit mask of the cells taken by Player 2 ('O').
+        board (list): 2D list view of the game board, built from the masks on access.
+
+    Methods:
+        resetGameBoard(): Resets the game board to its default state.
+        getCell(row, column) -> str: Returns the mark stored in a cell.
+        setCell(row, column, mark): Stores a mark in a cell without validation.
+        applyMove(row, column) -> str: Places the current player's mark on the board.
+        isFull() -> bool: Checks if the game board is full without recording stats.
+        hasWinner() -> bool: Checks if either side's mask holds a line.
+        winningMark() -> str: Returns the mark that completed a line, or None.
+    """
+
+    def __init__(self):
+        """Initializes the BitBoardClass instance."""
+        self.xmask = 0
+        self.omask = 0
+        super().__init__()
+
+
+    @property
+    def board(self) -> list:
+        """list: 2D list of ' '/'X'/'O' strings built from the side masks."""
+        return [[self.getCell(row, col) for col in range(3)] for row in range(3)]
+
+
+    @board.setter
+    def board(self, rows: list):
+        """Loads the side masks from a 2D list of ' '/'X'/'O' strings and clears the history.
+
+        Args:
+            rows (list): 2D list representing the game board.
+        """
+        self.xmask = 0
+        self.omask = 0
+        self.history = []
+        self.boardhash = 0
+        for row in range(3):
+            for col in range(3):
+                self.setCell(row, col, rows[row][col])
+
+
+    def resetGameBoard(self):
+        """Resets the local game board to its default state."""
+        self.xmask = 0
+        self.omask = 0
+        self.history = []
+        self.boardhash = 0
+
+
+    def getCell(self, row: int, column: int) -> str:
+        """Returns the mark stored in a cell.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+
+        Returns:
+            str: ' ', 'X' or 'O'.
+        """
+        bit = 1 << (row * 3 + column)
+        if self.xmask & bit:
+            return 'X'
+        if self.omask & bit:
+            return 'O'
+        return ' '
+
+
+    def setCell(self, row: int, column: int, mark: str):
+        """Stores a mark in a cell without validation or notification.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+            mark (str): ' ', 'X' or 'O'.
+        """
+        keys = self.zobristkeys[row * 3 + column]
+        self.boardhash ^= keys[self.getCell(row, column)] ^ keys[mark]
+        bit = 1 << (row * 3 + column)
+        self.xmask &= ~bit
+        self.omask &= ~bit
+        if mark == 'X':
+            self.xmask |= bit
+        elif mark == 'O':
+            self.omask |= bit
+
+
+    def applyMove(self, row: int, column: int) -> str:
+        """Places the current player's mark on the board and notifies listeners.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+
+        Returns:
+            str: The mark that was placed, or None if the turn belongs to neither player.
+
+        Raises:
+            ValueError: If the cell is already taken.
+        """
+        bit = 1 << (row * 3 + column)
+        if (self.xmask | self.omask) & bit:
+            raise ValueError
+        if self.userturn == self.player1:
+            self.xmask |= bit
+            mark = 'X'
+        elif self.userturn == self.player2:
+            self.omask |= bit
+            mark = 'O'
+        else:
+            return None
+        self.boardhash ^= self.zobristkeys[row * 3 + column][mark]
+        self.history.append((row, column))
+        for listener in self.listeners:
+            listener(row, column, mark)
+        return mark
+
+
+    def isFull(self) -> bool:
+        """Checks if the game board is full without touching the statistics.
+
+        Returns:
+            bool: True if the game board is full, False otherwise.
+        """
+        return (self.xmask | self.omask) == FULL_MASK
+
+
+    def hasWinner(self) -> bool:
+        """Checks if there's a winner without touching the statistics.
+
+        Returns:
+            bool: True if there's a winner, False otherwise.
+        """
+        return bool(HAS_LINE[self.xmask] or HAS_LINE[self.omask])
+
+
+    def winningMark(self) -> str:
+        """Returns the mark that completed a line.
+
+        Returns:
+            str: 'X' or 'O' if a line is complete, None otherwise.
+        """
+        if HAS_LINE[self.xmask]:
+            return 'X'
+        if HAS_LINE[self.omask]:
+            return 'O'
+        return None
+
+
+if __name__ == "__main__":
+    pass
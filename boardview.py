@@ -0,0 +1,186 @@
+"""This module contains the game screen shared by both players' GUIs.
+
+A BoardView creates its labels and board buttons once and keeps them for the whole session, so
+a rematch resets the screen instead of rebuilding it. Changes to the cells, the subheading, the
+turn label, the waiting label and the buttons' state are only recorded when they are made and
+drawn together by one idle callback per event-loop tick, which compares them with what is on
+screen and touches only the widgets that actually changed.
+
+Dependencies:
+    - tkinter: The standard GUI library in Python.
+    - metrics: Times every redraw.
+
+Usage:
+    view = BoardView(root, 3, 3, player.clickButton)
+    view.setCell(0, 0, 'X')
+    view.setTurn("Turn: O")
+"""
+import tkinter as tk
+import time
+import metrics
+
+
+class BoardView():
+    """
+    Owns the game screen widgets and redraws them at most once per event-loop tick.
+
+    Attributes:
+        root (tk.Tk): The main tkinter root window.
+        heading (tk.Label): GUI label for the game heading.
+        subheading (tk.Label): GUI label for the game subheading.
+        turn_label (tk.Label): GUI label for displaying the current turn.
+        waitlabel (tk.Label): GUI label shown while waiting for the opponent's move.
+        buttons (list): 2D list of GUI buttons representing the game board.
+        marks (list): 2D list of the cell texts to draw.
+        drawnmarks (list): 2D list of the cell texts currently on screen.
+        dirty (set): (row, column) cells changed since the last redraw.
+        pending (dict): Screen settings changed since the last redraw, by name.
+        drawn (dict): Screen settings currently on screen, by name.
+        scheduled (str): Identifier of the pending idle redraw, or None.
+
+    Methods:
+        setCell(row, col, mark): Queues a cell's new mark.
+        setSubheading(text): Queues the subheading text.
+        setTurn(text): Queues the turn label text.
+        setEnabled(enabled): Queues enabling or disabling the board buttons.
+        setWaiting(waiting): Queues showing or hiding the waiting label.
+        isEnabled() -> bool: Returns whether the board accepts clicks, including queued changes.
+        reset(): Queues an empty board for a new game.
+        schedule(): Schedules a redraw for the next idle moment if none is pending.
+        flush(): Draws every queued change.
+        draw(name, value): Applies one screen setting to its widgets.
+    """
+
+    def __init__(self, root: tk.Tk, rows: int, columns: int, command):
+        """Initializes the BoardView instance and creates its widgets.
+
+        Args:
+            root (tk.Tk): The main tkinter root window.
+            rows (int): Number of rows on the board.
+            columns (int): Number of columns on the board.
+            command (callable): Called with (row, col) when a board button is clicked.
+        """
+        self.root = root
+        self.heading = tk.Label(root, text="Tic Tac Toe")
+        self.heading.grid(row=0, column=1)
+        self.subheading = tk.Label(root, text="Game Start!")
+        self.subheading.grid(row=1, column=1)
+        self.turn_label = tk.Label(root, text="")
+        self.turn_label.grid(row=2, column=1)
+        self.waitlabel = tk.Label(root, text="Waiting...")
+        self.buttons = []
+        for row in range(rows):
+            row_buttons = []
+            for col in range(columns):
+                button = tk.Button(root, text="", width=10, height=3, command=lambda row=row, col=col: command(row, col))
+                button.grid(row=row + 4, column=col)
+                row_buttons.append(button)
+            self.buttons.append(row_buttons)
+        self.marks = [[''] * columns for _ in range(rows)]
+        self.drawnmarks = [[''] * columns for _ in range(rows)]
+        self.dirty = set()
+        self.pending = {}
+        self.drawn = {'subheading': "Game Start!", 'turn': "", 'enabled': True, 'waiting': False}
+        self.scheduled = None
+
+
+    def setCell(self, row: int, col: int, mark: str):
+        """Queues a cell's new mark.
+
+        Args:
+            row (int): Row index of the changed cell.
+            col (int): Column index of the changed cell.
+            mark (str): The new mark of the cell, ' ' when cleared.
+        """
+        self.marks[row][col] = mark.strip()
+        self.dirty.add((row, col))
+        self.schedule()
+
+
+    def setSubheading(self, text: str):
+        """Queues the subheading text."""
+        self.pending['subheading'] = text
+        self.schedule()
+
+
+    def setTurn(self, text: str):
+        """Queues the turn label text."""
+        self.pending['turn'] = text
+        self.schedule()
+
+
+    def setEnabled(self, enabled: bool):
+        """Queues enabling or disabling all board buttons."""
+        self.pending['enabled'] = enabled
+        self.schedule()
+
+
+    def setWaiting(self, waiting: bool):
+        """Queues showing or hiding the waiting label."""
+        self.pending['waiting'] = waiting
+        self.schedule()
+
+
+    def isEnabled(self) -> bool:
+        """Returns whether the board accepts clicks, counting changes not drawn yet.
+
+        Returns:
+            bool: True if the buttons are, or are about to be, enabled.
+        """
+        return self.pending.get('enabled', self.drawn['enabled'])
+
+
+    def reset(self):
+        """Queues an empty, enabled board with the opening subheading for a new game."""
+        for row, marks in enumerate(self.marks):
+            for col in range(len(marks)):
+                marks[col] = ''
+                self.dirty.add((row, col))
+        self.pending.update(subheading="Game Start!", enabled=True, waiting=False)
+        self.schedule()
+
+
+    def schedule(self):
+        """Schedules a redraw for the next idle moment if none is pending."""
+        if self.scheduled is None:
+            self.scheduled = self.root.after_idle(self.flush)
+
+
+    def flush(self):
+        """Draws every queued change, skipping those that match what is already on screen."""
+        self.scheduled = None
+        start = time.perf_counter_ns()
+        for row, col in self.dirty:
+            mark = self.marks[row][col]
+            if self.drawnmarks[row][col] != mark:
+                self.buttons[row][col].config(text=mark)
+                self.drawnmarks[row][col] = mark
+        self.dirty.clear()
+        for name, value in self.pending.items():
+            if self.drawn[name] != value:
+                self.draw(name, value)
+                self.drawn[name] = value
+        self.pending.clear()
+        metrics.MOVE_RENDER.observeSince(start)
+
+
+    def draw(self, name: str, value):
+        """Applies one screen setting to its widgets.
+
+        Args:
+            name (str): 'subheading', 'turn', 'enabled' or 'waiting'.
+            value (object): The setting's new value.
+        """
+        if name == 'subheading':
+            self.subheading.config(text=value)
+        elif name == 'turn':
+            self.turn_label.config(text=value)
+        elif name == 'enabled':
+            state = "normal" if value else "disabled"
+            for row in self.buttons:
+                for button in row:
+                    button.config(state=state)
+        elif value:
+            self.waitlabel.grid(row=3, column=1)
+        else:
+            self.waitlabel.grid_remove()
@@ -0,0 +1,61 @@
+"""This module is the headless command line of the Tic Tac Toe project.
+
+One entry point runs every mode that does not need a display:
+
+    - serve: the asyncio game server, optionally as a pool of worker processes (server.py).
+    - bot: a swarm of bot clients playing against a server (loadgen.py).
+    - bench: the benchmark suite (benchmarks).
+    - replay: the size of a game archive or the final board of one of its games (gamerecord.py).
+
+Servers and bots are started by an autoscaler and often live only briefly, so the time spent
+importing is paid on every scale-up. This module therefore imports nothing but argparse and
+importlib, and each subcommand imports only the module it runs. Modules such as tkinter,
+numpy and sqlite3 load only in the modes that use them: the GUI players, batch evaluation and
+a server started with --stats-db. Everything after the subcommand is passed to that module's
+main() unchanged. The startup benchmark in benchmarks.bench_startup times each subcommand and
+checks that none of these modules gets loaded by mistake.
+
+Usage:
+    python cli.py serve --port 5000 --workers 0
+    python cli.py bot --port 5000 --clients 100 --games 20
+    python cli.py bench --only bench_startup
+    python cli.py replay games.ttr 42
+"""
+import argparse
+import importlib
+
+COMMANDS = {
+    'serve': 'server',
+    'bot': 'loadgen',
+    'bench': 'benchmarks.__main__',
+    'replay': 'gamerecord',
+}
+
+
+def loadCommand(command: str):
+    """Imports the module that runs a subcommand.
+
+    Args:
+        command (str): A key of COMMANDS.
+
+    Returns:
+        callable: The module's main(argv) function.
+    """
+    return importlib.import_module(COMMANDS[command]).main
+
+
+def main(argv: list = None):
+    """Parses the subcommand and hands the remaining arguments to its module.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Headless Tic Tac Toe server, bots, benchmarks and replays.")
+    parser.add_argument('command', choices=COMMANDS, help="mode to run; add -h after it for its options")
+    parser.add_argument('args', nargs=argparse.REMAINDER, help="arguments of the mode")
+    args = parser.parse_args(argv)
+    loadCommand(args.command)(args.args)
+
+
+if __name__ == "__main__":
+    main()
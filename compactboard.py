@@ -0,0 +1,308 @@
+"""This module provides a memory-compact game board for servers hosting many sessions at once.
+
+A BoardClass keeps its cells as one-character strings in nested lists, per-line counters for
+both marks and name-keyed dicts of wins and losses, which adds up to a few kilobytes per game
+even while nobody moves. CompactBoard holds the same game in a fixed set of slots:
+
+    - Each side's marks are one integer with bit ``row * columns + column`` set per taken cell,
+      so a board of any size is two ints. A move wins when one of the line masks through its
+      cell is fully covered; the masks are built once per board shape and shared.
+    - The players are interned name strings and the turn is the index of the seat to move, so
+      the names are stored once however many boards and connections refer to them.
+    - Wins are counted per seat in two ints; each seat's losses are the other seat's wins.
+    - The moves of the current game are kept in an unsigned short array of cell indexes.
+
+CompactBoard implements the part of the BoardClass interface the server uses, and snapshot()
+returns the same dict as BoardClass.snapshot(), so clients restore it unchanged.
+
+Usage:
+    game_board = CompactBoard(15, winlength=5)
+    game_board.setPlayer1Name("alice")
+    game_board.setPlayer2Name("bob")
+    game_board.applyMove(7, 7)
+"""
+import sys
+from array import array
+from functools import lru_cache
+from gameboard import ZOBRIST_TURN, cellLines, winningLines, zobristKeys
+
+MARKS = 'XO'
+
+
+@lru_cache(maxsize=None)
+def cellLineMasks(rows: int, columns: int, winlength: int) -> tuple:
+    """Returns the bitmasks of the lines through each cell of a board.
+
+    Args:
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+        winlength (int): Number of marks in a row needed to win.
+
+    Returns:
+        tuple: For each cell index, a tuple of line masks with one bit per cell of the line.
+    """
+    masks = tuple(sum(1 << cell for cell in line) for line in winningLines(rows, columns, winlength))
+    return tuple(tuple(masks[line] for line in lines) for lines in cellLines(rows, columns, winlength))
+
+
+class CompactBoard():
+    """
+    Represents the game board of one server session in a fixed set of slots.
+
+    Attributes:
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+        winlength (int): Number of marks in a row needed to win.
+        player1 (str): Interned name of Player 1.
+        player2 (str): Interned name of Player 2.
+        turn (int): Seat to move, 0 for Player 1 and 1 for Player 2.
+        xmask (int): Bitmask of the cells taken by Player 1 ('X').
+        omask (int): Bitmask of the cells taken by Player 2 ('O').
+        winner (str): The mark that completed a line in the current game, or None.
+        history (array): Cell indexes of the moves played in the current game.
+        boardhash (int): Zobrist hash of the marks on the board.
+        wins1 (int): Number of games won by Player 1.
+        wins2 (int): Number of games won by Player 2.
+        numties (int): Number of tied games.
+        gamesplayed (int): Number of games played.
+        linemasks (tuple): Masks of the lines through each cell, shared by boards of the same shape.
+        zobristkeys (tuple): Zobrist keys of each cell, shared by boards of the same shape.
+
+    Methods:
+        setPlayer1Name(user): Sets the name of Player 1.
+        setPlayer2Name(user): Sets the name of Player 2.
+        resetDefaultTurn(): Resets the turn to Player 1.
+        resetGameBoard(): Empties the board for a new game.
+        currentMark() -> str: Returns the mark of the player whose turn it is.
+        getCell(row, column) -> str: Returns the mark stored in a cell.
+        applyMove(row, column) -> str: Places the current player's mark on the board.
+        changePlayerTurn(): Passes the turn to the other player.
+        outcome() -> str: Returns the winning mark, 'tie', or None while in progress.
+        winningMark() -> str: Returns the mark that completed a line, or None.
+        isFull() -> bool: Checks if every cell is taken.
+        recordWin(): Records a win for the player whose turn it is.
+        recordTie(): Records a tied game.
+        updateGamesPlayed(): Updates the games played count.
+        digest() -> int: Returns the Zobrist hash of the board and turn.
+        snapshot() -> dict: Returns the full game state in the format of BoardClass.snapshot().
+    """
+
+    __slots__ = ('rows', 'columns', 'winlength', 'player1', 'player2', 'turn', 'xmask', 'omask', 'winner',
+                 'history', 'boardhash', 'wins1', 'wins2', 'numties', 'gamesplayed', 'linemasks', 'zobristkeys')
+
+    def __init__(self, rows: int = 3, columns: int = None, winlength: int = None):
+        """Initializes the CompactBoard instance.
+
+        Args:
+            rows (int): Number of rows on the board.
+            columns (int, optional): Number of columns, defaulting to rows.
+            winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+
+        Raises:
+            ValueError: If the win length does not fit on the board.
+        """
+        self.rows = rows
+        self.columns = rows if columns is None else columns
+        self.winlength = min(self.rows, self.columns) if winlength is None else winlength
+        if not 1 <= self.winlength <= max(self.rows, self.columns):
+            raise ValueError(f"a {self.rows}x{self.columns} board cannot have a win length of {self.winlength}")
+        self.linemasks = cellLineMasks(self.rows, self.columns, self.winlength)
+        self.zobristkeys = zobristKeys(self.rows, self.columns)
+        self.player1 = "Player1"
+        self.player2 = "Player2"
+        self.turn = 0
+        self.wins1 = 0
+        self.wins2 = 0
+        self.numties = 0
+        self.gamesplayed = 0
+        self.resetGameBoard()
+
+
+    @property
+    def userturn(self) -> str:
+        """str: Name of the player whose turn it is."""
+        return self.player2 if self.turn else self.player1
+
+
+    def setPlayer1Name(self, user: str):
+        """Sets the name of Player 1.
+
+        Args:
+            user (str): The name of Player 1.
+        """
+        self.player1 = sys.intern(user)
+
+
+    def setPlayer2Name(self, user: str):
+        """Sets the name of Player 2.
+
+        Args:
+            user (str): The name of Player 2.
+        """
+        self.player2 = sys.intern(user)
+
+
+    def resetDefaultTurn(self):
+        """Resets the turn to Player 1."""
+        self.turn = 0
+
+
+    def resetGameBoard(self):
+        """Empties the board for a new game."""
+        self.xmask = 0
+        self.omask = 0
+        self.winner = None
+        self.history = array('H')
+        self.boardhash = 0
+
+
+    def currentMark(self) -> str:
+        """Returns the mark of the player whose turn it is.
+
+        Returns:
+            str: 'X' for Player 1 or 'O' for Player 2.
+        """
+        return MARKS[self.turn]
+
+
+    def getCell(self, row: int, column: int) -> str:
+        """Returns the mark stored in a cell.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+
+        Returns:
+            str: ' ', 'X' or 'O'.
+        """
+        bit = 1 << (row * self.columns + column)
+        if self.xmask & bit:
+            return 'X'
+        if self.omask & bit:
+            return 'O'
+        return ' '
+
+
+    def applyMove(self, row: int, column: int) -> str:
+        """Places the current player's mark on the board.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+
+        Returns:
+            str: The mark that was placed.
+
+        Raises:
+            ValueError: If the cell is already taken.
+        """
+        cell = row * self.columns + column
+        bit = 1 << cell
+        if (self.xmask | self.omask) & bit:
+            raise ValueError
+        if self.turn:
+            mark = 'O'
+            mask = self.omask = self.omask | bit
+        else:
+            mark = 'X'
+            mask = self.xmask = self.xmask | bit
+        self.boardhash ^= self.zobristkeys[cell][mark]
+        self.history.append(cell)
+        for line in self.linemasks[cell]:
+            if mask & line == line:
+                self.winner = mark
+                break
+        return mark
+
+
+    def changePlayerTurn(self):
+        """Passes the turn to the other player."""
+        self.turn ^= 1
+
+
+    def outcome(self) -> str:
+        """Returns the result of the current game without touching the statistics.
+
+        Returns:
+            str: 'X' or 'O' for a win, 'tie' for a full board, or None while in progress.
+        """
+        if self.winner is not None:
+            return self.winner
+        if self.isFull():
+            return 'tie'
+        return None
+
+
+    def winningMark(self) -> str:
+        """Returns the mark that completed a line.
+
+        Returns:
+            str: 'X' or 'O' if a line is complete, None otherwise.
+        """
+        return self.winner
+
+
+    def isFull(self) -> bool:
+        """Checks if every cell is taken.
+
+        Returns:
+            bool: True if the game board is full, False otherwise.
+        """
+        return len(self.history) == self.rows * self.columns
+
+
+    def recordWin(self):
+        """Records a win for the player whose turn it is and a loss for their opponent."""
+        if self.turn:
+            self.wins2 += 1
+        else:
+            self.wins1 += 1
+
+
+    def recordTie(self):
+        """Records a tied game."""
+        self.numties += 1
+
+
+    def updateGamesPlayed(self):
+        """Updates the games played count."""
+        self.gamesplayed += 1
+
+
+    def digest(self) -> int:
+        """Returns the Zobrist hash of the board and of whose turn it is.
+
+        Returns:
+            int: The same 64-bit fingerprint BoardClass.digest() returns for the position.
+        """
+        if self.turn:
+            return self.boardhash ^ ZOBRIST_TURN
+        return self.boardhash
+
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the full game state in the format of BoardClass.snapshot().
+
+        Returns:
+            dict: Player names, turn, board shape, board, move history and statistics.
+        """
+        player1, player2 = self.player1, self.player2
+        return {
+            'rows': self.rows,
+            'columns': self.columns,
+            'winlength': self.winlength,
+            'player1': player1,
+            'player2': player2,
+            'userturn': self.userturn,
+            'playerprofile': None,
+            'board': tuple(tuple(self.getCell(row, col) for col in range(self.columns)) for row in range(self.rows)),
+            'history': tuple(divmod(cell, self.columns) for cell in self.history),
+            'gamesplayed': self.gamesplayed,
+            'numwins': {player1: self.wins1, player2: self.wins2},
+            'numlosses': {player1: self.wins2, player2: self.wins1},
+            'numties': self.numties,
+        }
+
+
+if __name__ == "__main__":
+    pass
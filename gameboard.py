@@ -1,4 +1,82 @@
-"""This module handles the logistics of creating and updating a Tic Tac Toe Game."""
+"""This module handles the logistics of creating and updating a Tic Tac Toe Game.
+
+The board is headless: it never touches GUI widgets. Views register a listener with
+`subscribe()` and are told about every cell change, so the game logic can run on servers
+and in simulators without importing tkinter.
+
+Boards may be any size with any win length, e.g. ``BoardClass(15, winlength=5)`` for gomoku.
+Every run of winlength cells is a line with a per-player counter; placing or removing a mark
+only touches the counters of the lines through that cell, so win and full-board checks never
+rescan the board.
+
+Every board also keeps a Zobrist hash: each (cell, mark) pair has a fixed random 64-bit key and
+the hash is the XOR of the keys of the marks on the board, so setting a cell updates it with two
+XORs. digest() folds in the turn, giving peers a cheap fingerprint of the whole position to
+compare instead of the board itself.
+"""
+import random
+from functools import lru_cache
+
+# Keys depend only on the board shape, so every process derives the same ones.
+ZOBRIST_TURN = 0x9E3779B97F4A7C15
+
+
+@lru_cache(maxsize=None)
+def winningLines(rows: int, columns: int, winlength: int) -> tuple:
+    """Returns every run of winlength cells on a board.
+
+    Args:
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+        winlength (int): Number of marks in a row needed to win.
+
+    Returns:
+        tuple: Tuples of cell indexes (row * columns + column), one per line.
+    """
+    lines = []
+    for row in range(rows):
+        for col in range(columns):
+            for drow, dcol in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                endrow = row + drow * (winlength - 1)
+                endcol = col + dcol * (winlength - 1)
+                if 0 <= endrow < rows and 0 <= endcol < columns:
+                    lines.append(tuple((row + drow * i) * columns + col + dcol * i for i in range(winlength)))
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def zobristKeys(rows: int, columns: int) -> tuple:
+    """Returns the Zobrist keys of every cell of a board.
+
+    Args:
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+
+    Returns:
+        tuple: For each cell index, a dict mapping ' ', 'X' and 'O' to its 64-bit key, 0 for ' '.
+    """
+    rng = random.Random(rows << 16 | columns)
+    return tuple({' ': 0, 'X': rng.getrandbits(64), 'O': rng.getrandbits(64)} for cell in range(rows * columns))
+
+
+@lru_cache(maxsize=None)
+def cellLines(rows: int, columns: int, winlength: int) -> tuple:
+    """Returns the lines passing through each cell of a board.
+
+    Args:
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+        winlength (int): Number of marks in a row needed to win.
+
+    Returns:
+        tuple: For each cell index, a tuple of indexes into winningLines().
+    """
+    through = [[] for cell in range(rows * columns)]
+    for index, line in enumerate(winningLines(rows, columns, winlength)):
+        for cell in line:
+            through[cell].append(index)
+    return tuple(tuple(lines) for lines in through)
+
 
 class BoardClass():
     """
@@ -12,29 +90,68 @@ class BoardClass():
         numwins (dict): Dictionary mapping players to their number of wins.
         numlosses (dict): Dictionary mapping players to their number of losses.
         numties (int): Number of tied games.
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+        winlength (int): Number of marks in a row needed to win.
         board (list): 2D list representing the game board.
         playerprofile (str): Profile of the current player for stats.
+        history (list): (row, column) tuples of the moves played in the current game.
+        listeners (list): Callables notified as listener(row, column, mark) on cell changes.
+        celllines (tuple): Indexes of the lines through each cell, shared by boards of the same shape.
+        zobristkeys (tuple): Zobrist keys of each cell, shared by boards of the same shape.
+        boardhash (int): Zobrist hash of the marks on the board.
+        linecounts (dict): Per-mark list of how many cells of each line the mark holds.
+        completedlines (dict): Per-mark number of lines the mark holds entirely.
+        filled (int): Number of cells holding a mark.
 
     Methods:
         setPlayer1Name(user): Sets the name of Player 1.
         setPlayer2Name(user): Sets the name of Player 2.
         setPlayerProfile1(): Sets the player profile to Player 1.
         setPlayerProfile2(): Sets the player profile to Player 2.
-        addWinLoss(user): Adds initial win and loss counts for a user.
+        addWinLoss(user): Adds win and loss counts for a user who has none yet.
         resetDefaultTurn(): Resets the default turn to Player 1.
         resetGameBoard(): Resets the game board to its default state.
         resetPlayerTurn(): Resets the player turn to Player 1.
         updateGamesPlayed(): Updates the games played count.
-        updateGameBoard(row, column, guiboard): Updates the game board and GUI.
+        updateGameBoard(row, column, guiboard): Updates the game board.
+        subscribe(listener): Registers a listener for board changes.
+        unsubscribe(listener): Removes a previously registered listener.
+        currentMark() -> str: Returns the mark of the player whose turn it is.
+        getCell(row, column) -> str: Returns the mark stored in a cell.
+        setCell(row, column, mark): Stores a mark in a cell without validation.
+        applyMove(row, column) -> str: Places the current player's mark on the board.
+        undoMove() -> tuple: Removes the last move from the board.
+        outcome() -> str: Returns the winning mark, 'tie', or None while in progress.
+        winningMark() -> str: Returns the mark that completed a line, or None.
+        digest() -> int: Returns the Zobrist hash of the board and turn.
+        snapshot() -> dict: Returns a copy of the full game state.
+        restore(state): Restores a state produced by snapshot().
         changePlayerTurn(): Changes the player turn to the other player.
-        boardIsFull(): Checks if the game board is full.
-        isWinner() -> bool: Checks if there's a winner in the game.
+        boardIsFull(): Checks if the game board is full and records a tie.
+        isWinner() -> bool: Checks if there's a winner in the game and records the result.
+        isFull() -> bool: Checks if the game board is full without recording stats.
+        hasWinner() -> bool: Checks if there's a winner without recording stats.
+        recordWin(): Records a win for the current player and a loss for the opponent.
+        recordTie(): Records a tied game.
         computeStats(): Computes and returns game statistics.
     """
     
-    def __init__(self):
-        """Initializes the BoardClass instance."""
-       
+    def __init__(self, rows: int = 3, columns: int = None, winlength: int = None):
+        """Initializes the BoardClass instance.
+
+        Args:
+            rows (int): Number of rows on the board.
+            columns (int, optional): Number of columns, defaulting to rows.
+            winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+        """
+        self.rows = rows
+        self.columns = rows if columns is None else columns
+        self.winlength = min(self.rows, self.columns) if winlength is None else winlength
+        if not 1 <= self.winlength <= max(self.rows, self.columns):
+            raise ValueError(f"a {self.rows}x{self.columns} board cannot have a win length of {self.winlength}")
+        self.celllines = cellLines(self.rows, self.columns, self.winlength)
+        self.zobristkeys = zobristKeys(self.rows, self.columns)
         self.player1 = "Player1"
         self.player2 = "Player2"
         self.userturn = self.player1
@@ -42,7 +159,8 @@ class BoardClass():
         self.numwins = {}
         self.numlosses = {}
         self.numties = 0
-        self.board = [[' ', ' ', ' '] for i in range(3)]
+        self.listeners = []
+        self.resetGameBoard()
         self.playerprofile = None
 
 
@@ -75,13 +193,13 @@ class BoardClass():
 
 
     def addWinLoss(self, user: str):
-        """Adds initial win and loss counts for a user.
+        """Adds win and loss counts for a user, keeping any counts the user already has.
 
         Args:
             user (str): The user to add win and loss counts for.
         """
-        self.numwins[user] = 0
-        self.numlosses[user] = 0
+        self.numwins.setdefault(user, 0)
+        self.numlosses.setdefault(user, 0)
 
         
     def resetDefaultTurn(self):
@@ -91,7 +209,13 @@ class BoardClass():
 
     def resetGameBoard(self):
         """Resets the local game board to its default state."""
-        self.board = [[' ', ' ', ' '] for i in range(3)]
+        self.board = [[' '] * self.columns for i in range(self.rows)]
+        self.history = []
+        numlines = len(winningLines(self.rows, self.columns, self.winlength))
+        self.linecounts = {'X': [0] * numlines, 'O': [0] * numlines}
+        self.completedlines = {'X': 0, 'O': 0}
+        self.filled = 0
+        self.boardhash = 0
 
 
     def resetPlayerTurn(self):
@@ -104,23 +228,212 @@ class BoardClass():
         self.gamesplayed += 1
 
 
-    def updateGameBoard(self, row: int, column: int, guiboard: list):
-        """Updates the game board and GUI.
+    def updateGameBoard(self, row: int, column: int, guiboard: list = None):
+        """Updates the game board.
+
+        Views should subscribe() to board changes; guiboard is only kept for callers that
+        still pass their buttons in directly.
 
         Args:
             row (int): Row index of the game board.
             column (int): Column index of the game board.
-            guiboard (list): 2D list of GUI buttons representing the game board.
-        """
-        if self.board[row][column] == ' ':
-            if self.userturn == self.player1:
-                self.board[row][column] = 'X'
-                guiboard[row][column].config(text='X')
-            elif self.userturn == self.player2:
-                self.board[row][column] = 'O'
-                guiboard[row][column].config(text='O')
-        else:
+            guiboard (list, optional): 2D list of GUI buttons representing the game board.
+        """
+        mark = self.applyMove(row, column)
+        if guiboard is not None and mark is not None:
+            guiboard[row][column].config(text=mark)
+
+
+    def subscribe(self, listener):
+        """Registers a listener for board changes.
+
+        Args:
+            listener (callable): Called as listener(row, column, mark) whenever a cell changes.
+                A cleared cell is reported with the mark ' '.
+        """
+        self.listeners.append(listener)
+
+
+    def unsubscribe(self, listener):
+        """Removes a previously registered listener.
+
+        Args:
+            listener (callable): The listener passed to subscribe().
+        """
+        self.listeners.remove(listener)
+
+
+    def currentMark(self) -> str:
+        """Returns the mark of the player whose turn it is.
+
+        Returns:
+            str: 'X' for Player 1, 'O' for Player 2, or None if the turn belongs to neither.
+        """
+        if self.userturn == self.player1:
+            return 'X'
+        if self.userturn == self.player2:
+            return 'O'
+        return None
+
+
+    def getCell(self, row: int, column: int) -> str:
+        """Returns the mark stored in a cell.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+
+        Returns:
+            str: ' ', 'X' or 'O'.
+        """
+        return self.board[row][column]
+
+
+    def setCell(self, row: int, column: int, mark: str):
+        """Stores a mark in a cell without validation or notification.
+
+        The counters of the lines through the cell and the Zobrist hash are updated as well.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+            mark (str): ' ', 'X' or 'O'.
+        """
+        previous = self.board[row][column]
+        if previous == mark:
+            return
+        self.board[row][column] = mark
+        cell = row * self.columns + column
+        keys = self.zobristkeys[cell]
+        self.boardhash ^= keys[previous] ^ keys[mark]
+        lines = self.celllines[cell]
+        if previous != ' ':
+            counts = self.linecounts[previous]
+            for line in lines:
+                if counts[line] == self.winlength:
+                    self.completedlines[previous] -= 1
+                counts[line] -= 1
+            self.filled -= 1
+        if mark != ' ':
+            counts = self.linecounts[mark]
+            for line in lines:
+                counts[line] += 1
+                if counts[line] == self.winlength:
+                    self.completedlines[mark] += 1
+            self.filled += 1
+
+
+    def applyMove(self, row: int, column: int) -> str:
+        """Places the current player's mark on the board and notifies listeners.
+
+        Args:
+            row (int): Row index of the game board.
+            column (int): Column index of the game board.
+
+        Returns:
+            str: The mark that was placed, or None if the turn belongs to neither player.
+
+        Raises:
+            ValueError: If the cell is already taken.
+        """
+        if self.getCell(row, column) != ' ':
+            raise ValueError
+        mark = self.currentMark()
+        if mark is None:
+            return None
+        self.setCell(row, column, mark)
+        self.history.append((row, column))
+        for listener in self.listeners:
+            listener(row, column, mark)
+        return mark
+
+
+    def undoMove(self) -> tuple:
+        """Removes the last move from the board and notifies listeners.
+
+        The turn is left unchanged, mirroring applyMove().
+
+        Returns:
+            tuple: The (row, column) of the removed move.
+
+        Raises:
+            ValueError: If no move has been played in the current game.
+        """
+        if not self.history:
             raise ValueError
+        row, column = self.history.pop()
+        self.setCell(row, column, ' ')
+        for listener in self.listeners:
+            listener(row, column, ' ')
+        return row, column
+
+
+    def outcome(self) -> str:
+        """Returns the result of the current game without touching the statistics.
+
+        Returns:
+            str: 'X' or 'O' for a win, 'tie' for a full board, or None while in progress.
+        """
+        mark = self.winningMark()
+        if mark is not None:
+            return mark
+        if self.isFull():
+            return 'tie'
+        return None
+
+
+    def snapshot(self) -> dict:
+        """Returns a copy of the full game state.
+
+        Returns:
+            dict: Player names, turn, board shape, board, move history and statistics.
+        """
+        return {
+            'rows': self.rows,
+            'columns': self.columns,
+            'winlength': self.winlength,
+            'player1': self.player1,
+            'player2': self.player2,
+            'userturn': self.userturn,
+            'playerprofile': self.playerprofile,
+            'board': tuple(tuple(self.getCell(row, col) for col in range(self.columns)) for row in range(self.rows)),
+            'history': tuple(self.history),
+            'gamesplayed': self.gamesplayed,
+            'numwins': dict(self.numwins),
+            'numlosses': dict(self.numlosses),
+            'numties': self.numties,
+        }
+
+
+    def restore(self, state: dict):
+        """Restores a state produced by snapshot() and notifies listeners of every cell.
+
+        Args:
+            state (dict): The state to restore.
+        """
+        self.rows = state['rows']
+        self.columns = state['columns']
+        self.winlength = state['winlength']
+        self.celllines = cellLines(self.rows, self.columns, self.winlength)
+        self.zobristkeys = zobristKeys(self.rows, self.columns)
+        self.player1 = state['player1']
+        self.player2 = state['player2']
+        self.userturn = state['userturn']
+        self.playerprofile = state['playerprofile']
+        self.resetGameBoard()
+        for row in range(self.rows):
+            for col in range(self.columns):
+                self.setCell(row, col, state['board'][row][col])
+        self.history = list(state['history'])
+        self.gamesplayed = state['gamesplayed']
+        self.numwins = dict(state['numwins'])
+        self.numlosses = dict(state['numlosses'])
+        self.numties = state['numties']
+        for row in range(self.rows):
+            for col in range(self.columns):
+                mark = self.getCell(row, col)
+                for listener in self.listeners:
+                    listener(row, col, mark)
 
         
     def changePlayerTurn(self):
@@ -132,44 +445,81 @@ class BoardClass():
 
         
     def boardIsFull(self) -> bool:
-        """Checks if the game board is full.
+        """Checks if the game board is full and records a tie if it is.
 
         Returns:
             bool: True if the game board is full, False otherwise.
         """
-        for row in self.board:
-            for col in row:
-                if col == ' ':
-                    return False
-        self.numties += 1
-        return True
+        if self.isFull():
+            self.recordTie()
+            return True
+        return False
 
 
     def isWinner(self) -> bool:
-        """Checks if there's a winner in the game.
+        """Checks if there's a winner in the game and records the result if there is.
 
         Returns:
             bool: True if there's a winner, False otherwise.
         """
-        for i in range(3):
-            if self.board[i][0] == self.board[i][1] == self.board[i][2] != ' ':
-                self.numwins[self.userturn] += 1
-                self.numlosses[self.player2 if self.userturn == self.player1 else self.player1] += 1
-                return True
-            if self.board[0][i] == self.board[1][i] == self.board[2][i] != ' ':
-                self.numwins[self.userturn] += 1
-                self.numlosses[self.player2 if self.userturn == self.player1 else self.player1] += 1
-                return True
-        if self.board[0][0] == self.board[1][1] == self.board[2][2] != ' ':
-            self.numwins[self.userturn] += 1
-            self.numlosses[self.player2 if self.userturn == self.player1 else self.player1] += 1
-            return True
-        if self.board[0][2] == self.board[1][1] == self.board[2][0] != ' ':
-            self.numwins[self.userturn] += 1
-            self.numlosses[self.player2 if self.userturn == self.player1 else self.player1] += 1
+        if self.hasWinner():
+            self.recordWin()
             return True
         return False
 
+
+    def isFull(self) -> bool:
+        """Checks if the game board is full without touching the statistics.
+
+        Returns:
+            bool: True if the game board is full, False otherwise.
+        """
+        return self.filled == self.rows * self.columns
+
+
+    def hasWinner(self) -> bool:
+        """Checks if there's a winner in the game without touching the statistics.
+
+        Returns:
+            bool: True if there's a winner, False otherwise.
+        """
+        return self.winningMark() is not None
+
+
+    def winningMark(self) -> str:
+        """Returns the mark that completed a line.
+
+        Returns:
+            str: 'X' or 'O' if a line is complete, None otherwise.
+        """
+        if self.completedlines['X']:
+            return 'X'
+        if self.completedlines['O']:
+            return 'O'
+        return None
+
+
+    def digest(self) -> int:
+        """Returns the Zobrist hash of the board and of whose turn it is.
+
+        Returns:
+            int: A 64-bit fingerprint equal on any two boards holding the same position.
+        """
+        if self.userturn == self.player2:
+            return self.boardhash ^ ZOBRIST_TURN
+        return self.boardhash
+
+
+    def recordWin(self):
+        """Records a win for the player whose turn it is and a loss for their opponent."""
+        self.numwins[self.userturn] += 1
+        self.numlosses[self.player2 if self.userturn == self.player1 else self.player1] += 1
+
+
+    def recordTie(self):
+        """Records a tied game."""
+        self.numties += 1
+
     
     def computeStats(self) -> tuple:
         """Computes and returns game statistics.
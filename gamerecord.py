@@ -0,0 +1,291 @@
+"""This module contains a compact binary archive of played Tic Tac Toe games.
+
+An archive is two append-only files. The data file starts with a short file header, followed
+by one record per game: a fixed 6-byte record header (rows, columns, win length, outcome, move
+count) and then one cell index per move, a single byte on boards of up to 256 cells and two
+bytes on larger ones, so a 3x3 game takes at most 15 bytes. The index file next to it holds
+the 8-byte offset of every record. GameArchive memory-maps both files, so reading game N is an
+index lookup and a slice of the mapping, whatever the size of the archive.
+
+Several processes may append to one archive at once. Both files are opened unbuffered in
+append mode and every record goes out in a single write, which the kernel places whole at the
+end of the file. The record's offset is then read back from the descriptor's own position, so
+no other process's appends can shift it. Readers map the index before the data, so every
+offset they see points into their data mapping. Each program still keeps its own archive by
+default (archivePath()), and in a peer-to-peer game only the host records. A GameRecorder
+creates and opens its files on the first recorded game, so a program that finishes no game
+leaves nothing behind.
+
+Dependencies:
+    - mmap: Maps the archive files for random access.
+    - gameboard: A module providing the BoardClass games are replayed through.
+
+Usage:
+    recorder = GameRecorder(archivePath('player2'))
+    recorder.recordBoard(game_board)
+    recorder.close()
+    archive = GameArchive('games.ttr')
+    game_board = archive.replay(len(archive) - 1)
+
+    python gamerecord.py ~/.tictactoe_games.player2.ttr 42
+"""
+import argparse
+import mmap
+import os
+import struct
+from gameboard import BoardClass
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.tictactoe_games.ttr')
+MAGIC = b'TTTR\x01'
+RECORD_HEADER = struct.Struct('<BBBBH')
+OFFSET = struct.Struct('<Q')
+OUTCOME_CODES = {None: 0, 'X': 1, 'O': 2, 'tie': 3}
+CODE_OUTCOMES = {code: outcome for outcome, code in OUTCOME_CODES.items()}
+
+
+def archivePath(program: str) -> str:
+    """Returns the default archive of a program, so programs on one machine never share one by accident.
+
+    Args:
+        program (str): Name of the recording program, e.g. 'player1'.
+
+    Returns:
+        str: The path of the program's data file in the home directory.
+    """
+    base, extension = os.path.splitext(DEFAULT_PATH)
+    return f"{base}.{program}{extension}"
+
+
+def indexPath(path: str) -> str:
+    """Returns the path of the offset index belonging to an archive."""
+    return path + '.idx'
+
+
+def moveWidth(rows: int, columns: int) -> int:
+    """Returns the number of bytes used per move on a board of the given shape."""
+    return 1 if rows * columns <= 256 else 2
+
+
+class GameRecorder():
+    """
+    Appends finished games to an archive.
+
+    Attributes:
+        path (str): Location of the data file.
+        datafile (file): The data file, opened unbuffered for appending, or None until the first game.
+        indexfile (file): The offset index, opened unbuffered for appending, or None until the first game.
+
+    Methods:
+        open(): Creates the archive if needed and opens both files for appending.
+        createArchive(path): Creates a data file holding only the file header, unless it exists.
+        recordGame(moves, rows, columns, winlength, outcome): Appends one game.
+        recordBoard(game_board): Appends the game currently on a BoardClass.
+        close(): Closes the archive.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """Initializes the GameRecorder instance; the archive is opened on the first recorded game.
+
+        Args:
+            path (str): Location of the data file.
+        """
+        self.path = path
+        self.datafile = None
+        self.indexfile = None
+
+
+    def open(self):
+        """Creates the archive if needed and opens both files for appending."""
+        self.createArchive(self.path)
+        self.datafile = open(self.path, 'ab', buffering=0)
+        self.indexfile = open(indexPath(self.path), 'ab', buffering=0)
+
+
+    @staticmethod
+    def createArchive(path: str):
+        """Creates a data file holding only the file header, unless it exists.
+
+        The header is written to a private file that is then linked into place, so no other
+        process can append a record to the new archive before its header.
+
+        Args:
+            path (str): Location of the data file.
+        """
+        if os.path.exists(path):
+            return
+        scratch = f"{path}.{os.getpid()}.new"
+        with open(scratch, 'wb') as newfile:
+            newfile.write(MAGIC)
+        try:
+            os.link(scratch, path)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(scratch)
+
+
+    def recordGame(self, moves: list, rows: int = 3, columns: int = 3, winlength: int = 3, outcome: str = None):
+        """Appends one game.
+
+        Args:
+            moves (list): (row, column) tuples in the order they were played.
+            rows (int): Number of rows on the board.
+            columns (int): Number of columns on the board.
+            winlength (int): Number of marks in a row needed to win.
+            outcome (str, optional): 'X', 'O', 'tie', or None for an unfinished game.
+        """
+        cells = [row * columns + col for row, col in moves]
+        if moveWidth(rows, columns) == 1:
+            body = bytes(cells)
+        else:
+            body = b''.join(cell.to_bytes(2, 'little') for cell in cells)
+        record = RECORD_HEADER.pack(rows, columns, winlength, OUTCOME_CODES[outcome], len(cells)) + body
+        if self.datafile is None:
+            self.open()
+        self.datafile.write(record)
+        # An append leaves the descriptor just past the record, wherever other writers put theirs.
+        self.indexfile.write(OFFSET.pack(self.datafile.tell() - len(record)))
+
+
+    def recordBoard(self, game_board: BoardClass):
+        """Appends the game currently on a BoardClass, before the board is reset.
+
+        Args:
+            game_board (BoardClass): The board holding the game's move history.
+        """
+        self.recordGame(game_board.history, game_board.rows, game_board.columns, game_board.winlength, game_board.outcome())
+
+
+    def close(self):
+        """Closes the archive, if a game was ever recorded."""
+        if self.datafile is not None:
+            self.datafile.close()
+            self.indexfile.close()
+            self.datafile = self.indexfile = None
+
+
+class GameArchive():
+    """
+    Gives random access to the games of an archive through memory maps.
+
+    Attributes:
+        path (str): Location of the data file.
+        data (mmap.mmap): Read-only map of the data file, or None if it holds no games.
+        index (mmap.mmap): Read-only map of the offset index, or None if it is empty.
+        numgames (int): Number of games in the archive when it was opened.
+
+    Methods:
+        mapFile(path) -> mmap.mmap: Maps a file read-only.
+        readGame(number) -> tuple: Returns the shape, outcome and moves of a game.
+        replay(number) -> BoardClass: Replays a game through a BoardClass.
+        close(): Unmaps the archive.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """Initializes the GameArchive instance.
+
+        Args:
+            path (str): Location of the data file.
+
+        Raises:
+            ValueError: If the file is not a game archive.
+        """
+        self.path = path
+        self.index = self.mapFile(indexPath(path))
+        self.data = self.mapFile(path)
+        if self.data is not None and self.data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a game archive")
+        self.numgames = 0 if self.index is None else len(self.index) // OFFSET.size
+
+
+    @staticmethod
+    def mapFile(path: str) -> mmap.mmap:
+        """Maps a file read-only, returning None if it is missing or empty."""
+        try:
+            with open(path, 'rb') as mappedfile:
+                return mmap.mmap(mappedfile.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+
+    def __len__(self) -> int:
+        """Returns the number of games in the archive."""
+        return self.numgames
+
+
+    def readGame(self, number: int) -> tuple:
+        """Returns the shape, outcome and moves of a game.
+
+        Args:
+            number (int): Position of the game in the archive, starting at 0.
+
+        Returns:
+            tuple: ((rows, columns, winlength), outcome, moves) where moves is a list of (row, column).
+
+        Raises:
+            IndexError: If the archive has no such game.
+        """
+        if not 0 <= number < self.numgames:
+            raise IndexError(f"game {number} is not in the archive")
+        offset, = OFFSET.unpack_from(self.index, number * OFFSET.size)
+        rows, columns, winlength, outcome, count = RECORD_HEADER.unpack_from(self.data, offset)
+        start = offset + RECORD_HEADER.size
+        width = moveWidth(rows, columns)
+        raw = self.data[start:start + count * width]
+        if width == 1:
+            cells = list(raw)
+        else:
+            cells = [int.from_bytes(raw[i:i + 2], 'little') for i in range(0, len(raw), 2)]
+        moves = [divmod(cell, columns) for cell in cells]
+        return (rows, columns, winlength), CODE_OUTCOMES[outcome], moves
+
+
+    def replay(self, number: int, factory=BoardClass) -> BoardClass:
+        """Replays a game through a BoardClass.
+
+        Args:
+            number (int): Position of the game in the archive, starting at 0.
+            factory (type): Board class to replay on, called with (rows, columns, winlength).
+
+        Returns:
+            BoardClass: The board after the game's last move, with the move history filled in.
+        """
+        shape, outcome, moves = self.readGame(number)
+        game_board = factory(*shape)
+        for row, col in moves:
+            game_board.applyMove(row, col)
+            if game_board.outcome() is None:
+                game_board.changePlayerTurn()
+        return game_board
+
+
+    def close(self):
+        """Unmaps the archive."""
+        for mapped in (self.data, self.index):
+            if mapped is not None:
+                mapped.close()
+
+
+def main(argv: list = None):
+    """Parses the command line and prints the size of an archive or one of its games.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Count the games of an archive or replay one of them.")
+    parser.add_argument('path', help="archive data file, e.g. the one archivePath('player2') returns")
+    parser.add_argument('number', type=int, nargs='?', help="index of the game to replay")
+    args = parser.parse_args(argv)
+    archive = GameArchive(args.path)
+    if args.number is not None:
+        replayed = archive.replay(args.number)
+        for line in replayed.board:
+            print('|'.join(line))
+        print(f"Outcome: {replayed.outcome()}")
+    else:
+        print(f"{len(archive)} games")
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
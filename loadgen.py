@@ -0,0 +1,326 @@
+"""This module contains a headless load generator for the Tic Tac Toe server.
+
+It opens N concurrent bot clients on one asyncio event loop. Each bot follows the same flow as
+Player1: it connects, announces its username with a HELLO frame, waits in the lobby to be
+paired, and then plays its moves, chosen by a strategy from the strategies module after a
+configurable think time, on a local BoardClass mirroring the server's. After every game the
+bot that plays 'X' answers with REMATCH until its session has played the requested number of
+games, and with QUIT after the last one. When every bot is done, the run reports throughput in
+games and moves per second, and latency percentiles estimated from metrics.Histogram buckets:
+the move round trip, from sending a move to receiving the opponent's reply or the result, and
+the time spent in the lobby, from connecting to receiving START.
+
+Dependencies:
+    - asyncio: Runs every bot on a single event loop.
+    - protocol: A module providing the framed wire format.
+    - strategies: A module providing the move-choosing strategies.
+    - metrics: A module providing the latency histograms.
+    - gameboard: A module providing the BoardClass for maintaining game state.
+
+Usage:
+    python server.py --port 5000
+    python loadgen.py --port 5000 --clients 500 --games 20
+    python loadgen.py --port 5000 --clients 100 --strategy random --think 0.05 --json
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import protocol
+from strategies import STRATEGIES
+from metrics import Histogram
+from gameboard import BoardClass
+
+
+class LoadBot():
+    """
+    Plays one server session as a headless client.
+
+    Attributes:
+        name (str): Username announced in the HELLO frame.
+        strategy (callable): Strategy choosing the bot's moves.
+        think (float): Seconds the bot waits before each move.
+        games (int): Number of games the session plays when this bot is 'X'.
+        rng (random.Random): Source of randomness passed to the strategy.
+        roundtrip (Histogram): Shared histogram of move round trips.
+        lobbytime (Histogram): Shared histogram of the time spent in the lobby.
+        reader (asyncio.StreamReader): Stream the server's frames arrive on.
+        writer (asyncio.StreamWriter): Stream frames are sent to the server on.
+        decoder (protocol.FrameDecoder): Reassembles frames received from the server.
+        game_board (BoardClass): Local copy of the current game, or None before START.
+        mark (str): 'X' or 'O', the mark the bot plays.
+        opponent (str): The opponent's username.
+        sentat (int): perf_counter_ns() reading taken when the last move was sent, or None.
+        gamesplayed (int): Number of games finished in the session.
+        movessent (int): Number of moves the bot sent.
+
+    Methods:
+        run(host, port): Plays the session until it ends.
+        readFrame() -> tuple: Waits for the next frame from the server.
+        handleFrame(msgtype, payload) -> bool: Handles one frame from the server.
+        startGame(payload): Sets up the local board from a START frame.
+        isMyTurn() -> bool: Checks if the bot moves next.
+        makeMove(): Thinks, chooses a move and sends it.
+        applyMove(row, col): Applies a move to the local board.
+        finishGame(): Resets the local board and picks REMATCH or QUIT.
+    """
+
+    def __init__(self, name: str, strategy, think: float, games: int, rng: random.Random,
+                 roundtrip: Histogram, lobbytime: Histogram):
+        """Initializes the LoadBot instance.
+
+        Args:
+            name (str): Username announced in the HELLO frame.
+            strategy (callable): Strategy choosing the bot's moves.
+            think (float): Seconds the bot waits before each move.
+            games (int): Number of games the session plays when this bot is 'X'.
+            rng (random.Random): Source of randomness passed to the strategy.
+            roundtrip (Histogram): Shared histogram of move round trips.
+            lobbytime (Histogram): Shared histogram of the time spent in the lobby.
+        """
+        self.name = name
+        self.strategy = strategy
+        self.think = think
+        self.games = games
+        self.rng = rng
+        self.roundtrip = roundtrip
+        self.lobbytime = lobbytime
+        self.reader = None
+        self.writer = None
+        self.decoder = protocol.FrameDecoder()
+        self.game_board = None
+        self.mark = None
+        self.opponent = None
+        self.sentat = None
+        self.gamesplayed = 0
+        self.movessent = 0
+
+
+    async def run(self, host: str, port: int):
+        """Connects, plays the session until it ends and closes the connection.
+
+        Args:
+            host (str): The server's host name or IP address.
+            port (int): The server's port.
+        """
+        connectedat = time.perf_counter_ns()
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(protocol.encodeHello(self.name))
+        try:
+            while True:
+                msgtype, payload = await self.readFrame()
+                if msgtype == protocol.START:
+                    self.lobbytime.observeSince(connectedat)
+                if not await self.handleFrame(msgtype, payload):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.writer.close()
+
+
+    async def readFrame(self) -> tuple:
+        """Waits for the next frame from the server.
+
+        Returns:
+            tuple: A (msgtype, payload) tuple.
+
+        Raises:
+            ConnectionError: If the server closes the connection.
+        """
+        while not self.decoder.frames:
+            data = await self.reader.read(4096)
+            if not data:
+                raise ConnectionError("connection closed by server")
+            self.decoder.feed(data)
+        return self.decoder.frames.popleft()
+
+
+    async def handleFrame(self, msgtype: int, payload: bytes) -> bool:
+        """Handles one frame from the server.
+
+        Args:
+            msgtype (int): The frame's message type.
+            payload (bytes): The frame's payload.
+
+        Returns:
+            bool: False once the session is over, True otherwise.
+        """
+        if msgtype == protocol.HELLO:
+            self.opponent = protocol.decodeHello(payload)
+        elif msgtype == protocol.START:
+            self.startGame(payload)
+            if self.isMyTurn():
+                await self.makeMove()
+        elif msgtype == protocol.MOVE:
+            if self.sentat is not None:
+                self.roundtrip.observeSince(self.sentat)
+                self.sentat = None
+            self.applyMove(*protocol.decodeMove(payload))
+            if self.game_board.outcome() is None:
+                await self.makeMove()
+        elif msgtype == protocol.RESULT:
+            if self.sentat is not None:
+                self.roundtrip.observeSince(self.sentat)
+                self.sentat = None
+            return await self.finishGame()
+        elif msgtype == protocol.REMATCH:
+            self.game_board.resetGameBoard()
+            self.game_board.resetDefaultTurn()
+        elif msgtype == protocol.PING:
+            self.writer.write(protocol.encodePong())
+        elif msgtype == protocol.QUIT:
+            return False
+        return True
+
+
+    def startGame(self, payload: bytes):
+        """Sets up the local board from a START frame.
+
+        Args:
+            payload (bytes): The START frame payload.
+        """
+        self.mark = protocol.decodeStart(payload)
+        self.game_board = BoardClass(*protocol.decodeStartBoard(payload))
+        player1, player2 = (self.name, self.opponent) if self.mark == 'X' else (self.opponent, self.name)
+        self.game_board.setPlayer1Name(player1)
+        self.game_board.setPlayer2Name(player2)
+        self.game_board.resetDefaultTurn()
+
+
+    def isMyTurn(self) -> bool:
+        """Checks if the bot moves next.
+
+        Returns:
+            bool: True if it is the bot's turn on the local board.
+        """
+        return self.game_board.userturn == self.name
+
+
+    async def makeMove(self):
+        """Thinks, chooses a move with the strategy and sends it."""
+        if self.think > 0:
+            await asyncio.sleep(self.think)
+        row, col = self.strategy(self.game_board, self.rng)
+        self.writer.write(protocol.encodeMove(row, col))
+        self.sentat = time.perf_counter_ns()
+        self.movessent += 1
+        self.applyMove(row, col)
+
+
+    def applyMove(self, row: int, col: int):
+        """Applies a move to the local board and passes the turn unless the game is over.
+
+        Args:
+            row (int): Row index of the move.
+            col (int): Column index of the move.
+        """
+        self.game_board.applyMove(row, col)
+        if self.game_board.outcome() is None:
+            self.game_board.changePlayerTurn()
+
+
+    async def finishGame(self) -> bool:
+        """Resets the local board and, as 'X', asks for a rematch or quits.
+
+        Returns:
+            bool: False once the bot has quit, True otherwise.
+        """
+        self.gamesplayed += 1
+        self.game_board.resetGameBoard()
+        self.game_board.resetDefaultTurn()
+        if self.mark != 'X':
+            return True
+        if self.gamesplayed >= self.games:
+            self.writer.write(protocol.encodeQuit())
+            return False
+        self.writer.write(protocol.encodeRematch())
+        await self.makeMove()
+        return True
+
+
+async def runLoad(host: str, port: int, clients: int, games: int, strategy: str = 'random',
+                  think: float = 0.0, seed: int = None) -> dict:
+    """Runs the bots until every session has ended and returns the measurements.
+
+    Args:
+        host (str): The server's host name or IP address.
+        port (int): The server's port.
+        clients (int): Number of concurrent bots; the server pairs them into clients // 2 sessions.
+        games (int): Number of games each session plays.
+        strategy (str): Name of the strategy in strategies.STRATEGIES driving every bot.
+        think (float): Seconds each bot waits before each move.
+        seed (int, optional): Seed for reproducible move choices.
+
+    Returns:
+        dict: Counts, elapsed time, throughput and latency snapshots of the run.
+
+    Raises:
+        ValueError: If the strategy is unknown or the number of clients is odd.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"unknown strategy {strategy!r}")
+    if clients % 2:
+        raise ValueError("the number of clients must be even so that every bot gets an opponent")
+    rng = random.Random(seed)
+    roundtrip = Histogram('tictactoe_loadgen_round_trip_seconds', "Time from sending a move to the opponent's reply or the result.")
+    lobbytime = Histogram('tictactoe_loadgen_lobby_seconds', "Time from connecting to receiving START.")
+    bots = [LoadBot(f"bot{index:05d}", STRATEGIES[strategy], think, games, random.Random(rng.random()), roundtrip, lobbytime)
+            for index in range(clients)]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(bot.run(host, port) for bot in bots), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    gamesplayed = sum(bot.gamesplayed for bot in bots if bot.mark == 'X')
+    movessent = sum(bot.movessent for bot in bots)
+    return {
+        'clients': clients,
+        'failed': sum(1 for result in results if isinstance(result, Exception)),
+        'gamesplayed': gamesplayed,
+        'moves': movessent,
+        'elapsed': elapsed,
+        'games_per_sec': gamesplayed / elapsed if elapsed else 0.0,
+        'moves_per_sec': movessent / elapsed if elapsed else 0.0,
+        'round_trip': roundtrip.snapshot(),
+        'lobby': lobbytime.snapshot(),
+    }
+
+
+def formatMillis(seconds: float) -> str:
+    """Formats a latency estimate in milliseconds."""
+    return "n/a" if seconds is None else f"{seconds * 1000:.3f} ms"
+
+
+def main(argv: list = None):
+    """Parses the command line, runs the load and prints the report.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Simulate many concurrent Player 1 clients against the Tic Tac Toe server.")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--clients', type=int, default=100, help="number of concurrent bots, paired into clients / 2 sessions")
+    parser.add_argument('--games', type=int, default=10, help="games played by each session")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='random')
+    parser.add_argument('--think', type=float, default=0.0, help="seconds each bot waits before moving")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    args = parser.parse_args(argv)
+    if args.clients % 2:
+        parser.error("--clients must be even")
+    report = asyncio.run(runLoad(args.host, args.port, args.clients, args.games, args.strategy, args.think, args.seed))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"Clients: {report['clients']} ({report['failed']} failed)")
+    print(f"Games Played: {report['gamesplayed']} in {report['elapsed']:.2f} s ({report['games_per_sec']:.1f} games/s)")
+    print(f"Moves Sent: {report['moves']} ({report['moves_per_sec']:.1f} moves/s)")
+    for label, key in (("Move round trip", 'round_trip'), ("Lobby wait", 'lobby')):
+        latency = report[key]
+        print(f"{label}: p50 {formatMillis(latency['p50'])}, p90 {formatMillis(latency['p90'])}, "
+              f"p99 {formatMillis(latency['p99'])}, mean {formatMillis(latency['mean'])}")
+
+
+if __name__ == "__main__":
+    main()
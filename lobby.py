@@ -0,0 +1,122 @@
+"""This module contains the matchmaking queue used by the game server's lobby.
+
+Waiting players are kept in one FIFO deque per rating bucket (``rating // bucketwidth``), or in
+a single deque when ratings are not used. Enqueueing either pairs the newcomer with the
+longest-waiting player of a nearby bucket or appends it, and players who leave are skipped
+lazily when they reach the front, so every operation is O(1) amortized however many players
+are waiting.
+
+Usage:
+    matchmaker = Matchmaker(bucketwidth=100, spread=1)
+    pair = matchmaker.enqueue(connection, rating=1500)
+    if pair is not None:
+        waiting, newcomer = pair
+"""
+from collections import deque
+
+
+class Matchmaker():
+    """
+    Pairs waiting players first-come first-served within rating buckets.
+
+    Attributes:
+        bucketwidth (int): Width of a rating bucket, or None to pair everyone FIFO.
+        spread (int): How many neighbouring buckets on each side may supply an opponent.
+        buckets (dict): Maps a bucket number to the deque of players waiting in it.
+        cancelled (set): Players that left while queued, skipped when they reach the front.
+        waiting (int): Number of players currently queued.
+
+    Methods:
+        bucketOf(rating) -> int: Returns the bucket a rating falls into.
+        enqueue(player, rating) -> tuple: Pairs a player or queues it.
+        popWaiting(bucket) -> object: Removes the longest-waiting live player of a bucket.
+        cancel(player): Removes a queued player.
+    """
+
+    def __init__(self, bucketwidth: int = None, spread: int = 0):
+        """Initializes the Matchmaker instance.
+
+        Args:
+            bucketwidth (int, optional): Width of a rating bucket; None pairs everyone FIFO.
+            spread (int): How many neighbouring buckets on each side may supply an opponent.
+        """
+        self.bucketwidth = bucketwidth
+        self.spread = spread if bucketwidth else 0
+        self.buckets = {}
+        self.cancelled = set()
+        self.waiting = 0
+
+
+    def __len__(self) -> int:
+        """Returns the number of players currently queued."""
+        return self.waiting
+
+
+    def bucketOf(self, rating: int) -> int:
+        """Returns the bucket a rating falls into.
+
+        Args:
+            rating (int): The player's rating, or None.
+
+        Returns:
+            int: The bucket number; 0 when ratings are not used or not given.
+        """
+        if not self.bucketwidth or rating is None:
+            return 0
+        return rating // self.bucketwidth
+
+
+    def enqueue(self, player, rating: int = None) -> tuple:
+        """Pairs a player with the longest-waiting player of the nearest bucket, or queues it.
+
+        Args:
+            player (object): The player to match, typically a server Connection.
+            rating (int, optional): The player's rating.
+
+        Returns:
+            tuple: (waiting player, player) if a match was found, None if the player was queued.
+        """
+        bucket = self.bucketOf(rating)
+        for offset in range(self.spread + 1):
+            for candidate in ((bucket,) if offset == 0 else (bucket - offset, bucket + offset)):
+                opponent = self.popWaiting(candidate)
+                if opponent is not None:
+                    return opponent, player
+        self.buckets.setdefault(bucket, deque()).append(player)
+        self.waiting += 1
+        return None
+
+
+    def popWaiting(self, bucket: int):
+        """Removes the longest-waiting player of a bucket, skipping players that left.
+
+        Args:
+            bucket (int): The bucket number.
+
+        Returns:
+            object: The player, or None if the bucket has nobody waiting.
+        """
+        queue = self.buckets.get(bucket)
+        while queue:
+            player = queue.popleft()
+            if player in self.cancelled:
+                self.cancelled.discard(player)
+                continue
+            self.waiting -= 1
+            if not queue:
+                del self.buckets[bucket]
+            return player
+        if queue is not None:
+            del self.buckets[bucket]
+        return None
+
+
+    def cancel(self, player):
+        """Removes a queued player, e.g. after it disconnects.
+
+        Args:
+            player (object): A player previously queued by enqueue().
+        """
+        if player not in self.cancelled:
+            self.cancelled.add(player)
+            self.waiting -= 1
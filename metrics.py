@@ -0,0 +1,215 @@
+"""This module contains low-overhead latency histograms for the move path.
+
+A Histogram keeps one counter per fixed bucket, so observing a duration is a bisect and two
+additions with no allocation. Histograms live in a Registry that can be read in process with
+snapshot() or dumped in the Prometheus text exposition format with exportText(), either to a
+file or, for the headless server, over HTTP.
+
+The instrumented points of the move path are defined at the bottom of the module:
+
+    - MOVE_SEND: sending a move to the opponent in clickButton.
+    - MOVE_ROUND_TRIP: from sending a move to handling the opponent's reply in receiveMove.
+    - MOVE_APPLY: applying a move to the BoardClass, including the listeners that queue its redraw.
+    - MOVE_RENDER: one batched redraw of the GUI game screen.
+    - SERVER_MOVE: validating, applying and relaying a move on the server.
+
+Usage:
+    start = time.perf_counter_ns()
+    ...
+    metrics.MOVE_SEND.observeSince(start)
+    print(metrics.REGISTRY.exportText())
+"""
+import os
+import time
+from bisect import bisect_left
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.tictactoe_metrics.prom')
+# Bucket upper bounds in seconds: 1 microsecond doubling up to about 8 seconds.
+DEFAULT_BUCKETS = tuple(1e-6 * 2 ** exponent for exponent in range(24))
+
+
+class Histogram():
+    """
+    Counts durations into fixed buckets.
+
+    Attributes:
+        name (str): Metric name.
+        description (str): One-line description of the metric.
+        buckets (tuple): Sorted bucket upper bounds in seconds.
+        counts (list): Observations per bucket, plus a final overflow bucket.
+        count (int): Total number of observations.
+        total (float): Sum of all observed durations in seconds.
+
+    Methods:
+        observe(seconds): Records one duration.
+        observeSince(start): Records the time elapsed since a perf_counter_ns() reading.
+        quantile(fraction) -> float: Estimates a quantile from the buckets.
+        snapshot() -> dict: Returns the current values.
+        exportText() -> str: Returns the histogram in the Prometheus text format.
+    """
+
+    def __init__(self, name: str, description: str, buckets: tuple = DEFAULT_BUCKETS):
+        """Initializes the Histogram instance.
+
+        Args:
+            name (str): Metric name.
+            description (str): One-line description of the metric.
+            buckets (tuple): Sorted bucket upper bounds in seconds.
+        """
+        self.name = name
+        self.description = description
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+
+    def observe(self, seconds: float):
+        """Records one duration.
+
+        Args:
+            seconds (float): The duration in seconds.
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+
+    def observeSince(self, start: int):
+        """Records the time elapsed since a perf_counter_ns() reading.
+
+        Args:
+            start (int): Value returned by time.perf_counter_ns() when the timed work began.
+        """
+        self.observe((time.perf_counter_ns() - start) / 1e9)
+
+
+    def quantile(self, fraction: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket it falls in.
+
+        Args:
+            fraction (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimate in seconds, inf if it falls past the last bucket, or None if empty.
+        """
+        if not self.count:
+            return None
+        target = fraction * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+
+    def snapshot(self) -> dict:
+        """Returns the current values.
+
+        Returns:
+            dict: count, sum and mean in seconds, and p50, p90 and p99 estimates.
+        """
+        return {
+            'count': self.count,
+            'sum': self.total,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99),
+        }
+
+
+    def exportText(self) -> str:
+        """Returns the histogram in the Prometheus text format.
+
+        Returns:
+            str: HELP, TYPE, cumulative bucket, sum and count lines.
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound:.6g}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.total:.9g}")
+        lines.append(f"{self.name}_count {self.count}")
+        return '\n'.join(lines) + '\n'
+
+
+class Registry():
+    """
+    Holds the histograms of one process.
+
+    Attributes:
+        histograms (dict): Maps a metric name to its Histogram.
+
+    Methods:
+        histogram(name, description) -> Histogram: Returns the named histogram, creating it if needed.
+        snapshot() -> dict: Returns the current values of every histogram.
+        exportText() -> str: Returns every histogram in the Prometheus text format.
+        writeText(path): Writes the Prometheus text dump to a file.
+    """
+
+    def __init__(self):
+        """Initializes the Registry instance."""
+        self.histograms = {}
+
+
+    def histogram(self, name: str, description: str) -> Histogram:
+        """Returns the named histogram, creating it if needed.
+
+        Args:
+            name (str): Metric name.
+            description (str): One-line description of the metric.
+
+        Returns:
+            Histogram: The histogram.
+        """
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(name, description)
+        return self.histograms[name]
+
+
+    def snapshot(self) -> dict:
+        """Returns the current values of every histogram.
+
+        Returns:
+            dict: Maps a metric name to its Histogram.snapshot().
+        """
+        return {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+
+
+    def exportText(self) -> str:
+        """Returns every histogram in the Prometheus text format.
+
+        Returns:
+            str: The exposition text.
+        """
+        return ''.join(histogram.exportText() for histogram in self.histograms.values())
+
+
+    def writeText(self, path: str = DEFAULT_PATH):
+        """Writes the Prometheus text dump to a file, replacing it atomically.
+
+        Args:
+            path (str): Destination file.
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'w') as dumpfile:
+            dumpfile.write(self.exportText())
+        os.replace(temporary, path)
+
+
+REGISTRY = Registry()
+
+MOVE_SEND = REGISTRY.histogram('tictactoe_move_send_seconds', "Time spent sending a move to the opponent.")
+MOVE_ROUND_TRIP = REGISTRY.histogram('tictactoe_move_round_trip_seconds', "Time from sending a move to handling the opponent's reply.")
+MOVE_APPLY = REGISTRY.histogram('tictactoe_move_apply_seconds', "Time spent applying a move to the board, including queueing its redraw.")
+MOVE_RENDER = REGISTRY.histogram('tictactoe_move_render_seconds', "Time spent redrawing the game screen once per event-loop tick.")
+SERVER_MOVE = REGISTRY.histogram('tictactoe_server_move_seconds', "Time the server spends validating, applying and relaying a move.")
+
+
+if __name__ == "__main__":
+    with open(DEFAULT_PATH) as dumpfile:
+        print(dumpfile.read(), end='')
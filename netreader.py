@@ -0,0 +1,157 @@
+"""This module moves blocking socket reads off the tkinter main thread.
+
+A SocketReader owns a daemon thread that blocks in recv, decodes frames with a FrameDecoder
+and hands them over through a thread-safe queue. The GUI drains that queue from a `root.after`
+callback, so incoming frames are dispatched as ordinary Tk events and the window never waits
+on the network. Outgoing frames go through the reader's SendBuffer, which writes them without
+blocking and is flushed from the same callback, so a slow peer cannot stall the window either.
+
+The same callback calls keepAlive(), which pings a peer that has gone quiet and shuts the
+socket down once the peer has been silent for the idle timeout, so an opponent who vanished is
+reported like one who closed the connection instead of leaving the reader waiting forever.
+Checks only start once the peer has sent something, so a peer still typing its username is not
+timed out.
+
+Usage:
+    reader = SocketReader(client_socket)
+    reader.start()
+    reader.send(protocol.encodeHello(name))
+    ...
+    reader.keepAlive()
+    for frame in reader.drain():
+        if frame is None:
+            ...  # the connection was closed
+        else:
+            msgtype, payload = frame
+"""
+import queue
+import socket
+import threading
+import time
+import protocol
+from sendbuffer import SendBuffer
+
+POLL_INTERVAL_MS = 15
+
+
+class SocketReader():
+    """
+    Reads frames from a socket on a background thread.
+
+    Attributes:
+        sock (socket.socket): The connected socket to read from.
+        sendbuffer (SendBuffer): Queues the frames sent to the peer on the same socket.
+        decoder (protocol.FrameDecoder): Reassembles frames from the received bytes.
+        frames (queue.Queue): (msgtype, payload) tuples, followed by None once the socket closes.
+        thread (threading.Thread): The background reader thread once started.
+        idletimeout (float): Seconds of silence after which the peer is considered gone; 0 never.
+        lastseen (float): time.monotonic() reading of the last bytes received, or None before any.
+        lastping (float): time.monotonic() reading of the last PING sent, or None.
+
+    Methods:
+        start(): Starts the background reader thread.
+        run(): Reads frames until the connection closes.
+        drain() -> list: Returns every frame received since the last call.
+        send(frame) -> bool: Queues a frame for the peer without blocking.
+        flush(timeout) -> int: Writes queued frames, waiting up to a timeout for the socket.
+        keepAlive(): Flushes queued frames, pings a silent peer and shuts the socket down once it is gone.
+    """
+
+    def __init__(self, sock, decoder: protocol.FrameDecoder = None, idletimeout: float = protocol.IDLE_TIMEOUT_S):
+        """Initializes the SocketReader instance.
+
+        Args:
+            sock (socket.socket): The connected socket to read from.
+            decoder (protocol.FrameDecoder, optional): Decoder that may already hold buffered bytes.
+            idletimeout (float): Seconds of silence after which the peer is considered gone; 0 never.
+        """
+        self.sock = sock
+        self.sendbuffer = SendBuffer(sock)
+        self.decoder = decoder if decoder is not None else protocol.FrameDecoder()
+        self.frames = queue.Queue()
+        self.thread = None
+        self.idletimeout = idletimeout
+        self.lastseen = None
+        self.lastping = None
+
+
+    def start(self):
+        """Starts the background reader thread."""
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+
+    def run(self):
+        """Reads frames until the connection closes, then queues None."""
+        try:
+            while True:
+                while self.decoder.frames:
+                    self.frames.put(self.decoder.frames.popleft())
+                data = self.sock.recv(4096)
+                if not data:
+                    break
+                self.lastseen = time.monotonic()
+                self.decoder.feed(data)
+        except (OSError, protocol.ProtocolError):
+            pass
+        self.frames.put(None)
+
+
+    def drain(self) -> list:
+        """Returns every frame received since the last call without blocking.
+
+        Returns:
+            list: (msgtype, payload) tuples, with None marking a closed connection.
+        """
+        drained = []
+        while True:
+            try:
+                drained.append(self.frames.get_nowait())
+            except queue.Empty:
+                return drained
+
+
+    def send(self, frame: bytes) -> bool:
+        """Queues a frame for the peer and writes as much as the socket takes without blocking.
+
+        Args:
+            frame (bytes): The encoded frame.
+
+        Returns:
+            bool: False if the peer stopped reading and has been disconnected, True otherwise.
+        """
+        return self.sendbuffer.send(frame)
+
+
+    def flush(self, timeout: float = 0.0) -> int:
+        """Writes queued frames, waiting up to a timeout for the socket to take them.
+
+        Args:
+            timeout (float): Seconds to wait; 0 never blocks.
+
+        Returns:
+            int: Number of bytes still queued.
+        """
+        return self.sendbuffer.flush(timeout)
+
+
+    def keepAlive(self):
+        """Flushes queued frames, pings a silent peer once per heartbeat and shuts the socket down once it is gone.
+
+        Must be called from the thread that sends on the socket. After a shutdown the reader
+        thread sees the connection close and queues None as usual.
+        """
+        self.sendbuffer.flush()
+        if self.lastseen is None or self.idletimeout <= 0:
+            return
+        now = time.monotonic()
+        if now - self.lastseen >= self.idletimeout:
+            try:
+                self.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        heartbeat = min(protocol.HEARTBEAT_S, self.idletimeout / 2)
+        if now - max(self.lastseen, self.lastping or 0.0) >= heartbeat:
+            self.lastping = now
+            self.send(protocol.encodePing())
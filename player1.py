@@ -6,49 +6,103 @@ using sockets. The Player1 class represents the actions and behavior of Player 1
 Dependencies:
     - tkinter: The standard GUI library in Python.
     - socket: Provides the networking functionality for communication.
+    - protocol: A module providing the framed wire format exchanged with Player 2.
+    - netreader: Reads frames on a background thread and queues outgoing ones so the GUI never blocks on the socket.
+    - solver: Provides the computer opponent used for practice games.
+    - statsstore: Keeps each player's all-time statistics across sessions.
+    - gamerecord: Archives the move sequence of every finished game.
+    - metrics: Times the send, round trip, board apply and render of every move.
+    - boardview: Provides the game screen, redrawn at most once per event-loop tick.
     - gameboard: A module providing the BoardClass for maintaining game state.
 
 Usage:
     To play the game, create an instance of the Player1 class, passing the tkinter root window and an instance
     of BoardClass as arguments. Then, connect to Player2 via the `connectToP2()` method to initiate the game setup and GUI.
+    The connection screen also offers a practice game against the built-in perfect-play computer opponent.
+    If the connection drops mid-session, Player 1 reconnects with the session token it was given and
+    picks the game up from the snapshot the host sends back. Every move carries a digest of the
+    board, and a move whose digest disagrees with the local board makes Player 1 ask the host to
+    resend the full state the same way.
+    Player 1 can also connect to the headless server. The server's START frame then sets the mark
+    Player 1 plays and the board shape, and its RESULT frames decide every game.
 """
 import tkinter as tk
 import socket
+import time
+import protocol
+from netreader import SocketReader, POLL_INTERVAL_MS
+from solver import SolverBot
+from statsstore import StatsStore
+from gamerecord import GameRecorder, archivePath
+import metrics
+from boardview import BoardView
 from gameboard import BoardClass
 
+RESUME_RETRY_MS = 1000
+QUIT_FLUSH_S = 2.0
+
 class Player1():
     """Represents Player 1 in the Tic Tac Toe game.
 
     Attributes:
         root (tk.Tk): The main tkinter root window.
         game_board (BoardClass): Instance of the game board.
-        client_socket (socket.socket): Socket for communicating with Player 2.
+        client_socket (socket.socket): Socket for communicating with Player 2, or the SolverBot in practice games.
+        decoder (protocol.FrameDecoder): Reassembles frames received from Player 2.
+        reader (SocketReader): Background reader delivering Player 2's frames and queueing frames sent to it, or the SolverBot in practice games.
+        recorder (GameRecorder): Archive finished games' moves are appended to.
+        recording (bool): True if Player 1 archives the games itself, against the server or the
+            computer; Player 2 archives peer-to-peer games.
+        sentat (int): perf_counter_ns() reading taken when the last move was sent, or None.
+        practicebutton (tk.Button): Button starting a practice game against the computer.
+        userwidgets (tuple): Username prompt widgets removed once Player 2's name arrives.
         gameheading (tk.Label): GUI label for game heading.
         gamesubheading (tk.Label): GUI label for game subheading.
         turn_label (tk.Label): GUI label for displaying current turn.
+        view (BoardView): The game screen, created once and reset for every rematch.
         guiboard (list): 2D list of GUI buttons representing the game board.
+        endwidgets (tuple): Play-again prompt widgets, created once and hidden between games.
+        endingentry (tk.Entry): Entry of the play-again prompt.
+        address (tuple): (host, port) Player 1 connected to, used to reconnect.
+        token (bytes): Session token received from the host, or None.
+        resyncing (bool): True while waiting for the host's answer to a RESYNC.
+        hosted (bool): True once the headless server has sent START; it then decides every result.
 
     Methods:
         connectToP2(): Set up connection to Player 2.
         attemptConnection(connectip, ipentry, connectport, portentry, initialize):
             Attempt connection to Player 2.
         connect_to_server(host, port): Establish connection to the server.
+        startPractice(): Play against the computer instead of a remote Player 2.
         showRetryPrompt(): Display retry prompt after connection failure.
         determineIfRetry(cannotconnect, cannotentry, retryatt):
             Determine if the user wants to retry the connection.
         retryConnection(): Retry the connection.
         enterUsername(): Prompt for entering username.
         sendAndReceiveUser(enteruser, userentry, submituser):
-            Send user's name and receive opponent's name.
+            Send user's name and start listening for opponent's name.
+        pollNetwork(): Dispatch frames received since the last poll.
+        handleFrame(msgtype, payload): Dispatch one frame received from Player 2.
+        dropConnection(): Shut down a connection that sent a malformed frame.
+        receiveUser(p2user): Record opponent's name and start the game.
+        startGame(mark, shape, name): Take the mark and board shape assigned by the headless server.
+        receiveResult(outcome): Apply a result announced by the headless server.
+        connectionLost(): Handle Player 2 closing the connection.
+        resumeSession(deadline): Reconnect and ask the host to resume the session.
+        restoreSession(mark, awaitingrematch, state): Rebuild the game from the host's snapshot.
         setGUI(): Set up the GUI for the game.
-        createGameBoard(): Create the game board GUI.
-        receiveMove(): Receive opponent's move.
+        createGameBoard(): Create the game screen.
+        renderMove(row, col, mark): Mirror a board change onto the GUI.
+        receiveMove(row, col, digest): Apply opponent's move.
+        requestResync(): Ask the host for the full state after a digest mismatch.
         clickButton(row, col): Handle button click event.
         disableButton(): Disable all buttons on the game board.
         enableButton(): Enable all buttons on the game board.
         endGame(): Handle end of the game.
+        hideEndPrompt(): Hide the play-again prompt.
         determineIfEnd(): Determine if the player wants to end the game.
         showStats(): Display final game statistics.
+        saveResults(numwins, numlosses, numties) -> dict: Save the session's results to the stats store.
     """
 
     def __init__(self, root: tk.Tk, game_board: BoardClass):
@@ -61,10 +115,25 @@ class Player1():
         self.root = root
         self.game_board = game_board
         self.client_socket = None
+        self.decoder = protocol.FrameDecoder()
+        self.reader = None
+        self.recorder = GameRecorder(archivePath('player1'))
+        self.sentat = None
+        self.practicebutton = None
+        self.userwidgets = None
+        self.address = None
+        self.token = None
+        self.resyncing = False
+        self.hosted = False
+        self.recording = False
         self.gameheading = tk.Label(self.root, text="Default")
         self.gamesubheading = tk.Label(self.root, text="Default")
         self.turn_label = tk.Label(self.root, text="Default")
+        self.view = None
         self.guiboard = None
+        self.endwidgets = None
+        self.endingentry = None
+        self.game_board.subscribe(self.renderMove)
 
         
     def connectToP2(self):
@@ -81,6 +150,8 @@ class Player1():
         portentry.pack()
         initialize = tk.Button(self.root, text="Connect", command=lambda: self.attemptConnection(connectip, ipentry, connectport, portentry, initialize))
         initialize.pack()
+        self.practicebutton = tk.Button(self.root, text="Play Computer", command=self.startPractice)
+        self.practicebutton.pack()
 
         
     def attemptConnection(self, connectip: tk.Label, ipentry: tk.Entry, connectport: tk.Label, portentry: tk.Entry, initialize: tk.Button):
@@ -101,8 +172,10 @@ class Player1():
             connectport.destroy()
             portentry.destroy()
             initialize.destroy()
+            self.practicebutton.destroy()
             client_socket = self.connect_to_server(host, port)
             self.client_socket = client_socket
+            self.address = (host, port)
             self.enterUsername()
         except (ValueError, ConnectionRefusedError, Exception):
             connectip.destroy()
@@ -110,6 +183,7 @@ class Player1():
             connectport.destroy()
             portentry.destroy()
             initialize.destroy()
+            self.practicebutton.destroy()
             self.showRetryPrompt()
 
             
@@ -128,6 +202,17 @@ class Player1():
         return client_socket
 
 
+    def startPractice(self):
+        """Play against the computer instead of a remote Player 2."""
+        for widget in self.root.winfo_children():
+            widget.destroy()
+        bot = SolverBot()
+        self.recording = True
+        self.client_socket = bot
+        self.reader = bot
+        self.enterUsername()
+
+
     def showRetryPrompt(self):
         """Display retry prompt after connection failure."""
         cannotconnect = tk.Label(self.root, text="An connection error occurred. Would you like to try again? (y/n):")
@@ -177,7 +262,7 @@ class Player1():
 
 
     def sendAndReceiveUser(self, enteruser: tk.Label, userentry: tk.Entry, submituser: tk.Button):
-        """Send user's name and receive opponent's name.
+        """Send user's name and start listening for opponent's name.
 
         Args:
             enteruser (tk.Label): Label widget for entering username.
@@ -185,79 +270,304 @@ class Player1():
             submituser (tk.Button): Button widget for submitting username.
         """
         userentry.config(state="disabled")
+        submituser.config(state="disabled")
         p1user = userentry.get()
-        self.client_socket.send(p1user.encode())
-        self.root.title("Waiting on Opponent's User...")
-        p2user = self.client_socket.recv(1024).decode()
         self.game_board.setPlayer1Name(p1user)
+        self.userwidgets = (enteruser, userentry, submituser)
+        if self.reader is None:
+            self.reader = SocketReader(self.client_socket, self.decoder)
+        self.reader.send(protocol.encodeHello(p1user))
+        self.root.title("Waiting on Opponent's User...")
+        self.reader.start()
+        self.pollNetwork()
+
+
+    def pollNetwork(self):
+        """Flush queued frames, ping Player 2 if it has gone quiet, dispatch frames received since the last poll and schedule the next poll."""
+        self.reader.keepAlive()
+        for frame in self.reader.drain():
+            if frame is None:
+                self.connectionLost()
+                return
+            try:
+                self.handleFrame(*frame)
+            except protocol.ProtocolError:
+                self.dropConnection()
+                return
+        self.root.after(POLL_INTERVAL_MS, self.pollNetwork)
+
+
+    def handleFrame(self, msgtype: int, payload: bytes):
+        """Dispatch one frame received from Player 2.
+
+        Args:
+            msgtype (int): The frame's message type.
+            payload (bytes): The frame's payload.
+
+        Raises:
+            protocol.ProtocolError: If the frame is malformed or its move is off the board.
+        """
+        if msgtype == protocol.HELLO:
+            self.receiveUser(protocol.decodeHello(payload))
+        elif msgtype == protocol.MOVE:
+            row, col = protocol.decodeMove(payload)
+            if not (0 <= row < self.game_board.rows and 0 <= col < self.game_board.columns):
+                raise protocol.ProtocolError(f"move ({row}, {col}) is off the board")
+            self.receiveMove(row, col, protocol.decodeMoveDigest(payload))
+        elif msgtype == protocol.TOKEN:
+            self.token = protocol.decodeToken(payload)
+        elif msgtype == protocol.RESUMED:
+            self.restoreSession(*protocol.decodeResumed(payload))
+        elif msgtype == protocol.START:
+            self.startGame(protocol.decodeStart(payload), protocol.decodeStartBoard(payload),
+                           protocol.decodeStartName(payload))
+        elif msgtype == protocol.RESULT:
+            self.receiveResult(protocol.decodeResult(payload))
+        elif msgtype == protocol.REMATCH:
+            self.setGUI()
+        elif msgtype == protocol.QUIT:
+            self.token = None
+        elif msgtype == protocol.PING:
+            self.reader.send(protocol.encodePong())
+
+
+    def dropConnection(self):
+        """Shut down a connection that sent a malformed frame and handle it as lost."""
+        if isinstance(self.client_socket, socket.socket):
+            try:
+                self.client_socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.connectionLost()
+
+
+    def receiveUser(self, p2user: str):
+        """Record opponent's name and start the game.
+
+        Args:
+            p2user (str): Player 2's username.
+        """
+        p1user = self.game_board.player1
         self.game_board.setPlayer2Name(p2user)
         self.game_board.addWinLoss(p1user)
         self.game_board.addWinLoss(p2user)
         self.game_board.setPlayerProfile1()
-        enteruser.destroy()
-        userentry.destroy()
-        submituser.destroy()
+        for widget in self.userwidgets:
+            widget.destroy()
+        self.userwidgets = None
         self.root.title("Player 1 - Tic Tac Toe")
-        self.root.update()
         self.setGUI()
 
 
+    def startGame(self, mark: str, shape: tuple, name: str = None):
+        """Take the mark, board shape and name assigned by the headless server, which follows its HELLO with START.
+
+        The server gives 'X' to whoever waited first, so Player 1 may play 'O' and move second.
+        It renames the second of two players with the same name, so the name it sends replaces
+        the one Player 1 entered.
+
+        Args:
+            mark (str): 'X' or 'O', the mark Player 1 plays.
+            shape (tuple): The (rows, columns, winlength) of the board.
+            name (str, optional): Player 1's name in the session; None keeps the entered name.
+        """
+        self.hosted = True
+        self.recording = True
+        rows, columns, winlength = shape
+        user = self.game_board.player1 if name is None else name
+        opponent = self.game_board.player2
+        player1, player2 = (user, opponent) if mark == 'X' else (opponent, user)
+        state = self.game_board.snapshot()
+        state.update(rows=rows, columns=columns, winlength=winlength, player1=player1, player2=player2,
+                     userturn=player1, playerprofile=user, board=((' ',) * columns,) * rows, history=())
+        if self.view is not None:
+            if self.view.scheduled is not None:
+                self.root.after_cancel(self.view.scheduled)
+            self.view = None
+        self.game_board.restore(state)
+        self.game_board.addWinLoss(user)
+        self.game_board.addWinLoss(opponent)
+        self.setGUI()
+
+
+    def receiveResult(self, outcome: str):
+        """Apply a result announced by the headless server, which may end a game on time.
+
+        Args:
+            outcome (str): 'X', 'O' or 'tie'.
+        """
+        self.sentat = None
+        self.recorder.recordGame(self.game_board.history, self.game_board.rows, self.game_board.columns,
+                                 self.game_board.winlength, outcome)
+        if outcome == 'tie':
+            self.game_board.recordTie()
+            self.view.setSubheading("It's a tie!")
+        else:
+            if self.game_board.currentMark() != outcome:
+                self.game_board.changePlayerTurn()
+            self.game_board.recordWin()
+            self.view.setSubheading(f"{self.game_board.userturn} is the Winner!")
+        self.game_board.updateGamesPlayed()
+        self.game_board.resetGameBoard()
+        self.view.setWaiting(False)
+        self.endGame()
+
+
+    def connectionLost(self):
+        """Handle Player 2 closing the connection, resuming the session if it can."""
+        if self.view is not None:
+            self.disableButton()
+        if self.token is not None and self.address is not None:
+            self.root.title("Reconnecting...")
+            self.resumeSession(time.monotonic() + protocol.RESUME_GRACE_S)
+            return
+        self.root.title("Connection to Opponent Lost")
+
+
+    def resumeSession(self, deadline: float):
+        """Reconnect and ask the host to resume the session, retrying until the deadline.
+
+        Args:
+            deadline (float): time.monotonic() value after which the session is given up.
+        """
+        try:
+            sock = socket.create_connection(self.address, timeout=1.0)
+        except OSError:
+            if time.monotonic() < deadline:
+                self.root.after(RESUME_RETRY_MS, self.resumeSession, deadline)
+            else:
+                self.token = None
+                self.connectionLost()
+            return
+        sock.settimeout(None)
+        self.client_socket = sock
+        self.decoder = protocol.FrameDecoder()
+        self.reader = SocketReader(sock, self.decoder)
+        self.reader.send(protocol.encodeResume(self.token))
+        self.reader.start()
+        self.pollNetwork()
+
+
+    def restoreSession(self, mark: str, awaitingrematch: bool, state: dict):
+        """Rebuild the game from the snapshot the host sent back.
+
+        Args:
+            mark (str): 'X' or 'O', the mark Player 1 plays.
+            awaitingrematch (bool): True if the last game has ended and no rematch has been chosen.
+            state (dict): The session state decoded from the RESUMED frame.
+        """
+        self.resyncing = False
+        self.setGUI()
+        self.game_board.restore(state)
+        if mark == 'X':
+            self.game_board.setPlayerProfile1()
+        else:
+            self.game_board.setPlayerProfile2()
+        self.root.title("Player 1 - Tic Tac Toe")
+        self.view.setTurn(f"Turn: {self.game_board.userturn}")
+        if awaitingrematch:
+            self.disableButton()
+            self.endGame()
+        elif self.game_board.userturn != self.game_board.playerprofile:
+            self.disableButton()
+            self.view.setWaiting(True)
+        else:
+            self.enableButton()
+            self.view.setWaiting(False)
+
+
     def setGUI(self):
-        """Initializes GUI setup."""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        self.root.update()
-        self.heading = tk.Label(self.root, text="Tic Tac Toe")
-        self.heading.grid(row=0, column=1)
-        self.subheading = tk.Label(self.root, text="Game Start!")
-        self.subheading.grid(row=1, column=1)
+        """Initializes GUI setup, or resets the existing game screen for a rematch."""
+        self.sentat = None
         self.game_board.resetDefaultTurn()
-        self.turn_label = tk.Label(self.root, text=f"Turn: {self.game_board.userturn}")
-        self.turn_label.grid(row=2, column=1)
-        self.createGameBoard()
+        if self.view is None:
+            for widget in self.root.winfo_children():
+                widget.destroy()
+            self.createGameBoard()
+        else:
+            self.hideEndPrompt()
+            self.view.reset()
+        self.view.setTurn(f"Turn: {self.game_board.userturn}")
+        if self.game_board.userturn != self.game_board.playerprofile:
+            self.disableButton()
+            self.view.setWaiting(True)
 
 
     def createGameBoard(self):
-        """Creates gameboard GUI."""
-        self.guiboard = []
-        for row in range(3):
-            row_buttons = []
-            for col in range(3):
-                button = tk.Button(self.root, text="", width=10, height=3, command=lambda row=row, col=col: self.clickButton(row, col))
-                button.grid(row=row + 4, column=col)
-                row_buttons.append(button)
-            self.guiboard.append(row_buttons)
-        self.enableButton()
-
-
-    def receiveMove(self):
-        """Receives move from opponent."""
-        waitlabel = tk.Label(self.root, text="Waiting...")
-        waitlabel.grid(row=3, column=1)
-        self.root.update()
-        move_info = self.client_socket.recv(1024).decode()
-        waitlabel.destroy()
-        self.root.update()
-        row, col = map(int, move_info.split(','))
-        self.game_board.updateGameBoard(row, col, self.guiboard)
-        if self.game_board.isWinner():
+        """Creates the game screen and the hidden play-again prompt."""
+        self.view = BoardView(self.root, self.game_board.rows, self.game_board.columns, self.clickButton)
+        self.guiboard = self.view.buttons
+        endinglabel = tk.Label(self.root, text="The game has ended... Play again? (y/n)")
+        self.endingentry = tk.Entry(self.root)
+        endingsubmit = tk.Button(self.root, text="Submit", command=self.determineIfEnd)
+        self.endwidgets = (endinglabel, self.endingentry, endingsubmit)
+
+
+    def renderMove(self, row: int, col: int, mark: str):
+        """Queues a board change for the next redraw of the GUI buttons.
+
+        Args:
+            row (int): Row index of the changed cell.
+            col (int): Column index of the changed cell.
+            mark (str): The new mark of the cell, ' ' when cleared.
+        """
+        if self.view is not None:
+            self.view.setCell(row, col, mark)
+
+
+    def receiveMove(self, row: int, col: int, digest: int = None):
+        """Applies a move received from opponent.
+
+        Args:
+            row (int): Row index of the opponent's move.
+            col (int): Column index of the opponent's move.
+            digest (int, optional): The opponent's board digest after the move.
+        """
+        if self.resyncing:
+            return
+        self.view.setWaiting(False)
+        if self.sentat is not None:
+            metrics.MOVE_ROUND_TRIP.observeSince(self.sentat)
+            self.sentat = None
+        start = time.perf_counter_ns()
+        try:
+            self.game_board.updateGameBoard(row, col)
+        except ValueError:
+            self.requestResync()
+            return
+        metrics.MOVE_APPLY.observeSince(start)
+        if digest is not None and digest != self.game_board.digest():
+            self.requestResync()
+            return
+        if self.hosted and self.game_board.outcome() is not None:
+            self.disableButton()
+        elif self.game_board.isWinner():
+            if self.recording:
+                self.recorder.recordBoard(self.game_board)
             self.game_board.updateGamesPlayed()
             self.game_board.resetGameBoard()
-            self.subheading.config(text=f"{self.game_board.userturn} is the Winner!")
-            self.root.update()
+            self.view.setSubheading(f"{self.game_board.userturn} is the Winner!")
             self.endGame()
         elif self.game_board.boardIsFull():
+            if self.recording:
+                self.recorder.recordBoard(self.game_board)
             self.game_board.updateGamesPlayed()
             self.game_board.resetGameBoard()
-            self.subheading.config(text="It's a tie!")
-            self.root.update()
+            self.view.setSubheading("It's a tie!")
             self.endGame()
         else:
             self.game_board.changePlayerTurn()
-            self.turn_label.config(text=f"Turn: {self.game_board.userturn}")
-            self.root.update()
+            self.view.setTurn(f"Turn: {self.game_board.userturn}")
             self.enableButton()
-            
+
+
+    def requestResync(self):
+        """Asks the host for the full session state once the boards have diverged."""
+        self.resyncing = True
+        self.disableButton()
+        self.view.setWaiting(True)
+        self.reader.send(protocol.encodeResync())
+
         
     def clickButton(self, row, col):
         """Handles button click event.
@@ -266,66 +576,82 @@ class Player1():
             row (int): Row index of the clicked button.
             col (int): Column index of the clicked button.
         """
+        if not self.view.isEnabled():
+            return
         try:
-            self.game_board.updateGameBoard(row, col, self.guiboard)
-            self.client_socket.send(f"{row},{col}".encode())
-            if self.game_board.isWinner():
+            start = time.perf_counter_ns()
+            self.game_board.updateGameBoard(row, col)
+            metrics.MOVE_APPLY.observeSince(start)
+            start = time.perf_counter_ns()
+            self.reader.send(protocol.encodeMove(row, col, self.game_board.digest()))
+            metrics.MOVE_SEND.observeSince(start)
+            self.sentat = time.perf_counter_ns()
+            if self.hosted and self.game_board.outcome() is not None:
+                self.disableButton()
+                self.view.setWaiting(True)
+            elif self.game_board.isWinner():
+                if self.recording:
+                    self.recorder.recordBoard(self.game_board)
                 self.disableButton()
                 self.game_board.updateGamesPlayed()
                 self.game_board.resetGameBoard()
-                self.subheading.config(text=f"{self.game_board.userturn} is the Winner!")
-                self.root.update()
+                self.view.setSubheading(f"{self.game_board.userturn} is the Winner!")
                 self.endGame()
             elif self.game_board.boardIsFull():
+                if self.recording:
+                    self.recorder.recordBoard(self.game_board)
                 self.disableButton()
                 self.game_board.updateGamesPlayed()
                 self.game_board.resetGameBoard()
-                self.subheading.config(text="It's a tie!")
-                self.root.update()
+                self.view.setSubheading("It's a tie!")
                 self.endGame()
             else:
                 self.game_board.changePlayerTurn()
-                self.turn_label.config(text=f"Turn: {self.game_board.userturn}")
-                self.root.update()
+                self.view.setTurn(f"Turn: {self.game_board.userturn}")
                 self.disableButton()
-                self.receiveMove()
+                self.view.setWaiting(True)
         except ValueError:
-            self.turn_label.config(text=f"Invalid move.")
+            self.view.setTurn("Invalid move.")
 
         
     def disableButton(self):
-        """Disable all buttons on the game board."""
-        for row in self.guiboard:
-            for button in row:
-                button.config(state="disabled")
+        """Disable all buttons on the game board at the next redraw."""
+        self.view.setEnabled(False)
 
 
     def enableButton(self):
-        """Enables all buttons on the game board."""
-        for row in self.guiboard:
-            for button in row:
-                button.config(state="normal")
+        """Enables all buttons on the game board at the next redraw."""
+        self.view.setEnabled(True)
 
                 
     def endGame(self):
-        """Handles end of the game."""
-        endinglabel = tk.Label(self.root, text="The game has ended... Play again? (y/n)")
-        endinglabel.grid(row=9, column=1)
-        self.endingentry = tk.Entry()
-        self.endingentry.grid(row=10,column=1)
-        endingsubmit = tk.Button(self.root, text="Submit", command=self.determineIfEnd)
-        endingsubmit.grid(row=11,column=1)
-        self.root.update()
-        
+        """Handles end of the game by showing the play-again prompt."""
+        self.disableButton()
+        self.endingentry.delete(0, tk.END)
+        for offset, widget in enumerate(self.endwidgets):
+            widget.grid(row=self.game_board.rows + 6 + offset, column=1)
+
+
+    def hideEndPrompt(self):
+        """Hides the play-again prompt until the next game ends."""
+        for widget in self.endwidgets:
+            widget.grid_remove()
+
+
     def determineIfEnd(self):
         """Determines if the player wants to end the game."""
         response = self.endingentry.get().lower()
         if response == 'y':
-            self.client_socket.send(f"Play Again".encode())
-            self.game_board.resetDefaultTurn()
-            self.setGUI()
+            if self.game_board.playerprofile == self.game_board.player1:
+                self.reader.send(protocol.encodeRematch())
+                self.setGUI()
+            else:
+                # Only the player moving first decides on a rematch; its REMATCH starts the next game.
+                self.hideEndPrompt()
+                self.view.setWaiting(True)
         elif response == 'n':
-            self.client_socket.send(f"Fun Times".encode())
+            self.reader.send(protocol.encodeQuit())
+            self.reader.flush(QUIT_FLUSH_S)
             self.game_board.resetDefaultTurn()
             self.game_board.updateGamesPlayed()
             self.game_board.resetGameBoard()
@@ -333,7 +659,8 @@ class Player1():
             self.root.update()
             exit()
         else:
-            self.client_socket.send(f"Fun Times".encode())
+            self.reader.send(protocol.encodeQuit())
+            self.reader.flush(QUIT_FLUSH_S)
             self.showStats()
             exit()
                        
@@ -343,6 +670,9 @@ class Player1():
             widget.destroy()
         player1, player2, gamesplayed, numwins, numlosses, numties = self.game_board.computeStats()
         gamesplayed -= 1
+        lifetime = self.saveResults(numwins, numlosses, numties)
+        self.recorder.close()
+        metrics.REGISTRY.writeText()
         end_label = tk.Label(self.root, text="The game has ended!")
         end_label.pack()
         stats_label = tk.Label(self.root, text="Final Statistics:")
@@ -354,10 +684,32 @@ class Player1():
             f"Number of Losses ({player1}): {numlosses}\n"
             f"Number of Ties: {numties}"
         )
+        if lifetime is not None:
+            stats_text += f"\n\nAll-time: {lifetime['wins']} wins, {lifetime['losses']} losses, {lifetime['ties']} ties"
         stats_display = tk.Label(self.root, text=stats_text)
         stats_display.pack()
 
 
+    def saveResults(self, numwins: int, numlosses: int, numties: int) -> dict:
+        """Save the session's results to the stats store, which is only opened once a game has finished.
+
+        Args:
+            numwins (int): Games Player 1 won this session.
+            numlosses (int): Games Player 1 lost this session.
+            numties (int): Games tied this session.
+
+        Returns:
+            dict: Player 1's all-time totals, or None if no game finished.
+        """
+        if not (numwins or numlosses or numties):
+            return None
+        stats = StatsStore()
+        stats.recordResults(self.game_board.playerprofile, numwins, numlosses, numties)
+        lifetime = stats.lookup(self.game_board.playerprofile)
+        stats.close()
+        return lifetime
+
+
 if __name__ == "__main__":
     root = tk.Tk()
     game_board = BoardClass()
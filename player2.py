@@ -6,16 +6,32 @@ using sockets. The Player2 class represents the actions and behavior of Player 2
 Dependencies:
     - tkinter: The standard GUI library in Python.
     - socket: Provides the networking functionality for communication.
-    - threading: Allows for concurrent execution of functions.
+    - protocol: A module providing the framed wire format exchanged with Player 1.
+    - netreader: Reads frames on a background thread and queues outgoing ones so the GUI never blocks on the socket.
+    - statsstore: Keeps each player's all-time statistics across sessions.
+    - gamerecord: Archives the move sequence of every finished game.
+    - metrics: Times the send, round trip, board apply and render of every move.
+    - boardview: Provides the game screen, redrawn at most once per event-loop tick.
     - gameboard: A module providing the BoardClass for maintaining game state.
 
 Usage:
     To play the game, create an instance of the Player2 class, passing the tkinter root window and an instance
     of BoardClass as arguments. Then, call the `startServer()` method to initiate the game setup and GUI.
+    Player 2 hands Player 1 a session token; if Player 1's connection drops, Player 2 keeps the game
+    and waits for Player 1 to reconnect with that token before ending the session. Player 2's board
+    is authoritative: every move carries a digest of the board, and whenever the digests disagree
+    Player 2 sends Player 1 the full state.
 """
 import tkinter as tk
 import socket
-import threading
+import secrets
+import time
+import protocol
+from netreader import SocketReader, POLL_INTERVAL_MS
+from statsstore import StatsStore
+from gamerecord import GameRecorder, archivePath
+import metrics
+from boardview import BoardView
 from gameboard import BoardClass  # Import your gameboard module
 
 class Player2():
@@ -27,23 +43,44 @@ class Player2():
         game_board (BoardClass): The game board instance.
         server_socket (socket.socket): The server socket for communication.
         client_socket (socket.socket): The client socket for communication.
+        decoder (protocol.FrameDecoder): Reassembles frames received from Player 1.
+        reader (SocketReader): Background reader delivering Player 1's frames and queueing frames sent to it.
+        recorder (GameRecorder): Archive every finished game's moves are appended to.
+        sentat (int): perf_counter_ns() reading taken when the last move was sent, or None.
+        view (BoardView): The game screen, created once and reset for every rematch.
         guiboard (list): The 2D list of GUI buttons representing the game board.
-        is_waiting (bool): Flag to indicate if the player is waiting.
+        is_waiting (bool): Flag to indicate if the player is waiting for Player 1 to connect.
+        token (bytes): Session token handed to Player 1, or None before the handshake.
+        awaiting_rematch (bool): True between the end of a game and Player 1's decision.
 
     Methods:
         startServer(): Starts the server to wait for Player 1.
         initializeServer(): Initializes the server socket and starts waiting for Player 1.
         create_server_socket(host, port): Creates a server socket for communication.
-        waitForPlayer1(): Waits for Player 1 to connect.
+        waitForPlayer1(): Polls the server socket until Player 1 connects.
         enterUsername(): Allows Player 2 to enter their username.
-        sendUsername(): Sends Player 2's username to Player 1 and prepares for the game.
-        setGUI(): Sets up the game GUI.
-        createGameBoard(): Creates the GUI representation of the game board.
-        receiveMove(): Receives and processes the opponent's move.
+        sendUsername(): Sends Player 2's username and starts listening for Player 1's frames.
+        pollNetwork(): Dispatches frames received since the last poll.
+        dispatchFrames(frames) -> bool: Dispatches received frames until the connection closes.
+        handleFrame(msgtype, payload): Dispatches one frame received from Player 1.
+        dropConnection(): Shuts down a connection that sent a malformed frame.
+        receiveUser(p1user): Records Player 1's name and prepares for the game.
+        connectionLost(): Handles Player 1 closing the connection.
+        waitForResume(deadline): Polls the server socket for Player 1 reconnecting.
+        pollResume(deadline): Waits for a reconnected client to prove it is Player 1.
+        rejectClient(deadline): Drops a client that failed to resume and keeps waiting.
+        resumeSession(): Sends a reconnected Player 1 the session snapshot.
+        sendState(): Sends Player 1 the full session state.
+        showWaiting(): Shows the waiting label until Player 1's next frame arrives.
+        setGUI(): Sets up the game GUI, or resets it for a rematch.
+        createGameBoard(): Creates the game screen.
+        renderMove(row, col, mark): Queues a board change for the next redraw.
+        receiveMove(row, col, digest): Processes the opponent's move.
         clickButton(row, col): Handles the player's move when clicking a button.
         disableButton(): Disables all buttons on the GUI.
         enableButton(): Enables all buttons on the GUI.
         endGame(): Displays final statistics and ends the game.
+        saveResults(numwins, numlosses, numties) -> dict: Saves the session's results to the stats store.
     """
 
     def __init__(self, root: tk.Tk, game_board: BoardClass):
@@ -57,8 +94,16 @@ class Player2():
         self.game_board = game_board
         self.server_socket = None
         self.client_socket = None
+        self.decoder = protocol.FrameDecoder()
+        self.reader = None
+        self.recorder = GameRecorder(archivePath('player2'))
+        self.sentat = None
+        self.view = None
         self.guiboard = None
+        self.game_board.subscribe(self.renderMove)
         self.is_waiting = False
+        self.token = None
+        self.awaiting_rematch = False
 
 
     def startServer(self):
@@ -83,7 +128,10 @@ class Player2():
         host = self.host_entry.get()
         port = int(self.port_entry.get())
         self.server_socket = self.create_server_socket(host, port)
-        threading.Thread(target=self.waitForPlayer1).start()
+        self.server_socket.setblocking(False)
+        self.is_waiting = True
+        self.root.title("Waiting for Connection...")
+        self.waitForPlayer1()
 
 
     def create_server_socket(self, host: str, port: int) -> socket.socket:
@@ -103,9 +151,14 @@ class Player2():
 
 
     def waitForPlayer1(self):
-        """Waits for Player 1 to connect."""
-        self.root.title("Waiting for Connection...")
-        self.client_socket, _ = self.server_socket.accept()
+        """Polls the server socket until Player 1 connects."""
+        try:
+            self.client_socket, _ = self.server_socket.accept()
+        except BlockingIOError:
+            self.root.after(POLL_INTERVAL_MS, self.waitForPlayer1)
+            return
+        self.client_socket.setblocking(True)
+        self.is_waiting = False
         self.enterUsername()
 
 
@@ -126,86 +179,266 @@ class Player2():
         """Sends Player 2's username to Player 1 and prepares for the game."""
         self.submit_user_button.config(state="disabled")
         p2user = self.userentry.get()
-        self.client_socket.send(p2user.encode())
+        self.game_board.setPlayer2Name(p2user)
+        self.reader = SocketReader(self.client_socket, self.decoder)
+        self.reader.send(protocol.encodeHello(p2user))
         self.root.title("Waiting on Opponent's User...")
-        p1user = self.client_socket.recv(1024).decode()
+        self.reader.start()
+        self.pollNetwork()
+
+
+    def pollNetwork(self):
+        """Flushes queued frames, pings Player 1 if it has gone quiet, dispatches frames received since the last poll and schedules the next poll."""
+        self.reader.keepAlive()
+        if self.dispatchFrames(self.reader.drain()):
+            self.root.after(POLL_INTERVAL_MS, self.pollNetwork)
+
+
+    def dispatchFrames(self, frames: list) -> bool:
+        """Dispatches received frames, stopping at the first sign that the connection is gone.
+
+        Args:
+            frames (list): (msgtype, payload) tuples, with None marking a closed connection.
+
+        Returns:
+            bool: True if the connection is still open, False once it has been handled as lost.
+        """
+        for frame in frames:
+            if frame is None:
+                self.connectionLost()
+                return False
+            try:
+                self.handleFrame(*frame)
+            except protocol.ProtocolError:
+                self.dropConnection()
+                return False
+        return True
+
+
+    def handleFrame(self, msgtype: int, payload: bytes):
+        """Dispatches one frame received from Player 1.
+
+        Args:
+            msgtype (int): The frame's message type.
+            payload (bytes): The frame's payload.
+
+        Raises:
+            protocol.ProtocolError: If the frame is malformed or its move is off the board.
+        """
+        if msgtype == protocol.HELLO:
+            self.receiveUser(protocol.decodeHello(payload))
+        elif msgtype == protocol.MOVE:
+            row, col = protocol.decodeMove(payload)
+            if not (0 <= row < self.game_board.rows and 0 <= col < self.game_board.columns):
+                raise protocol.ProtocolError(f"move ({row}, {col}) is off the board")
+            self.receiveMove(row, col, protocol.decodeMoveDigest(payload))
+        elif msgtype == protocol.RESYNC:
+            self.sendState()
+        elif msgtype == protocol.REMATCH:
+            self.awaiting_rematch = False
+            self.setGUI()
+        elif msgtype == protocol.QUIT:
+            self.game_board.resetDefaultTurn()
+            self.endGame()
+        elif msgtype == protocol.PING:
+            self.reader.send(protocol.encodePong())
+
+
+    def dropConnection(self):
+        """Shuts down a connection that sent a malformed frame and handles it as lost."""
+        try:
+            self.client_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.connectionLost()
+
+
+    def receiveUser(self, p1user: str):
+        """Records Player 1's name and prepares for the game.
+
+        Args:
+            p1user (str): Player 1's username.
+        """
+        p2user = self.game_board.player2
         self.game_board.setPlayer1Name(p1user)
-        self.game_board.setPlayer2Name(p2user)
         self.game_board.addWinLoss(p1user)
         self.game_board.addWinLoss(p2user)
         self.game_board.setPlayerProfile2()
+        self.token = secrets.token_bytes(protocol.TOKEN_SIZE)
+        self.reader.send(protocol.encodeToken(self.token))
         self.userentry.destroy()
         self.root.title("Player 2 - Tic Tac Toe")
-        self.root.after(0, self.setGUI)
+        self.setGUI()
+
+
+    def connectionLost(self):
+        """Handles Player 1 closing the connection by waiting for it to resume."""
+        if self.view is not None:
+            self.disableButton()
+        self.client_socket.close()
+        if self.token is not None:
+            self.root.title("Waiting for Player 1 to reconnect...")
+            self.waitForResume(time.monotonic() + protocol.RESUME_GRACE_S)
+            return
+        self.root.title("Connection to Opponent Lost")
+
+
+    def waitForResume(self, deadline: float):
+        """Polls the server socket for Player 1 reconnecting, ending the game at the deadline.
+
+        Args:
+            deadline (float): time.monotonic() value after which the session is given up.
+        """
+        if time.monotonic() >= deadline:
+            self.endGame()
+            return
+        try:
+            self.client_socket, _ = self.server_socket.accept()
+        except BlockingIOError:
+            self.root.after(POLL_INTERVAL_MS, self.waitForResume, deadline)
+            return
+        self.client_socket.setblocking(True)
+        self.decoder = protocol.FrameDecoder()
+        self.reader = SocketReader(self.client_socket, self.decoder)
+        self.reader.start()
+        self.pollResume(deadline)
+
+
+    def pollResume(self, deadline: float):
+        """Waits for a reconnected client's first frame, which must be a RESUME carrying the session token.
+
+        Anything else is dropped without touching the session, and the wait for Player 1 goes
+        on until the original deadline.
+
+        Args:
+            deadline (float): time.monotonic() value after which the session is given up.
+        """
+        frames = self.reader.drain()
+        if not frames:
+            if time.monotonic() < deadline:
+                self.root.after(POLL_INTERVAL_MS, self.pollResume, deadline)
+            else:
+                self.rejectClient(deadline)
+            return
+        first = frames[0]
+        try:
+            resumed = (first is not None and first[0] == protocol.RESUME
+                       and protocol.decodeToken(first[1]) == self.token)
+        except protocol.ProtocolError:
+            resumed = False
+        if not resumed:
+            self.rejectClient(deadline)
+            return
+        self.resumeSession()
+        if self.dispatchFrames(frames[1:]):
+            self.pollNetwork()
+
+
+    def rejectClient(self, deadline: float):
+        """Drops a client that failed to resume the session and goes back to waiting for Player 1.
+
+        Args:
+            deadline (float): time.monotonic() value after which the session is given up.
+        """
+        try:
+            self.client_socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.client_socket.close()
+        self.waitForResume(deadline)
+
+
+    def resumeSession(self):
+        """Sends a reconnected Player 1 the session snapshot."""
+        self.sendState()
+        self.root.title("Player 2 - Tic Tac Toe")
+        if not self.awaiting_rematch and self.game_board.userturn == self.game_board.player2:
+            self.enableButton()
+
+
+    def sendState(self):
+        """Sends Player 1 the full session state in a RESUMED frame."""
+        self.reader.send(protocol.encodeResumed('X', self.awaiting_rematch, self.game_board.snapshot()))
+
+
+    def showWaiting(self):
+        """Shows the waiting label until Player 1's next frame arrives."""
+        self.view.setWaiting(True)
 
 
     def setGUI(self):
-        """Sets up the game GUI."""
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        self.root.update()
-        self.heading = tk.Label(self.root, text="Tic Tac Toe")
-        self.heading.grid(row=0, column=1)
-        self.subheading = tk.Label(self.root, text="Game Start!")
-        self.subheading.grid(row=1, column=1)
+        """Sets up the game GUI, or resets the existing game screen for a rematch."""
+        self.sentat = None
         self.game_board.resetDefaultTurn()
-        self.turn_label = tk.Label(self.root, text=f"Turn: {self.game_board.userturn}")
-        self.turn_label.grid(row=2, column=1)
-        self.createGameBoard()
+        if self.view is None:
+            for widget in self.root.winfo_children():
+                widget.destroy()
+            self.createGameBoard()
+        else:
+            self.view.reset()
+        self.view.setTurn(f"Turn: {self.game_board.userturn}")
+        self.disableButton()
+        self.showWaiting()
 
 
     def createGameBoard(self):
-        """Creates the GUI representation of the game board."""
-        self.guiboard = []
-        for row in range(3):
-            row_buttons = []
-            for col in range(3):
-                button = tk.Button(self.root, text="", width=10, height=3, command=lambda row=row, col=col: self.clickButton(row, col))
-                button.grid(row=row+4, column=col)
-                row_buttons.append(button)
-            self.guiboard.append(row_buttons)
-        self.root.update()
-        self.disableButton()
-        self.receiveMove()
+        """Creates the game screen."""
+        self.view = BoardView(self.root, self.game_board.rows, self.game_board.columns, self.clickButton)
+        self.guiboard = self.view.buttons
 
 
-    def receiveMove(self):
-        """Receives and processes the opponent's move."""
-        waitlabel = tk.Label(self.root, text="Waiting...")
-        waitlabel.grid(row=3, column=1)
-        self.root.update()
-        move_info = self.client_socket.recv(1024).decode()
-        waitlabel.destroy()
-        self.root.update()
-        if move_info == "Fun Times":
-            self.game_board.resetDefaultTurn()
-            self.endGame()
-        elif move_info == "Play Again":
-            self.game_board.resetDefaultTurn()
-            self.setGUI()
-        else:
-            try:
-                row, col = map(int, move_info.split(','))
-            except:
-                self.endGame()
-        self.game_board.updateGameBoard(row, col, self.guiboard)
+    def renderMove(self, row: int, col: int, mark: str):
+        """Queues a board change for the next redraw of the GUI buttons.
+
+        Args:
+            row (int): Row index of the changed cell.
+            col (int): Column index of the changed cell.
+            mark (str): The new mark of the cell, ' ' when cleared.
+        """
+        if self.view is not None:
+            self.view.setCell(row, col, mark)
+
+
+    def receiveMove(self, row: int, col: int, digest: int = None):
+        """Processes the opponent's move, resending the full state if the boards have diverged.
+
+        Args:
+            row (int): Row index of the opponent's move.
+            col (int): Column index of the opponent's move.
+            digest (int, optional): Player 1's board digest after the move.
+        """
+        self.view.setWaiting(False)
+        if self.sentat is not None:
+            metrics.MOVE_ROUND_TRIP.observeSince(self.sentat)
+            self.sentat = None
+        start = time.perf_counter_ns()
+        try:
+            self.game_board.updateGameBoard(row, col)
+        except ValueError:
+            self.sendState()
+            return
+        metrics.MOVE_APPLY.observeSince(start)
+        diverged = digest is not None and digest != self.game_board.digest()
         if self.game_board.isWinner():
+            self.recorder.recordBoard(self.game_board)
+            self.awaiting_rematch = True
             self.game_board.updateGamesPlayed()
             self.game_board.resetGameBoard()
-            self.subheading.config(text=f"{self.game_board.userturn} is the Winner!")
-            self.root.update()
-            self.receiveMove()
+            self.view.setSubheading(f"{self.game_board.userturn} is the Winner!")
+            self.showWaiting()
         elif self.game_board.boardIsFull():
+            self.recorder.recordBoard(self.game_board)
+            self.awaiting_rematch = True
             self.game_board.updateGamesPlayed()
             self.game_board.resetGameBoard()
-            self.subheading.config(text="It's a tie!")
-            self.root.update()
-            self.receiveMove()
+            self.view.setSubheading("It's a tie!")
+            self.showWaiting()
         else:
             self.game_board.changePlayerTurn()
-            self.turn_label.config(text=f"Turn: {self.game_board.userturn}")
-            self.root.update()
+            self.view.setTurn(f"Turn: {self.game_board.userturn}")
             self.enableButton()
+        if diverged:
+            self.sendState()
 
 
     def clickButton(self, row: int, col: int):
@@ -215,52 +448,69 @@ class Player2():
             row (int): Row index of the clicked button.
             col (int): Column index of the clicked button.
         """
+        if not self.view.isEnabled():
+            return
         try:
-            self.game_board.updateGameBoard(row, col, self.guiboard)
-            self.client_socket.send(f"{row},{col}".encode())
+            start = time.perf_counter_ns()
+            self.game_board.updateGameBoard(row, col)
+            metrics.MOVE_APPLY.observeSince(start)
+            start = time.perf_counter_ns()
+            self.reader.send(protocol.encodeMove(row, col, self.game_board.digest()))
+            metrics.MOVE_SEND.observeSince(start)
+            self.sentat = time.perf_counter_ns()
             if self.game_board.isWinner():
+                self.recorder.recordBoard(self.game_board)
+                self.awaiting_rematch = True
                 self.game_board.updateGamesPlayed()
                 self.game_board.resetGameBoard()
-                self.subheading.config(text=f"{self.game_board.userturn} is the Winner!")
-                self.root.update()
+                self.view.setSubheading(f"{self.game_board.userturn} is the Winner!")
                 self.disableButton()
-                self.receiveMove()
+                self.showWaiting()
             elif self.game_board.boardIsFull():
+                self.recorder.recordBoard(self.game_board)
+                self.awaiting_rematch = True
                 self.game_board.updateGamesPlayed()
                 self.game_board.resetGameBoard()
-                self.subheading.config(text="It's a tie!")
-                self.root.update()
+                self.view.setSubheading("It's a tie!")
                 self.disableButton()
-                self.receiveMove()
+                self.showWaiting()
             else:
                 self.game_board.changePlayerTurn()
-                self.turn_label.config(text=f"Turn: {self.game_board.userturn}")
-                self.root.update()
+                self.view.setTurn(f"Turn: {self.game_board.userturn}")
                 self.disableButton()
-                self.receiveMove()
+                self.showWaiting()
         except ValueError:
-            self.turn_label.config(text=f"Invalid move.")
+            self.view.setTurn("Invalid move.")
 
             
     def disableButton(self):
-        """Disables all buttons on the GUI."""
-        for row in self.guiboard:
-            for button in row:
-                button.config(state="disabled")
+        """Disables all buttons on the GUI at the next redraw."""
+        self.view.setEnabled(False)
 
 
     def enableButton(self):
-        """Enables all buttons on the GUI."""
-        for row in self.guiboard:
-            for button in row:
-                button.config(state="normal")
+        """Enables all buttons on the GUI at the next redraw."""
+        self.view.setEnabled(True)
 
 
     def endGame(self):
-        """Displays final statistics and ends the game."""
+        """Displays final statistics and ends the game.
+
+        If Player 1 leaves before the handshake, there are no statistics to show or save.
+        """
         for widget in self.root.winfo_children():
                 widget.destroy()
+        if self.game_board.playerprofile is None:
+            self.recorder.close()
+            metrics.REGISTRY.writeText()
+            end_label = tk.Label(self.root, text="Player 1 left before the game started.")
+            end_label.pack()
+            self.root.update()
+            exit()
         player1, player2, gamesplayed, numwins, numlosses, numties = self.game_board.computeStats()
+        lifetime = self.saveResults(numwins, numlosses, numties)
+        self.recorder.close()
+        metrics.REGISTRY.writeText()
         end_label = tk.Label(self.root, text=f"{self.game_board.player1} has ended the game!")
         end_label.pack()
         stats_label = tk.Label(self.root, text="Final Statistics:")
@@ -272,11 +522,34 @@ class Player2():
             f"Number of Losses ({player2}): {numlosses}\n"
             f"Number of Ties: {numties}"
         )
+        if lifetime is not None:
+            stats_text += f"\n\nAll-time: {lifetime['wins']} wins, {lifetime['losses']} losses, {lifetime['ties']} ties"
         stats_display = tk.Label(self.root, text=stats_text)
         stats_display.pack()
 
         self.root.update()
         exit()
+
+
+    def saveResults(self, numwins: int, numlosses: int, numties: int) -> dict:
+        """Saves the session's results to the stats store, which is only opened once a game has finished.
+
+        Args:
+            numwins (int): Games Player 2 won this session.
+            numlosses (int): Games Player 2 lost this session.
+            numties (int): Games tied this session.
+
+        Returns:
+            dict: Player 2's all-time totals, or None if no game finished.
+        """
+        if not (numwins or numlosses or numties):
+            return None
+        stats = StatsStore()
+        stats.recordResults(self.game_board.playerprofile, numwins, numlosses, numties)
+        lifetime = stats.lookup(self.game_board.playerprofile)
+        stats.close()
+        return lifetime
+
         
 if __name__ == "__main__":
     root = tk.Tk()
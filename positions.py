@@ -0,0 +1,249 @@
+"""This module folds symmetric Tic Tac Toe positions into one canonical key.
+
+A square board has eight symmetries, the four rotations and their mirror images, and a
+rectangular one keeps four of them (both mirrors and the half turn). Every symmetry is a fixed
+permutation of the cell indexes, built once per board shape. A position's canonical key is the
+smallest of its images, so all the positions a symmetry maps onto each other share one key,
+which cuts the 5,478 legal 3x3 positions down to 765.
+
+PositionCache is a bounded least-recently-used cache keyed on canonical keys, for any
+per-position computation such as evaluations, hints or statistics. Values that do not depend
+on the board's orientation are stored as they are; moves are stored in the canonical frame and
+turned back into the asking board's orientation on every hit.
+
+Usage:
+    cache = PositionCache()
+    score = cache.get(game_board, getSolver().evaluate)
+    row, col = cache.getMove(game_board, getSolver().bestMove)
+"""
+from collections import OrderedDict
+from functools import lru_cache
+from operator import itemgetter
+
+DEFAULT_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=None)
+def symmetries(rows: int, columns: int) -> tuple:
+    """Returns the symmetries of a board shape as cell permutations.
+
+    Args:
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+
+    Returns:
+        tuple: One tuple per symmetry, the identity first, whose entry i is the cell of the
+            original board that lands on cell i of the transformed board.
+    """
+    last_row, last_col = rows - 1, columns - 1
+    maps = [
+        lambda row, col: (row, col),
+        lambda row, col: (row, last_col - col),
+        lambda row, col: (last_row - row, col),
+        lambda row, col: (last_row - row, last_col - col),
+    ]
+    if rows == columns:
+        maps += [
+            lambda row, col: (col, row),
+            lambda row, col: (col, last_row - row),
+            lambda row, col: (last_col - col, row),
+            lambda row, col: (last_col - col, last_row - row),
+        ]
+    permutations = []
+    for source in maps:
+        permutation = []
+        for row in range(rows):
+            for col in range(columns):
+                fromrow, fromcol = source(row, col)
+                permutation.append(fromrow * columns + fromcol)
+        permutations.append(tuple(permutation))
+    return tuple(dict.fromkeys(permutations))
+
+
+@lru_cache(maxsize=None)
+def symmetryGetters(rows: int, columns: int) -> tuple:
+    """Returns an itemgetter applying each symmetry of a board shape to a flat cell string."""
+    return tuple(itemgetter(*permutation) for permutation in symmetries(rows, columns))
+
+
+def cellString(game_board) -> str:
+    """Returns the marks of a board as one string in cell index order.
+
+    Args:
+        game_board (BoardClass): The board to read.
+
+    Returns:
+        str: rows * columns characters, each ' ', 'X' or 'O'.
+    """
+    return ''.join(map(''.join, game_board.board))
+
+
+def canonicalForm(game_board) -> tuple:
+    """Returns a board's canonical key and the symmetry that produces it.
+
+    Args:
+        game_board (BoardClass): The board to canonicalize.
+
+    Returns:
+        tuple: (key, permutation) where key is (rows, columns, winlength, mark to move, cells) for
+            the smallest image of the board and permutation is the entry of symmetries() mapping
+            the board onto it.
+    """
+    rows, columns = game_board.rows, game_board.columns
+    cells = cellString(game_board)
+    best = cells
+    bestindex = 0
+    if rows * columns > 1:
+        for index, getter in enumerate(symmetryGetters(rows, columns)[1:], 1):
+            image = ''.join(getter(cells))
+            if image < best:
+                best, bestindex = image, index
+    key = (rows, columns, game_board.winlength, game_board.currentMark(), best)
+    return key, symmetries(rows, columns)[bestindex]
+
+
+def canonicalKey(game_board) -> tuple:
+    """Returns a key shared by a board and all of its symmetric images.
+
+    Args:
+        game_board (BoardClass): The board to canonicalize.
+
+    Returns:
+        tuple: The hashable canonical key.
+    """
+    return canonicalForm(game_board)[0]
+
+
+class PositionCache():
+    """
+    Caches per-position results under canonical keys, evicting the least recently used.
+
+    Keys only identify the position, so each kind of computation needs a cache of its own.
+
+    Attributes:
+        maxsize (int): Maximum number of cached positions.
+        entries (OrderedDict): Maps a canonical key to its value, least recently used first.
+        hits (int): Number of lookups answered from the cache.
+        misses (int): Number of lookups that had to compute their value.
+
+    Methods:
+        get(game_board, compute) -> object: Returns a symmetry-invariant value for a board.
+        getMove(game_board, compute) -> tuple: Returns a (row, column) result for a board.
+        lookup(key, compute, game_board) -> object: Returns the value cached under a key.
+        hitRate() -> float: Returns the fraction of lookups answered from the cache.
+        clear(): Empties the cache and resets the counters.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        """Initializes the PositionCache instance.
+
+        Args:
+            maxsize (int): Maximum number of cached positions.
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def __len__(self) -> int:
+        """Returns the number of cached positions."""
+        return len(self.entries)
+
+
+    def get(self, game_board, compute):
+        """Returns a value that is the same for a board and all of its symmetric images.
+
+        Args:
+            game_board (BoardClass): The position to look up.
+            compute (callable): Called as compute(game_board) when the position is not cached.
+
+        Returns:
+            object: The cached or freshly computed value.
+        """
+        return self.lookup(canonicalKey(game_board), compute, game_board)
+
+
+    def getMove(self, game_board, compute) -> tuple:
+        """Returns a move for a board, cached once for all of its symmetric images.
+
+        Args:
+            game_board (BoardClass): The position to look up.
+            compute (callable): Called as compute(game_board) when the position is not cached;
+                returns a (row, column) on that board.
+
+        Returns:
+            tuple: The (row, column) of the move on game_board.
+        """
+        key, permutation = canonicalForm(game_board)
+        columns = game_board.columns
+
+        def computeCanonical(board):
+            row, col = compute(board)
+            return divmod(permutation.index(row * columns + col), columns)
+
+        row, col = self.lookup(key, computeCanonical, game_board)
+        return divmod(permutation[row * columns + col], columns)
+
+
+    def lookup(self, key: tuple, compute, game_board):
+        """Returns the value cached under a key, computing and storing it on a miss.
+
+        Args:
+            key (tuple): A canonical key.
+            compute (callable): Called as compute(game_board) on a miss.
+            game_board (BoardClass): The board passed to compute.
+
+        Returns:
+            object: The cached or freshly computed value.
+        """
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+            self.hits += 1
+            return entries[key]
+        self.misses += 1
+        value = compute(game_board)
+        entries[key] = value
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+        return value
+
+
+    def hitRate(self) -> float:
+        """Returns the fraction of lookups answered from the cache.
+
+        Returns:
+            float: Hits divided by lookups, or 0.0 before the first lookup.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+    def clear(self):
+        """Empties the cache and resets the counters."""
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+if __name__ == "__main__":
+    from gameboard import BoardClass
+    game_board = BoardClass()
+    seen, keys = set(), set()
+    pending = [()]
+    while pending:
+        moves = pending.pop()
+        game_board.resetGameBoard()
+        game_board.resetDefaultTurn()
+        for row, col in moves:
+            game_board.applyMove(row, col)
+            game_board.changePlayerTurn()
+        cells = cellString(game_board)
+        if cells in seen:
+            continue
+        seen.add(cells)
+        keys.add(canonicalKey(game_board))
+        if game_board.outcome() is None:
+            pending += [moves + ((row, col),) for row in range(3) for col in range(3) if game_board.getCell(row, col) == ' ']
+    print(f"{len(seen)} positions, {len(keys)} canonical keys")
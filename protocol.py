@@ -0,0 +1,689 @@
+"""This module defines the binary wire protocol spoken between Tic Tac Toe players.
+
+Every message is a frame made of a 4-byte header followed by its payload:
+
+    version (1 byte) | message type (1 byte) | payload length (2 bytes, big-endian) | payload
+
+Moves are packed into one byte as ``row << 4 | column`` on boards up to 16x16 and into two
+bytes (row, column) beyond that. TCP is a byte stream, so a single recv may return part of a
+frame or several frames at once; FrameDecoder buffers the bytes and hands out whole frames.
+
+Spectators open a connection with a WATCH frame naming a player. They receive one SNAPSHOT of
+that player's session (board shape, names, score and the moves of the current game) followed
+by the same MOVE, RESULT, REMATCH and QUIT frames the players see.
+
+Whoever hosts a game answers a player's HELLO with a TOKEN. If that player's connection drops,
+it may reconnect within RESUME_GRACE_S seconds and open with a RESUME frame carrying the token;
+the host replies with a single RESUMED frame holding the player's mark and a snapshot of the
+session, after which play continues on the new connection.
+
+A MOVE may carry the sender's BoardClass.digest() after the move as 8 extra bytes. A receiver
+whose own digest differs has lost track of the game and sends RESYNC; the host answers with the
+same RESUMED frame it sends a reconnecting player, so the full state is only exchanged once.
+
+A connection that has been silent for HEARTBEAT_S seconds is sent a PING, which the other side
+answers with a PONG; any frame counts as a sign of life, and a peer that stays silent for
+IDLE_TIMEOUT_S seconds is treated as gone. When the server plays with a chess clock, it sends
+both players and the spectators a CLOCK frame with each side's remaining time at the start of
+every game and after every move.
+
+Usage:
+    Send with the encode* helpers, e.g. ``sock.sendall(encodeMove(1, 2))``. Receive by feeding
+    every chunk read from the socket to a FrameDecoder and popping the completed frames, or
+    call `readFrame(sock, decoder)` to block until the next frame arrives.
+"""
+import struct
+from collections import deque
+
+VERSION = 1
+HEADER = struct.Struct('>BBH')
+RATING = struct.Struct('>H')
+DIGEST = struct.Struct('>Q')
+CLOCK_TIMES = struct.Struct('>II')
+SNAPSHOT_HEADER = struct.Struct('>BBBIIII')
+TOKEN_SIZE = 16
+RESUME_GRACE_S = 30.0
+HEARTBEAT_S = 10.0
+IDLE_TIMEOUT_S = 30.0
+MAX_PAYLOAD = 0xFFFF
+MAX_SIDE = 0xFF
+
+HELLO = 1
+MOVE = 2
+RESULT = 3
+REMATCH = 4
+QUIT = 5
+START = 6
+WATCH = 7
+SNAPSHOT = 8
+TOKEN = 9
+RESUME = 10
+RESUMED = 11
+RESYNC = 12
+PING = 13
+PONG = 14
+CLOCK = 15
+
+RESULT_CODES = {'tie': 0, 'X': 1, 'O': 2}
+RESULT_OUTCOMES = {code: outcome for outcome, code in RESULT_CODES.items()}
+
+
+class ProtocolError(Exception):
+    """Raised when a peer sends bytes that are not a valid frame or payload."""
+
+
+def encodeFrame(msgtype: int, payload: bytes = b'') -> bytes:
+    """Builds a frame from a message type and payload.
+
+    Args:
+        msgtype (int): One of the message type constants.
+        payload (bytes): The message body.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    if len(payload) > MAX_PAYLOAD:
+        raise ProtocolError(f"payload of {len(payload)} bytes is too large")
+    return HEADER.pack(VERSION, msgtype, len(payload)) + payload
+
+
+def encodeHello(name: str, rating: int = None) -> bytes:
+    """Encodes a HELLO frame announcing a username and, for matchmaking, a rating.
+
+    Args:
+        name (str): The username.
+        rating (int, optional): The player's rating, 0 to 65535.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    payload = name.encode()
+    if rating is not None:
+        payload += b'\x00' + RATING.pack(rating)
+    return encodeFrame(HELLO, payload)
+
+
+def decodeHello(payload: bytes) -> str:
+    """Decodes the username carried by a HELLO frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        str: The username.
+    """
+    try:
+        return payload.split(b'\x00', 1)[0].decode()
+    except UnicodeDecodeError as error:
+        raise ProtocolError("username is not valid UTF-8") from error
+
+
+def decodeHelloRating(payload: bytes) -> int:
+    """Decodes the optional rating carried by a HELLO frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        int: The rating, or None if the frame has none.
+    """
+    _, separator, rating = payload.partition(b'\x00')
+    if not separator:
+        return None
+    if len(rating) != RATING.size:
+        raise ProtocolError("invalid rating in HELLO payload")
+    return RATING.unpack(rating)[0]
+
+
+def encodeMoveBytes(row: int, column: int) -> bytes:
+    """Packs a move into one byte, or two bytes when a coordinate exceeds 15.
+
+    Args:
+        row (int): Row index of the move.
+        column (int): Column index of the move.
+
+    Returns:
+        bytes: The packed move.
+    """
+    if 0 <= row < 16 and 0 <= column < 16:
+        return bytes((row << 4 | column,))
+    if 0 <= row < 256 and 0 <= column < 256:
+        return bytes((row, column))
+    raise ProtocolError(f"move ({row}, {column}) cannot be encoded")
+
+
+def decodeMoveBytes(data: bytes) -> tuple:
+    """Unpacks a move packed by encodeMoveBytes().
+
+    Args:
+        data (bytes): One or two bytes.
+
+    Returns:
+        tuple: The (row, column) of the move.
+    """
+    if len(data) == 1:
+        return data[0] >> 4, data[0] & 0x0F
+    if len(data) == 2:
+        return data[0], data[1]
+    raise ProtocolError(f"move of {len(data)} bytes is invalid")
+
+
+def encodeMove(row: int, column: int, digest: int = None) -> bytes:
+    """Encodes a MOVE frame.
+
+    Args:
+        row (int): Row index of the move.
+        column (int): Column index of the move.
+        digest (int, optional): The sender's BoardClass.digest() after playing the move.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    payload = encodeMoveBytes(row, column)
+    if digest is not None:
+        payload += DIGEST.pack(digest)
+    return encodeFrame(MOVE, payload)
+
+
+def decodeMove(payload: bytes) -> tuple:
+    """Decodes the move carried by a MOVE frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        tuple: The (row, column) of the move.
+    """
+    if len(payload) > DIGEST.size:
+        payload = payload[:-DIGEST.size]
+    return decodeMoveBytes(payload)
+
+
+def decodeMoveDigest(payload: bytes) -> int:
+    """Decodes the board digest carried by a MOVE frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        int: The sender's digest, or None if the frame does not carry one.
+    """
+    if len(payload) <= DIGEST.size:
+        return None
+    return DIGEST.unpack_from(payload, len(payload) - DIGEST.size)[0]
+
+
+def encodeResult(outcome: str) -> bytes:
+    """Encodes a RESULT frame.
+
+    Args:
+        outcome (str): 'X', 'O' or 'tie', as returned by BoardClass.outcome().
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(RESULT, bytes((RESULT_CODES[outcome],)))
+
+
+def decodeResult(payload: bytes) -> str:
+    """Decodes the outcome carried by a RESULT frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        str: 'X', 'O' or 'tie'.
+    """
+    if len(payload) != 1 or payload[0] not in RESULT_OUTCOMES:
+        raise ProtocolError("invalid result payload")
+    return RESULT_OUTCOMES[payload[0]]
+
+
+def checkBoardShape(rows: int, columns: int = None, winlength: int = None):
+    """Checks that every frame of a session on a board of this shape can be encoded.
+
+    START carries each dimension in one byte, and a SNAPSHOT or RESUMED frame must hold the
+    moves of a full board within MAX_PAYLOAD.
+
+    Args:
+        rows (int): Number of rows on the board.
+        columns (int, optional): Number of columns, defaulting to rows.
+        winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+
+    Raises:
+        ValueError: If the shape cannot be played over the protocol.
+    """
+    columns = rows if columns is None else columns
+    winlength = min(rows, columns) if winlength is None else winlength
+    if not (1 <= rows <= MAX_SIDE and 1 <= columns <= MAX_SIDE):
+        raise ValueError(f"board sides must be between 1 and {MAX_SIDE}, got {rows}x{columns}")
+    if not 1 <= winlength <= max(rows, columns):
+        raise ValueError(f"a {rows}x{columns} board cannot have a win length of {winlength}")
+    movesize = 1 if rows <= 16 and columns <= 16 else 2
+    if SNAPSHOT_HEADER.size + 4 + rows * columns * movesize > MAX_PAYLOAD:
+        raise ValueError(f"a {rows}x{columns} board is too large to fit in a snapshot frame")
+
+
+def encodeStart(mark: str, rows: int = 3, columns: int = 3, winlength: int = 3, name: str = None) -> bytes:
+    """Encodes a START frame telling a client which mark it plays, on what board and under what name.
+
+    Args:
+        mark (str): 'X' for Player 1, who moves first, or 'O' for Player 2.
+        rows (int): Number of rows on the board.
+        columns (int): Number of columns on the board.
+        winlength (int): Number of marks in a row needed to win.
+        name (str, optional): The client's name in the session, which the host may have changed
+            to tell two players with the same name apart.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    payload = mark.encode() + bytes((rows, columns, winlength))
+    if name is not None:
+        payload += name.encode()
+    return encodeFrame(START, payload)
+
+
+def decodeStart(payload: bytes) -> str:
+    """Decodes the mark carried by a START frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        str: 'X' or 'O'.
+    """
+    if payload[:1] not in (b'X', b'O') or len(payload) in (2, 3):
+        raise ProtocolError("invalid start payload")
+    return payload[:1].decode()
+
+
+def decodeStartBoard(payload: bytes) -> tuple:
+    """Decodes the board shape carried by a START frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        tuple: The (rows, columns, winlength) of the board; 3x3 for frames that omit it.
+    """
+    decodeStart(payload)
+    if len(payload) == 1:
+        return 3, 3, 3
+    rows, columns, winlength = payload[1], payload[2], payload[3]
+    try:
+        checkBoardShape(rows, columns, winlength)
+    except ValueError as error:
+        raise ProtocolError(str(error)) from error
+    return rows, columns, winlength
+
+
+def decodeStartName(payload: bytes) -> str:
+    """Decodes the name carried by a START frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        str: The client's name in the session, or None for frames that omit it.
+    """
+    decodeStart(payload)
+    if len(payload) <= 4:
+        return None
+    try:
+        return payload[4:].decode()
+    except UnicodeDecodeError as error:
+        raise ProtocolError("start name is not valid UTF-8") from error
+
+
+def encodeWatch(name: str) -> bytes:
+    """Encodes a WATCH frame asking to spectate the session a player is in.
+
+    Args:
+        name (str): The username of one of the players.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(WATCH, name.encode())
+
+
+def decodeWatch(payload: bytes) -> str:
+    """Decodes the player name carried by a WATCH frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        str: The username of the player to watch.
+    """
+    try:
+        return payload.decode()
+    except UnicodeDecodeError as error:
+        raise ProtocolError("username is not valid UTF-8") from error
+
+
+def encodeSnapshot(state: dict) -> bytes:
+    """Encodes a SNAPSHOT frame bringing a spectator up to date with a session.
+
+    Args:
+        state (dict): A state produced by BoardClass.snapshot().
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(SNAPSHOT, snapshotBytes(state))
+
+
+def snapshotBytes(state: dict) -> bytes:
+    """Packs the parts of a session state that SNAPSHOT and RESUMED frames carry.
+
+    The game and score counters are packed as 32-bit integers so a long-lived session never
+    outgrows them. Moves take one byte each on boards up to 16x16 and two bytes (row, column)
+    beyond that.
+
+    Args:
+        state (dict): A state produced by BoardClass.snapshot().
+
+    Returns:
+        bytes: The packed state.
+    """
+    player1, player2 = state['player1'], state['player2']
+    header = SNAPSHOT_HEADER.pack(state['rows'], state['columns'], state['winlength'], state['gamesplayed'],
+                                  state['numwins'][player1], state['numwins'][player2], state['numties'])
+    names = player1.encode() + b'\x00' + player2.encode() + b'\x00'
+    if state['rows'] <= 16 and state['columns'] <= 16:
+        moves = bytes(row << 4 | col for row, col in state['history'])
+    else:
+        moves = bytes(value for move in state['history'] for value in move)
+    return header + names + moves
+
+
+def decodeSnapshot(payload: bytes) -> dict:
+    """Decodes a SNAPSHOT frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        dict: A state accepted by BoardClass.restore(). The board and turn are rebuilt from the
+        move history, since every game starts with 'X'; playerprofile is None.
+
+    Raises:
+        ProtocolError: If the payload is not exactly a header, two names and whole moves on
+            distinct cells of a valid board.
+    """
+    try:
+        rows, columns, winlength, gamesplayed, wins1, wins2, numties = SNAPSHOT_HEADER.unpack_from(payload)
+        player1, player2, moves = payload[SNAPSHOT_HEADER.size:].split(b'\x00', 2)
+        player1, player2 = player1.decode(), player2.decode()
+        checkBoardShape(rows, columns, winlength)
+    except (struct.error, ValueError) as error:
+        raise ProtocolError("invalid snapshot payload") from error
+    if rows <= 16 and columns <= 16:
+        history = [(value >> 4, value & 0x0F) for value in moves]
+    else:
+        if len(moves) % 2:
+            raise ProtocolError("snapshot ends in the middle of a move")
+        history = [(moves[i], moves[i + 1]) for i in range(0, len(moves), 2)]
+    if len(history) > rows * columns:
+        raise ProtocolError("snapshot holds more moves than the board has cells")
+    board = [[' '] * columns for _ in range(rows)]
+    for number, (row, col) in enumerate(history):
+        if row >= rows or col >= columns:
+            raise ProtocolError("snapshot move is off the board")
+        if board[row][col] != ' ':
+            raise ProtocolError("snapshot plays a cell twice")
+        board[row][col] = 'XO'[number % 2]
+    return {
+        'rows': rows,
+        'columns': columns,
+        'winlength': winlength,
+        'player1': player1,
+        'player2': player2,
+        'gamesplayed': gamesplayed,
+        'numwins': {player1: wins1, player2: wins2},
+        'numlosses': {player1: wins2, player2: wins1},
+        'numties': numties,
+        'history': history,
+        'board': board,
+        'userturn': player2 if len(history) % 2 else player1,
+        'playerprofile': None,
+    }
+
+
+def encodeToken(token: bytes) -> bytes:
+    """Encodes a TOKEN frame giving a player the token that lets it resume its session.
+
+    Args:
+        token (bytes): TOKEN_SIZE random bytes.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(TOKEN, token)
+
+
+def decodeToken(payload: bytes) -> bytes:
+    """Decodes the token carried by a TOKEN or RESUME frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        bytes: The token.
+    """
+    if len(payload) != TOKEN_SIZE:
+        raise ProtocolError("invalid session token")
+    return payload
+
+
+def encodeResume(token: bytes) -> bytes:
+    """Encodes a RESUME frame asking to take a dropped player's place in its session.
+
+    Args:
+        token (bytes): The token received in the player's TOKEN frame.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(RESUME, token)
+
+
+def encodeResumed(mark: str, awaitingrematch: bool, state: dict) -> bytes:
+    """Encodes a RESUMED frame bringing a reconnected player back into its session.
+
+    Args:
+        mark (str): 'X' or 'O', the mark the player plays.
+        awaitingrematch (bool): True if the last game has ended and Player 1 has not yet chosen.
+        state (dict): A state produced by BoardClass.snapshot().
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(RESUMED, mark.encode() + bytes((awaitingrematch,)) + snapshotBytes(state))
+
+
+def decodeResumed(payload: bytes) -> tuple:
+    """Decodes a RESUMED frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        tuple: (mark, awaitingrematch, state) with state as returned by decodeSnapshot().
+    """
+    if payload[:1] not in (b'X', b'O') or len(payload) < 2:
+        raise ProtocolError("invalid resumed payload")
+    return payload[:1].decode(), bool(payload[1]), decodeSnapshot(payload[2:])
+
+
+def encodeResync() -> bytes:
+    """Encodes a RESYNC frame asking the host for the full session state.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(RESYNC)
+
+
+def encodeRematch() -> bytes:
+    """Encodes a REMATCH frame asking the opponent to play again.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(REMATCH)
+
+
+def encodeQuit() -> bytes:
+    """Encodes a QUIT frame telling the opponent the session is over.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(QUIT)
+
+
+def encodePing() -> bytes:
+    """Encodes a PING frame asking a silent peer for a sign of life.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(PING)
+
+
+def encodePong() -> bytes:
+    """Encodes a PONG frame answering a PING.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(PONG)
+
+
+def encodeClock(xremaining: float, oremaining: float) -> bytes:
+    """Encodes a CLOCK frame carrying both players' remaining time.
+
+    Args:
+        xremaining (float): Seconds left on the clock of the player playing 'X'.
+        oremaining (float): Seconds left on the clock of the player playing 'O'.
+
+    Returns:
+        bytes: The encoded frame.
+    """
+    return encodeFrame(CLOCK, CLOCK_TIMES.pack(max(0, round(xremaining * 1000)), max(0, round(oremaining * 1000))))
+
+
+def decodeClock(payload: bytes) -> tuple:
+    """Decodes the remaining times carried by a CLOCK frame.
+
+    Args:
+        payload (bytes): The frame payload.
+
+    Returns:
+        tuple: Seconds left for 'X' and for 'O'.
+    """
+    if len(payload) != CLOCK_TIMES.size:
+        raise ProtocolError("invalid clock payload")
+    xmillis, omillis = CLOCK_TIMES.unpack(payload)
+    return xmillis / 1000, omillis / 1000
+
+
+class FrameDecoder():
+    """
+    Reassembles frames from a stream of bytes.
+
+    Attributes:
+        buffer (bytearray): Bytes received but not yet decoded.
+        frames (deque): Decoded (msgtype, payload) tuples waiting to be consumed.
+
+    Methods:
+        feed(data) -> int: Adds received bytes and decodes every complete frame.
+        popFrame() -> tuple: Returns the next decoded frame, or None.
+        drain() -> bytes: Returns every byte fed but not consumed yet and empties the decoder.
+    """
+
+    def __init__(self):
+        """Initializes the FrameDecoder instance."""
+        self.buffer = bytearray()
+        self.frames = deque()
+
+
+    def feed(self, data: bytes) -> int:
+        """Adds received bytes and decodes every complete frame.
+
+        Args:
+            data (bytes): Bytes read from the socket.
+
+        Returns:
+            int: Number of decoded frames waiting to be consumed.
+        """
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        end = len(buffer)
+        while end - offset >= HEADER.size:
+            version, msgtype, length = HEADER.unpack_from(buffer, offset)
+            if version != VERSION:
+                raise ProtocolError(f"unsupported protocol version {version}")
+            start = offset + HEADER.size
+            if end - start < length:
+                break
+            self.frames.append((msgtype, bytes(buffer[start:start + length])))
+            offset = start + length
+        if offset:
+            del buffer[:offset]
+        return len(self.frames)
+
+
+    def popFrame(self) -> tuple:
+        """Returns the next decoded frame.
+
+        Returns:
+            tuple: A (msgtype, payload) tuple, or None if no complete frame is waiting.
+        """
+        if self.frames:
+            return self.frames.popleft()
+        return None
+
+
+    def drain(self) -> bytes:
+        """Returns every byte fed but not consumed yet and empties the decoder.
+
+        Decoded frames are encoded again, so feeding the result to another decoder yields the
+        same frames followed by the same partial frame.
+
+        Returns:
+            bytes: The waiting frames followed by the buffered partial frame.
+        """
+        data = b''.join(encodeFrame(msgtype, payload) for msgtype, payload in self.frames) + bytes(self.buffer)
+        self.frames.clear()
+        self.buffer.clear()
+        return data
+
+
+def readFrame(sock, decoder: FrameDecoder) -> tuple:
+    """Blocks until the next frame is available on a socket.
+
+    Args:
+        sock (socket.socket): The connected socket.
+        decoder (FrameDecoder): The decoder holding this socket's buffered bytes.
+
+    Returns:
+        tuple: A (msgtype, payload) tuple.
+
+    Raises:
+        ConnectionError: If the peer closes the connection.
+    """
+    while not decoder.frames:
+        data = sock.recv(4096)
+        if not data:
+            raise ConnectionError("connection closed by peer")
+        decoder.feed(data)
+    return decoder.frames.popleft()
+
+
+if __name__ == "__main__":
+    pass
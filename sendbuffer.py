@@ -0,0 +1,158 @@
+"""This module queues outbound frames for a socket and writes them without blocking the sender.
+
+A blocking sendall on the GUI thread freezes the window for as long as the peer's receive
+window stays full, and a plain send may write only part of a frame. A SendBuffer instead
+queues every frame whole and flushes as much of the queue as the kernel accepts in one
+vectored sendmsg call. The call is flagged MSG_DONTWAIT, so the socket itself stays blocking
+for the reader thread. Whatever the kernel does not take stays queued, in order, for the next
+flush, which the GUI runs on every network poll, so the peer receives exactly the bytes a
+sendall would have sent.
+
+A peer that stops reading would make the queue grow without bound. Once the queued bytes pass
+the high-water mark the buffer gives up on the peer and shuts the socket down. The reader
+thread reports that like any other dropped connection, so the session's resume path takes
+over and the peer comes back to one snapshot of the session instead of every frame it missed.
+
+On platforms without sendmsg, flushes fall back to a blocking sendall of the whole queue.
+
+Usage:
+    sendbuffer = SendBuffer(sock)
+    sendbuffer.send(protocol.encodeMove(row, col, digest))
+    ...
+    sendbuffer.flush()
+"""
+import select
+import socket
+import time
+from collections import deque
+from itertools import islice
+
+HIGH_WATER = 64 * 1024
+IOV_MAX = 1024
+SEND_FLAGS = getattr(socket, 'MSG_DONTWAIT', 0)
+
+
+class SendBuffer():
+    """
+    Queues encoded frames for a socket and flushes them with vectored, non-blocking writes.
+
+    Attributes:
+        sock (socket.socket): The connected socket frames are written to.
+        frames (deque): Frames not fully written yet, oldest first; the first may be a memoryview
+            of the bytes left of a partly written frame.
+        queued (int): Number of bytes waiting in frames.
+        highwater (int): Queued bytes past which the peer is disconnected.
+        closed (bool): True once the buffer has given up on the peer.
+
+    Methods:
+        send(frame) -> bool: Queues a frame and writes as much of the queue as the socket takes.
+        flush(timeout) -> int: Writes queued frames, waiting up to a timeout for the socket.
+        write() -> int: Writes the head of the queue in one call.
+        consume(sent): Drops written bytes from the head of the queue.
+        abort(): Drops the queue and shuts the socket down.
+    """
+
+    def __init__(self, sock, highwater: int = HIGH_WATER):
+        """Initializes the SendBuffer instance.
+
+        Args:
+            sock (socket.socket): The connected socket frames are written to.
+            highwater (int): Queued bytes past which the peer is disconnected.
+        """
+        self.sock = sock
+        self.frames = deque()
+        self.queued = 0
+        self.highwater = highwater
+        self.closed = False
+
+
+    def send(self, frame: bytes) -> bool:
+        """Queues a frame and writes as much of the queue as the socket takes without blocking.
+
+        Args:
+            frame (bytes): The encoded frame.
+
+        Returns:
+            bool: False if the peer has been disconnected, True otherwise.
+        """
+        if self.closed:
+            return False
+        self.frames.append(frame)
+        self.queued += len(frame)
+        self.flush()
+        if self.queued > self.highwater:
+            self.abort()
+        return not self.closed
+
+
+    def flush(self, timeout: float = 0.0) -> int:
+        """Writes queued frames until the queue is empty, the socket is full or a timeout passes.
+
+        Args:
+            timeout (float): Seconds to wait for the socket to take the rest; 0 never waits.
+
+        Returns:
+            int: Number of bytes still queued.
+        """
+        deadline = time.monotonic() + timeout
+        while self.frames and not self.closed:
+            try:
+                sent = self.write()
+            except (BlockingIOError, InterruptedError):
+                sent = 0
+            except OSError:
+                self.abort()
+                break
+            if sent:
+                self.consume(sent)
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            select.select([], [self.sock], [], remaining)
+        return self.queued
+
+
+    def write(self) -> int:
+        """Writes the head of the queue in one call.
+
+        Returns:
+            int: Number of bytes written.
+
+        Raises:
+            BlockingIOError: If the socket cannot take any bytes right now.
+        """
+        if not hasattr(self.sock, 'sendmsg'):
+            data = b''.join(self.frames)
+            self.sock.sendall(data)
+            return len(data)
+        return self.sock.sendmsg(list(islice(self.frames, IOV_MAX)), (), SEND_FLAGS)
+
+
+    def consume(self, sent: int):
+        """Drops written bytes from the head of the queue.
+
+        Args:
+            sent (int): Number of bytes the socket took.
+        """
+        self.queued -= sent
+        frames = self.frames
+        while sent:
+            size = len(frames[0])
+            if size <= sent:
+                frames.popleft()
+                sent -= size
+            else:
+                frames[0] = memoryview(frames[0])[sent:]
+                sent = 0
+
+
+    def abort(self):
+        """Drops the queue and shuts the socket down so the reader sees the connection close."""
+        self.closed = True
+        self.frames.clear()
+        self.queued = 0
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
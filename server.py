@@ -0,0 +1,1094 @@
+"""This module contains a headless asyncio server that hosts many Tic Tac Toe games at once.
+
+Clients connect and announce themselves with a HELLO frame, optionally carrying a rating.
+They then wait in the lobby, a lobby.Matchmaker that pairs players first-come first-served
+within rating buckets, and are handed to a game session on the same connection as soon as an
+opponent arrives. The player who waited plays 'X' and the newcomer plays 'O'; both receive a HELLO with their
+opponent's name followed by a START frame naming their mark and the board shape. The server keeps the only
+authoritative board for each session: moves are validated there before being relayed,
+and the end of every game is announced to both players with a RESULT frame. As in the
+peer-to-peer game, Player 1 then decides between REMATCH and QUIT.
+
+A host is meant to keep a very large number of idle matches open, so the per-session objects
+are kept small: Connection and GameSession use __slots__, the board is a compactboard
+CompactBoard holding each side's marks in one integer, and the events of a session go through
+an EventQueue, a list and a single waiter, instead of an asyncio.Queue with its three deques
+and its Event.
+
+A client that opens with a WATCH frame naming a player becomes a spectator of that player's
+session. It receives a SNAPSHOT, encoded once per board state and shared by everyone joining
+before the next move, and then the very frame objects relayed to the players, so each update
+is encoded once and fanned out in O(spectators) writes after the players have been served.
+
+A client that stops reading cannot make the server buffer without bound. The frames a
+connection is sent during one pass of the event loop are collected and handed to its transport
+together in one writelines call, and a connection whose unsent bytes pass the sendbuffer
+HIGH_WATER mark is dealt with instead of buffered further. A player is disconnected and can
+resume from a single RESUMED snapshot. A spectator stops being sent updates until its backlog
+has drained to half the mark, and then gets one fresh SNAPSHOT in place of everything it missed.
+
+Every player receives a TOKEN after its HELLO. When a player's connection drops, its session
+waits up to the grace period instead of ending; a client that reconnects and opens with RESUME
+and that token takes the dropped player's place and is sent a RESUMED snapshot of the board,
+turn and score, so it is back in the game after one round trip. The same RESUMED frame answers
+a RESYNC, and is sent unasked to a player whose MOVE carried a board digest that disagrees with
+the server's board; the move is then relayed with the server's digest.
+
+Every timer of the server lives in one timingwheel TimingWheel, advanced by a single event
+loop callback per tick. A connection silent for the heartbeat interval is sent a PING and is
+closed once it has been silent for --idle-timeout seconds, so dead peers are reaped and their
+sessions end or enter the grace period. With --move-time each move must be made within that many
+seconds, and with --clock each player has that many seconds for the whole game, plus
+--increment seconds per move, reported to the players and spectators in CLOCK frames. A player
+who runs out of time loses the game. The grace periods of dropped players use the same wheel.
+
+With --metrics-port, the latency histograms of the metrics module are served over HTTP in the
+Prometheus text format.
+
+A single process runs on one core. With --workers, the workers module instead starts one server
+process per core, each with its own event loop and its own SO_REUSEPORT listening socket on the
+same port, under a supervisor that restarts crashed workers and adds up their statistics.
+
+Dependencies:
+    - asyncio: Runs every connection on a single event loop.
+    - protocol: A module providing the framed wire format.
+    - lobby: A module providing the Matchmaker queue.
+    - statsstore: A module providing the durable per-player statistics, imported only with --stats-db.
+    - compactboard: A module providing the CompactBoard for maintaining game state.
+    - sendbuffer: A module providing the high-water mark of outbound bytes per connection.
+
+Usage:
+    python server.py --host 0.0.0.0 --port 5000
+    python server.py --port 5000 --rows 15 --winlength 5
+    python server.py --port 5000 --bucket-width 100 --bucket-spread 1
+    python server.py --port 5000 --stats-db stats.db
+    python server.py --port 5000 --grace-period 60
+    python server.py --port 5000 --metrics-port 9100
+    python server.py --port 5000 --clock 180 --increment 2 --idle-timeout 20
+    python server.py --port 5000 --workers 0 --stats-interval 10
+    python spectator.py --host localhost --port 5000 alice
+"""
+import argparse
+import asyncio
+import secrets
+import time
+import metrics
+import protocol
+from compactboard import CompactBoard
+from lobby import Matchmaker
+from sendbuffer import HIGH_WATER
+from timingwheel import TimingWheel
+
+# Event reported by GameSession.pump() when a player's connection drops without a QUIT.
+DROPPED = -1
+# Event queued when the move timer of the player to move runs out.
+TIMEOUT = -2
+
+
+class Connection():
+    """
+    Wraps the asyncio streams of one connected client.
+
+    Attributes:
+        reader (asyncio.StreamReader): Stream the client's frames arrive on.
+        writer (asyncio.StreamWriter): Stream frames are sent to the client on.
+        decoder (protocol.FrameDecoder): Reassembles frames received from the client.
+        name (str): Username announced in the client's HELLO frame.
+        rating (int): Rating announced in the client's HELLO frame, or None.
+        lobby (asyncio.Task): Task keeping the client in the lobby while it waits, or None.
+        token (bytes): Token that lets the client resume its session, or None.
+        session (GameSession): The session the client plays in, or None.
+        lastseen (float): time.monotonic() reading of the last bytes received from the client.
+        idletimer (Timer): The server's next idle check of the connection, or None.
+        outbox (list): Frames sent during the current pass of the event loop, or None while empty.
+        lagging (bool): True while a spectator is skipped until its backlog drains.
+
+    Methods:
+        readFrame() -> tuple: Waits for the next frame from the client.
+        send(frame) -> bool: Queues an encoded frame for the client.
+        flush(): Hands the queued frames to the transport in one call.
+        backlog() -> int: Returns the number of bytes not yet sent to the client.
+        isClosed() -> bool: Checks if the connection has been closed.
+        close(): Closes the connection.
+        abort(): Closes the connection at once, dropping unsent bytes.
+    """
+
+    __slots__ = ('reader', 'writer', 'decoder', 'name', 'rating', 'lobby', 'token', 'session', 'lastseen', 'idletimer',
+                 'outbox', 'lagging')
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Initializes the Connection instance.
+
+        Args:
+            reader (asyncio.StreamReader): Stream the client's frames arrive on.
+            writer (asyncio.StreamWriter): Stream frames are sent to the client on.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.decoder = protocol.FrameDecoder()
+        self.name = None
+        self.rating = None
+        self.lobby = None
+        self.token = None
+        self.session = None
+        self.lastseen = time.monotonic()
+        self.idletimer = None
+        self.outbox = None
+        self.lagging = False
+
+
+    async def readFrame(self) -> tuple:
+        """Waits for the next frame from the client.
+
+        Returns:
+            tuple: A (msgtype, payload) tuple.
+
+        Raises:
+            ConnectionError: If the client closes the connection.
+        """
+        while not self.decoder.frames:
+            data = await self.reader.read(4096)
+            if not data:
+                raise ConnectionError("connection closed by peer")
+            self.lastseen = time.monotonic()
+            self.decoder.feed(data)
+        return self.decoder.frames.popleft()
+
+
+    def send(self, frame: bytes) -> bool:
+        """Queues an encoded frame for the client, to be written at the end of the loop pass.
+
+        A client whose unsent bytes would pass the high-water mark is disconnected instead.
+
+        Args:
+            frame (bytes): The encoded frame.
+
+        Returns:
+            bool: True if the frame was queued, False if the connection is closed or was dropped.
+        """
+        if self.writer.is_closing():
+            return False
+        if self.backlog() + len(frame) > HIGH_WATER:
+            self.abort()
+            return False
+        if self.outbox is None:
+            self.outbox = []
+            asyncio.get_running_loop().call_soon(self.flush)
+        self.outbox.append(frame)
+        return True
+
+
+    def flush(self):
+        """Hands the frames queued during the loop pass to the transport in one writelines call."""
+        frames = self.outbox
+        self.outbox = None
+        if frames and not self.writer.is_closing():
+            self.writer.writelines(frames)
+
+
+    def backlog(self) -> int:
+        """Returns the number of bytes queued for the client and not yet taken by the kernel.
+
+        Returns:
+            int: The bytes in the outbox and in the transport's write buffer.
+        """
+        queued = self.writer.transport.get_write_buffer_size()
+        if self.outbox is not None:
+            queued += sum(map(len, self.outbox))
+        return queued
+
+
+    def isClosed(self) -> bool:
+        """Checks if the connection has been closed.
+
+        Returns:
+            bool: True if the connection is closed or closing, False otherwise.
+        """
+        return self.writer.is_closing() or self.reader.at_eof()
+
+
+    def close(self):
+        """Writes the queued frames, closes the connection and cancels its idle check."""
+        self.flush()
+        if self.idletimer is not None:
+            self.idletimer.cancel()
+            self.idletimer = None
+        self.writer.close()
+
+
+    def abort(self):
+        """Closes the connection at once, dropping the bytes the client has not read."""
+        self.outbox = None
+        if self.idletimer is not None:
+            self.idletimer.cancel()
+            self.idletimer = None
+        self.writer.transport.abort()
+
+
+class EventQueue():
+    """
+    Queues the events of one session for the session's own task.
+
+    Attributes:
+        items (list): Events not consumed yet, oldest first.
+        waiter (asyncio.Future): Future the consumer is waiting on, or None.
+
+    Methods:
+        put(item): Appends an event and wakes the consumer.
+        get() -> object: Waits for the oldest event and removes it.
+    """
+
+    __slots__ = ('items', 'waiter')
+
+    def __init__(self):
+        """Initializes the EventQueue instance."""
+        self.items = []
+        self.waiter = None
+
+
+    def put(self, item):
+        """Appends an event and wakes the consumer.
+
+        Args:
+            item (object): The event.
+        """
+        self.items.append(item)
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+
+    async def get(self):
+        """Waits for the oldest event and removes it.
+
+        Returns:
+            object: The event.
+        """
+        while not self.items:
+            self.waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.waiter
+            finally:
+                self.waiter = None
+        return self.items.pop(0)
+
+
+class GameSession():
+    """
+    Runs one match between two connections on an authoritative CompactBoard.
+
+    Attributes:
+        server (GameServer): The server hosting the session.
+        players (tuple): The Connection playing 'X' and the Connection playing 'O'.
+        game_board (CompactBoard): The authoritative game board.
+        events (EventQueue): (connection, msgtype, payload) tuples read from both players.
+        awaiting_rematch (bool): True between the end of a game and Player 1's decision.
+        task (asyncio.Task): The task running the session once scheduled.
+        spectators (set): Connections watching the session.
+        pumps (dict): Maps each player's Connection to the task reading its frames.
+        expiries (dict): Maps a dropped player's Connection to the Timer ending its grace period.
+        snapshotframe (bytes): Encoded SNAPSHOT of the current board state, or None until needed.
+        clocks (list): Seconds left on the clocks of 'X' and 'O', or None without a game clock.
+        turnstart (float): time.monotonic() reading when the player to move got the turn, or None.
+        movetimer (Timer): Timer reporting the player to move out of time, or None.
+
+    Methods:
+        run(): Plays games until a player quits or disconnects.
+        pump(connection): Forwards a connection's frames to the event queue.
+        suspend(connection): Gives a dropped player the grace period to resume.
+        resumePlayer(connection, token): Replaces a player with its reconnected client.
+        sendState(connection): Sends a player its mark and the full session state.
+        play(): Processes events until the session is over.
+        handleMove(connection, payload) -> bool: Validates, applies and relays a move.
+        startClock(): Starts the time of the player to move.
+        stopClock(): Charges the player to move for the time spent on the move.
+        timeLeft() -> float: Returns the seconds the player to move has left.
+        clockFrame() -> bytes: Encodes a CLOCK frame with both players' remaining time.
+        loseOnTime(): Ends the game as a loss for the player to move.
+        finishGame(outcome): Records the result and announces it to both players.
+        opponentOf(connection) -> Connection: Returns the other player of the session.
+        addSpectator(connection): Sends a spectator the snapshot and subscribes it to updates.
+        sendSnapshot(connection): Sends a connection the SNAPSHOT of the current board state.
+        broadcast(frame): Sends an already encoded frame to every spectator keeping up.
+        catchUp(connection): Sends a spectator that fell behind a fresh snapshot.
+    """
+
+    __slots__ = ('server', 'players', 'game_board', 'events', 'awaiting_rematch', 'task', 'spectators', 'pumps',
+                 'expiries', 'snapshotframe', 'clocks', 'turnstart', 'movetimer')
+
+    def __init__(self, server, player1: Connection, player2: Connection):
+        """Initializes the GameSession instance.
+
+        Args:
+            server (GameServer): The server hosting the session.
+            player1 (Connection): The connection playing 'X'.
+            player2 (Connection): The connection playing 'O'.
+        """
+        self.server = server
+        self.players = (player1, player2)
+        self.game_board = CompactBoard(server.rows, server.columns, server.winlength)
+        self.events = EventQueue()
+        self.awaiting_rematch = False
+        self.task = None
+        self.spectators = set()
+        self.pumps = {}
+        self.expiries = {}
+        self.snapshotframe = None
+        self.clocks = None if server.clock is None else [server.clock, server.clock]
+        self.turnstart = None
+        self.movetimer = None
+        if player2.name == player1.name:
+            player2.name = f"{player2.name} (2)"
+        self.game_board.setPlayer1Name(player1.name)
+        self.game_board.setPlayer2Name(player2.name)
+        self.game_board.resetDefaultTurn()
+
+
+    async def run(self):
+        """Plays games until a player quits or disconnects."""
+        lobbies = [connection.lobby for connection in self.players if connection.lobby is not None]
+        if lobbies:
+            await asyncio.wait(lobbies)
+        for connection in self.players:
+            self.pumps[connection] = asyncio.create_task(self.pump(connection))
+        try:
+            await self.play()
+        finally:
+            for task in self.pumps.values():
+                task.cancel()
+            for timer in self.expiries.values():
+                timer.cancel()
+            if self.movetimer is not None:
+                self.movetimer.cancel()
+            self.broadcast(protocol.encodeQuit())
+            for connection in self.players + tuple(self.spectators):
+                connection.close()
+            self.server.sessionEnded(self)
+
+
+    async def pump(self, connection: Connection):
+        """Forwards a connection's frames to the event queue.
+
+        A dropped connection is reported as DROPPED and a malformed frame as a None msgtype.
+
+        Args:
+            connection (Connection): The connection to read from.
+        """
+        try:
+            while True:
+                msgtype, payload = await connection.readFrame()
+                self.events.put((connection, msgtype, payload))
+        except ConnectionError:
+            self.events.put((connection, DROPPED, b''))
+        except protocol.ProtocolError:
+            self.events.put((connection, None, b''))
+
+
+    async def play(self):
+        """Processes events until the session is over."""
+        player1, player2 = self.players
+        shape = (self.game_board.rows, self.game_board.columns, self.game_board.winlength)
+        player1.send(protocol.encodeHello(player2.name) + protocol.encodeStart('X', *shape, player1.name))
+        player2.send(protocol.encodeHello(player1.name) + protocol.encodeStart('O', *shape, player2.name))
+        self.startClock()
+        while True:
+            connection, msgtype, payload = await self.events.get()
+            if msgtype == TIMEOUT:
+                # A timeout queued just behind the move that stopped its clock finds a fresh turn.
+                if not self.awaiting_rematch and self.timeLeft() < self.server.wheel.tick:
+                    self.loseOnTime()
+                continue
+            if msgtype == protocol.RESUME:
+                self.resumePlayer(connection, payload)
+                continue
+            if connection not in self.players:
+                continue
+            if msgtype == DROPPED and self.server.graceperiod > 0:
+                self.suspend(connection)
+                continue
+            opponent = self.opponentOf(connection)
+            if msgtype in (None, DROPPED, protocol.QUIT):
+                opponent.send(protocol.encodeQuit())
+                return
+            if msgtype == protocol.PING:
+                connection.send(protocol.encodePong())
+            elif msgtype == protocol.RESYNC:
+                self.sendState(connection)
+            elif msgtype == protocol.REMATCH and self.awaiting_rematch and connection is self.players[0]:
+                self.awaiting_rematch = False
+                frame = protocol.encodeRematch()
+                self.players[1].send(frame)
+                self.broadcast(frame)
+                if self.clocks is not None:
+                    self.clocks[:] = [self.server.clock, self.server.clock]
+                self.startClock()
+            elif msgtype == protocol.MOVE and not self.awaiting_rematch:
+                if self.timeLeft() <= 0:
+                    self.loseOnTime()
+                elif not self.handleMove(connection, payload):
+                    connection.send(protocol.encodeQuit())
+                    opponent.send(protocol.encodeQuit())
+                    return
+
+
+    def suspend(self, connection: Connection):
+        """Gives a dropped player the grace period to resume before the session ends.
+
+        Args:
+            connection (Connection): The player whose connection dropped.
+        """
+        self.expiries[connection] = self.server.wheel.schedule(self.server.graceperiod, self.events.put, (connection, None, b''))
+
+
+    def resumePlayer(self, connection: Connection, token: bytes):
+        """Replaces a player with its reconnected client and sends it the session state.
+
+        The old connection is closed even if its drop has not been noticed yet, as happens
+        when a client moves to another network.
+
+        Args:
+            connection (Connection): The new connection, which sent a RESUME frame.
+            token (bytes): The token carried by the RESUME frame.
+        """
+        index = next((index for index, player in enumerate(self.players) if player.token == token), None)
+        if index is None:
+            connection.send(protocol.encodeQuit())
+            connection.close()
+            return
+        old = self.players[index]
+        timer = self.expiries.pop(old, None)
+        if timer is not None:
+            timer.cancel()
+        self.pumps.pop(old).cancel()
+        old.close()
+        connection.name, connection.token, connection.session = old.name, old.token, self
+        self.players = (connection, self.players[1]) if index == 0 else (self.players[0], connection)
+        self.server.tokens[token] = connection
+        self.sendState(connection)
+        if self.clocks is not None:
+            connection.send(self.clockFrame())
+        self.pumps[connection] = asyncio.create_task(self.pump(connection))
+
+
+    def sendState(self, connection: Connection):
+        """Sends a player its mark and the full session state in a RESUMED frame.
+
+        Args:
+            connection (Connection): One of the session's players.
+        """
+        mark = 'X' if connection is self.players[0] else 'O'
+        connection.send(protocol.encodeResumed(mark, self.awaiting_rematch, self.game_board.snapshot()))
+
+
+    def handleMove(self, connection: Connection, payload: bytes) -> bool:
+        """Validates, applies and relays a move, resyncing the sender if its digest disagrees.
+
+        Args:
+            connection (Connection): The connection that sent the move.
+            payload (bytes): The MOVE frame payload.
+
+        Returns:
+            bool: True if the move was legal, False if the sender broke the rules.
+        """
+        start = time.perf_counter_ns()
+        mover = self.players[0] if self.game_board.userturn == self.game_board.player1 else self.players[1]
+        if connection is not mover:
+            return False
+        try:
+            row, col = protocol.decodeMove(payload)
+            if not (0 <= row < self.game_board.rows and 0 <= col < self.game_board.columns):
+                return False
+            self.game_board.applyMove(row, col)
+        except (protocol.ProtocolError, ValueError):
+            return False
+        digest = protocol.decodeMoveDigest(payload)
+        diverged = digest is not None and digest != self.game_board.digest()
+        if diverged:
+            frame = protocol.encodeMove(row, col, self.game_board.digest())
+        else:
+            frame = protocol.encodeFrame(protocol.MOVE, payload)
+        self.opponentOf(connection).send(frame)
+        self.broadcast(frame)
+        self.snapshotframe = None
+        outcome = self.game_board.outcome()
+        self.stopClock()
+        if outcome is None:
+            self.game_board.changePlayerTurn()
+            self.startClock()
+        else:
+            self.finishGame(outcome)
+        if diverged:
+            self.sendState(connection)
+        metrics.SERVER_MOVE.observeSince(start)
+        return True
+
+
+    def startClock(self):
+        """Starts the time of the player to move and schedules its timeout on the server's wheel.
+
+        With a game clock, both players and the spectators are sent the remaining times.
+        """
+        if self.server.movetime is None and self.clocks is None:
+            return
+        self.turnstart = time.monotonic()
+        self.movetimer = self.server.wheel.schedule(self.timeLeft(), self.events.put, (None, TIMEOUT, b''))
+        if self.clocks is not None:
+            frame = self.clockFrame()
+            for connection in self.players:
+                connection.send(frame)
+            self.broadcast(frame)
+
+
+    def stopClock(self):
+        """Charges the player to move for the time spent on the move and adds the increment."""
+        if self.movetimer is not None:
+            self.movetimer.cancel()
+            self.movetimer = None
+        if self.clocks is not None and self.turnstart is not None:
+            self.clocks[self.game_board.turn] += self.server.increment - (time.monotonic() - self.turnstart)
+        self.turnstart = None
+
+
+    def timeLeft(self) -> float:
+        """Returns the seconds the player to move has left for the current move.
+
+        Returns:
+            float: The smaller of what remains of the move time and of the player's clock,
+                or infinity when the game is untimed or no clock is running.
+        """
+        if self.turnstart is None:
+            return float('inf')
+        elapsed = time.monotonic() - self.turnstart
+        left = float('inf') if self.server.movetime is None else self.server.movetime - elapsed
+        if self.clocks is not None:
+            left = min(left, self.clocks[self.game_board.turn] - elapsed)
+        return left
+
+
+    def clockFrame(self) -> bytes:
+        """Encodes a CLOCK frame with both players' remaining time, counting the running move.
+
+        Returns:
+            bytes: The encoded frame.
+        """
+        remaining = list(self.clocks)
+        if self.turnstart is not None:
+            remaining[self.game_board.turn] -= time.monotonic() - self.turnstart
+        return protocol.encodeClock(*remaining)
+
+
+    def loseOnTime(self):
+        """Ends the current game as a loss for the player to move, who ran out of time."""
+        self.stopClock()
+        if self.clocks is not None:
+            self.clocks[self.game_board.turn] = 0.0
+        self.game_board.changePlayerTurn()
+        self.finishGame(self.game_board.currentMark())
+
+
+    def finishGame(self, outcome: str):
+        """Records the result and announces it to both players.
+
+        Args:
+            outcome (str): 'X', 'O' or 'tie'.
+        """
+        if outcome == 'tie':
+            self.game_board.recordTie()
+        else:
+            self.game_board.recordWin()
+        self.game_board.updateGamesPlayed()
+        self.game_board.resetGameBoard()
+        self.game_board.resetDefaultTurn()
+        self.awaiting_rematch = True
+        frame = protocol.encodeResult(outcome)
+        for connection in self.players:
+            connection.send(frame)
+        self.broadcast(frame)
+        self.snapshotframe = None
+        self.server.gameFinished(outcome, self.game_board.player1, self.game_board.player2)
+
+
+    def opponentOf(self, connection: Connection) -> Connection:
+        """Returns the other player of the session.
+
+        Args:
+            connection (Connection): One of the session's players.
+
+        Returns:
+            Connection: The other player.
+        """
+        return self.players[1] if connection is self.players[0] else self.players[0]
+
+
+    def addSpectator(self, connection: Connection):
+        """Sends a spectator the snapshot and subscribes it to updates.
+
+        Args:
+            connection (Connection): The spectator's connection.
+        """
+        self.sendSnapshot(connection)
+        self.spectators.add(connection)
+
+
+    def sendSnapshot(self, connection: Connection):
+        """Sends a connection the SNAPSHOT of the current board state, encoding it once per state.
+
+        Args:
+            connection (Connection): The spectator's connection.
+        """
+        if self.snapshotframe is None:
+            self.snapshotframe = protocol.encodeSnapshot(self.game_board.snapshot())
+        connection.send(self.snapshotframe)
+
+
+    def broadcast(self, frame: bytes):
+        """Sends an already encoded frame to every spectator keeping up.
+
+        A spectator whose backlog would pass the high-water mark is skipped from then on. Once
+        its backlog has drained to half the mark, a catch-up snapshot is scheduled for after the
+        current event, when the board state is consistent again.
+
+        Args:
+            frame (bytes): The encoded frame, shared by all spectators.
+        """
+        for spectator in self.spectators:
+            if spectator.lagging:
+                if spectator.backlog() <= HIGH_WATER // 2:
+                    asyncio.get_running_loop().call_soon(self.catchUp, spectator)
+            elif spectator.backlog() + len(frame) > HIGH_WATER:
+                spectator.lagging = True
+            else:
+                spectator.send(frame)
+
+
+    def catchUp(self, connection: Connection):
+        """Sends a spectator that fell behind a fresh snapshot in place of the frames it missed.
+
+        Args:
+            connection (Connection): The spectator's connection.
+        """
+        if connection in self.spectators and connection.lagging:
+            connection.lagging = False
+            self.sendSnapshot(connection)
+
+
+class GameServer():
+    """
+    Accepts connections, pairs players and hosts their sessions.
+
+    Attributes:
+        host (str): Host/IP address the server listens on.
+        port (int): Port number the server listens on.
+        backlog (int): Length of the pending connection queue.
+        rows (int): Number of rows on every session's board.
+        columns (int): Number of columns on every session's board.
+        winlength (int): Number of marks in a row needed to win.
+        matchmaker (Matchmaker): The lobby queue of players waiting for an opponent.
+        sessions (set): Sessions currently being played.
+        playing (dict): Maps a player name to the session it is playing in.
+        tokens (dict): Maps a session token to the Connection it was issued to.
+        graceperiod (float): Seconds a dropped player has to resume; 0 ends the session at once.
+        gamesplayed (int): Number of games finished since the server started.
+        numties (int): Number of those games that were tied.
+        stats (StatsStore): Durable per-player statistics, or None if not kept.
+        server (asyncio.AbstractServer): The listening server once started.
+        metricsport (int): Port the metrics endpoint listens on, or None.
+        metricsserver (asyncio.AbstractServer): The metrics endpoint once started, or None.
+        reuseport (bool): True to listen with SO_REUSEPORT, sharing the port with other processes.
+        wheel (TimingWheel): Holds every idle check, move timer and grace period of the server.
+        idletimeout (float): Seconds of silence after which a connection is closed; 0 never closes it.
+        movetime (float): Seconds allowed for each move, or None.
+        clock (float): Seconds on each player's clock at the start of a game, or None.
+        increment (float): Seconds added to a player's clock after each of its moves.
+
+    Methods:
+        start(): Starts listening for connections and, if configured, for metrics scrapes.
+        serveMetrics(reader, writer): Answers one HTTP request with the metrics text.
+        serveForever(): Starts the server and serves until cancelled.
+        handleClient(reader, writer): Serves a newly accepted client.
+        serveClient(connection): Reads a client's first frame and sends it to the lobby or a session.
+        newToken() -> bytes: Returns a fresh session token.
+        watchIdle(connection): Starts checking a connection for silence.
+        checkIdle(connection): Pings or closes a silent connection.
+        resume(connection, token): Hands a reconnected client to the session its token belongs to.
+        enqueue(connection) -> bool: Pairs a connection through the matchmaker, or queues it.
+        waitForOpponent(connection): Keeps a queued connection in the lobby until it is paired.
+        startSession(player1, player2): Hands a matched pair over to a new session.
+        watch(connection, name): Lets a connection spectate the session a player is in.
+        sessionEnded(session): Forgets a finished session.
+        gameFinished(outcome, player1, player2): Counts a finished game and stores its result.
+        computeStats() -> dict: Returns server-wide statistics.
+    """
+
+    def __init__(self, host: str, port: int, backlog: int = 1024, rows: int = 3, columns: int = None, winlength: int = None,
+                 bucketwidth: int = None, spread: int = 0, statspath: str = None, graceperiod: float = protocol.RESUME_GRACE_S,
+                 metricsport: int = None, reuseport: bool = False, idletimeout: float = protocol.IDLE_TIMEOUT_S,
+                 movetime: float = None, clock: float = None, increment: float = 0.0):
+        """Initializes the GameServer instance.
+
+        Args:
+            host (str): Host/IP address to listen on.
+            port (int): Port number to listen on.
+            backlog (int): Length of the pending connection queue.
+            rows (int): Number of rows on every session's board.
+            columns (int, optional): Number of columns, defaulting to rows.
+            winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+            bucketwidth (int, optional): Rating bucket width for matchmaking; None pairs in arrival order.
+            spread (int): How many neighbouring rating buckets may supply an opponent.
+            statspath (str, optional): SQLite file to keep per-player statistics in.
+            graceperiod (float): Seconds a dropped player has to resume its session.
+            metricsport (int, optional): Port to serve Prometheus metrics on.
+            reuseport (bool): True to listen with SO_REUSEPORT, sharing the port with other processes.
+            idletimeout (float): Seconds of silence after which a connection is closed; 0 disables it.
+            movetime (float, optional): Seconds allowed for each move.
+            clock (float, optional): Seconds on each player's clock at the start of a game.
+            increment (float): Seconds added to a player's clock after each of its moves.
+
+        Raises:
+            ValueError: If the board shape cannot be played over the protocol.
+        """
+        protocol.checkBoardShape(rows, columns, winlength)
+        self.host = host
+        self.port = port
+        self.backlog = backlog
+        self.rows = rows
+        self.columns = rows if columns is None else columns
+        self.winlength = min(self.rows, self.columns) if winlength is None else winlength
+        self.matchmaker = Matchmaker(bucketwidth, spread)
+        self.sessions = set()
+        self.playing = {}
+        self.tokens = {}
+        self.graceperiod = graceperiod
+        self.gamesplayed = 0
+        self.numties = 0
+        self.stats = None
+        if statspath is not None:
+            from statsstore import StatsStore
+            self.stats = StatsStore(statspath)
+        self.server = None
+        self.metricsport = metricsport
+        self.metricsserver = None
+        self.reuseport = reuseport
+        self.wheel = TimingWheel()
+        self.idletimeout = idletimeout
+        self.movetime = movetime
+        self.clock = clock
+        self.increment = increment
+
+
+    async def start(self):
+        """Starts listening for connections and, if configured, for metrics scrapes."""
+        self.server = await asyncio.start_server(self.handleClient, self.host, self.port, backlog=self.backlog,
+                                                 reuse_port=self.reuseport)
+        if self.metricsport is not None:
+            self.metricsserver = await asyncio.start_server(self.serveMetrics, self.host, self.metricsport)
+
+
+    async def serveMetrics(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answers one HTTP request with the metrics text, whatever its path.
+
+        Args:
+            reader (asyncio.StreamReader): Stream the request arrives on.
+            writer (asyncio.StreamWriter): Stream the response is sent on.
+        """
+        try:
+            await reader.readuntil(b'\r\n\r\n')
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            writer.close()
+            return
+        body = metrics.REGISTRY.exportText().encode()
+        writer.write(b'HTTP/1.1 200 OK\r\n'
+                     b'Content-Type: text/plain; version=0.0.4\r\n'
+                     b'Content-Length: ' + str(len(body)).encode() + b'\r\n'
+                     b'Connection: close\r\n\r\n' + body)
+        await writer.drain()
+        writer.close()
+
+
+    async def serveForever(self):
+        """Starts the server and serves until cancelled."""
+        await self.start()
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            if self.metricsserver is not None:
+                self.metricsserver.close()
+            if self.stats is not None:
+                self.stats.close()
+
+
+    async def handleClient(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves a newly accepted client.
+
+        Args:
+            reader (asyncio.StreamReader): Stream the client's frames arrive on.
+            writer (asyncio.StreamWriter): Stream frames are sent to the client on.
+        """
+        await self.serveClient(Connection(reader, writer))
+
+
+    async def serveClient(self, connection: Connection):
+        """Reads a client's first frame and sends it to the lobby or a session.
+
+        A HELLO is answered with a session token, unless the connection already holds one, and
+        enters the lobby; a RESUME rejoins a session and a WATCH makes the client a spectator.
+
+        Args:
+            connection (Connection): The client's connection; its decoder may already hold the first frame.
+        """
+        self.watchIdle(connection)
+        try:
+            msgtype, payload = await connection.readFrame()
+            if msgtype == protocol.WATCH:
+                await self.watch(connection, protocol.decodeWatch(payload))
+                return
+            if msgtype == protocol.RESUME:
+                self.resume(connection, protocol.decodeToken(payload))
+                return
+            if msgtype != protocol.HELLO:
+                raise protocol.ProtocolError(f"expected HELLO, got message type {msgtype}")
+            connection.name = protocol.decodeHello(payload)
+            connection.rating = protocol.decodeHelloRating(payload)
+        except (ConnectionError, protocol.ProtocolError):
+            connection.close()
+            return
+        if connection.token is None:
+            connection.token = self.newToken()
+            connection.send(protocol.encodeToken(connection.token))
+        self.tokens[connection.token] = connection
+        self.enqueue(connection)
+
+
+    def newToken(self) -> bytes:
+        """Returns a fresh session token.
+
+        Returns:
+            bytes: TOKEN_SIZE random bytes.
+        """
+        return secrets.token_bytes(protocol.TOKEN_SIZE)
+
+
+    def watchIdle(self, connection: Connection):
+        """Starts checking a connection for silence, unless idle timeouts are disabled.
+
+        Args:
+            connection (Connection): A newly accepted connection.
+        """
+        if self.idletimeout > 0:
+            heartbeat = min(protocol.HEARTBEAT_S, self.idletimeout / 2)
+            connection.idletimer = self.wheel.schedule(heartbeat, self.checkIdle, connection)
+
+
+    def checkIdle(self, connection: Connection):
+        """Pings a connection silent for the heartbeat interval and closes one silent for the idle timeout.
+
+        Closing the connection ends its wait in the lobby, or lets its session treat it as dropped.
+
+        Args:
+            connection (Connection): The connection to check.
+        """
+        connection.idletimer = None
+        if connection.isClosed():
+            return
+        idle = time.monotonic() - connection.lastseen
+        if idle >= self.idletimeout:
+            connection.close()
+            return
+        heartbeat = min(protocol.HEARTBEAT_S, self.idletimeout / 2)
+        if idle >= heartbeat:
+            connection.send(protocol.encodePing())
+            delay = min(heartbeat, self.idletimeout - idle)
+        else:
+            delay = heartbeat - idle
+        connection.idletimer = self.wheel.schedule(delay, self.checkIdle, connection)
+
+
+    def resume(self, connection: Connection, token: bytes):
+        """Hands a reconnected client to the session its token belongs to.
+
+        Args:
+            connection (Connection): The new connection, which sent a RESUME frame.
+            token (bytes): The token carried by the RESUME frame.
+        """
+        previous = self.tokens.get(token)
+        if previous is None or previous.session is None:
+            connection.send(protocol.encodeQuit())
+            connection.close()
+            return
+        previous.session.events.put((connection, protocol.RESUME, token))
+
+
+    def enqueue(self, connection: Connection) -> bool:
+        """Pairs a connection through the matchmaker, or queues it.
+
+        Args:
+            connection (Connection): A connection that has announced its username.
+
+        Returns:
+            bool: True if the connection was paired, False if it was queued.
+        """
+        pair = self.matchmaker.enqueue(connection, connection.rating)
+        if pair is None:
+            connection.lobby = asyncio.create_task(self.waitForOpponent(connection))
+            return False
+        self.startSession(*pair)
+        return True
+
+
+    async def waitForOpponent(self, connection: Connection):
+        """Keeps a queued connection in the lobby until it is paired.
+
+        Bytes the client sends meanwhile are buffered in its decoder for the session. If the
+        client disconnects first, it is removed from the matchmaker; once it is paired,
+        startSession() cancels the task.
+
+        Args:
+            connection (Connection): A connection queued by enqueue().
+        """
+        try:
+            while True:
+                data = await connection.reader.read(4096)
+                if not data:
+                    raise ConnectionError("connection closed by peer")
+                connection.lastseen = time.monotonic()
+                connection.decoder.feed(data)
+        except (ConnectionError, protocol.ProtocolError):
+            self.matchmaker.cancel(connection)
+            self.tokens.pop(connection.token, None)
+            connection.close()
+
+
+    def startSession(self, player1: Connection, player2: Connection):
+        """Hands a matched pair over to a new session.
+
+        Args:
+            player1 (Connection): The player that waited in the lobby; it plays 'X'.
+            player2 (Connection): The player that completed the match; it plays 'O'.
+        """
+        if player1.lobby is not None:
+            player1.lobby.cancel()
+        session = GameSession(self, player1, player2)
+        player1.session = player2.session = session
+        self.sessions.add(session)
+        self.playing[session.game_board.player1] = session
+        self.playing[session.game_board.player2] = session
+        session.task = asyncio.create_task(session.run())
+
+
+    def sessionEnded(self, session: GameSession):
+        """Forgets a finished session.
+
+        Args:
+            session (GameSession): The session that ended.
+        """
+        self.sessions.discard(session)
+        for name in (session.game_board.player1, session.game_board.player2):
+            if self.playing.get(name) is session:
+                del self.playing[name]
+        for connection in session.players:
+            self.tokens.pop(connection.token, None)
+
+
+    async def watch(self, connection: Connection, name: str):
+        """Lets a connection spectate the session a player is in, until either side leaves.
+
+        Args:
+            connection (Connection): The spectator's connection.
+            name (str): The username of one of the players.
+        """
+        session = self.playing.get(name)
+        if session is None:
+            connection.send(protocol.encodeQuit())
+            connection.close()
+            return
+        session.addSpectator(connection)
+        try:
+            while await connection.reader.read(4096):
+                connection.lastseen = time.monotonic()
+        except ConnectionError:
+            pass
+        session.spectators.discard(connection)
+        connection.close()
+
+
+    def gameFinished(self, outcome: str, player1: str, player2: str):
+        """Counts a finished game and stores its result.
+
+        Args:
+            outcome (str): 'X', 'O' or 'tie'.
+            player1 (str): The player who played 'X'.
+            player2 (str): The player who played 'O'.
+        """
+        self.gamesplayed += 1
+        if outcome == 'tie':
+            self.numties += 1
+        if self.stats is not None:
+            self.stats.recordGame(player1, player2, outcome)
+
+
+    def computeStats(self) -> dict:
+        """Returns server-wide statistics.
+
+        Returns:
+            dict: Active sessions, waiting players, spectators, games played and ties.
+        """
+        return {
+            'sessions': len(self.sessions),
+            'spectators': sum(len(session.spectators) for session in self.sessions),
+            'waiting': len(self.matchmaker),
+            'gamesplayed': self.gamesplayed,
+            'numties': self.numties,
+        }
+
+
+def main(argv: list = None):
+    """Parses the command line and runs the server.
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Headless Tic Tac Toe game server.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--backlog', type=int, default=1024)
+    parser.add_argument('--rows', type=int, default=3)
+    parser.add_argument('--columns', type=int)
+    parser.add_argument('--winlength', type=int)
+    parser.add_argument('--bucket-width', type=int, help="rating bucket width; omit to pair in arrival order")
+    parser.add_argument('--bucket-spread', type=int, default=0, help="neighbouring buckets searched for an opponent")
+    parser.add_argument('--stats-db', help="SQLite file to keep per-player statistics in")
+    parser.add_argument('--grace-period', type=float, default=protocol.RESUME_GRACE_S,
+                        help="seconds a dropped player has to resume its session")
+    parser.add_argument('--metrics-port', type=int, help="serve Prometheus metrics over HTTP on this port")
+    parser.add_argument('--idle-timeout', type=float, default=protocol.IDLE_TIMEOUT_S,
+                        help="close connections silent for this many seconds; 0 keeps them open")
+    parser.add_argument('--move-time', type=float, help="seconds allowed for each move")
+    parser.add_argument('--clock', type=float, help="seconds on each player's clock per game")
+    parser.add_argument('--increment', type=float, default=0.0, help="seconds added to the clock after each move")
+    parser.add_argument('--workers', type=int, help="run this many worker processes on the port; 0 for one per core")
+    parser.add_argument('--stats-interval', type=float, help="with --workers, print the combined statistics this often")
+    args = parser.parse_args(argv)
+    try:
+        protocol.checkBoardShape(args.rows, args.columns, args.winlength)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.workers is not None:
+        from workers import WorkerPool
+        options = {'backlog': args.backlog, 'rows': args.rows, 'columns': args.columns, 'winlength': args.winlength,
+                   'bucketwidth': args.bucket_width, 'spread': args.bucket_spread, 'statspath': args.stats_db,
+                   'graceperiod': args.grace_period, 'metricsport': args.metrics_port, 'idletimeout': args.idle_timeout,
+                   'movetime': args.move_time, 'clock': args.clock, 'increment': args.increment}
+        WorkerPool(args.host, args.port, args.workers, options, args.stats_interval).run()
+        return
+    server = GameServer(args.host, args.port, args.backlog, args.rows, args.columns, args.winlength,
+                        args.bucket_width, args.bucket_spread, args.stats_db, args.grace_period,
+                        args.metrics_port, idletimeout=args.idle_timeout, movetime=args.move_time, clock=args.clock,
+                        increment=args.increment)
+    try:
+        asyncio.run(server.serveForever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
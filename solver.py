@@ -0,0 +1,305 @@
+"""This module contains a perfect-play Tic Tac Toe solver backed by a precomputed table.
+
+Every position reachable from the empty board that still has a move to play (4,520 of the
+5,478 legal positions) is solved once with memoized negamax. Results live in two flat tables
+indexed by the position's base-3 number, where cell ``row * 3 + column`` contributes 1 for 'X'
+and 2 for 'O', so finding the best move is a single table lookup. The solve runs on first use and takes a fraction of a second.
+
+SolverBot wraps the solver in the same frame-based interface as a remote opponent, so Player1
+can practise against it in place of a human Player 2.
+
+Usage:
+    row, col = getSolver().bestMove(game_board)
+"""
+from array import array
+from collections import deque
+import protocol
+from bitboard import BitBoardClass, CELL_LINES, FULL_MASK
+
+NUM_POSITIONS = 3 ** 9
+NO_MOVE = 255
+UNSOLVED = -128
+
+POW3 = tuple(sum(3 ** cell for cell in range(9) if mask & (1 << cell)) for mask in range(1 << 9))
+
+
+def positionIndex(xmask: int, omask: int) -> int:
+    """Returns the table index of a position.
+
+    Args:
+        xmask (int): 9-bit mask of the cells taken by 'X'.
+        omask (int): 9-bit mask of the cells taken by 'O'.
+
+    Returns:
+        int: The base-3 number of the position.
+    """
+    return POW3[xmask] + 2 * POW3[omask]
+
+
+def boardMasks(game_board) -> tuple:
+    """Returns the 'X' and 'O' masks of any BoardClass.
+
+    Args:
+        game_board (BoardClass): The board to read.
+
+    Returns:
+        tuple: The (xmask, omask) of the board.
+    """
+    if isinstance(game_board, BitBoardClass):
+        return game_board.xmask, game_board.omask
+    xmask = omask = 0
+    for cell in range(9):
+        mark = game_board.getCell(cell // 3, cell % 3)
+        if mark == 'X':
+            xmask |= 1 << cell
+        elif mark == 'O':
+            omask |= 1 << cell
+    return xmask, omask
+
+
+class Solver():
+    """
+    Solves every reachable position and answers best-move queries by table lookup.
+
+    Scores are from the point of view of the side to move: positive wins, negative loses and
+    zero draws. A larger magnitude means the game ends sooner, so the solver wins as fast as
+    possible and delays losses as long as possible.
+
+    Attributes:
+        scores (array): Score of each position, UNSOLVED for unreachable ones.
+        bestmoves (bytearray): Best cell of each position, NO_MOVE when the game is over.
+
+    Methods:
+        solve(): Fills the tables from the empty board.
+        solvePosition(xmask, omask) -> int: Solves one position and its successors.
+        evaluate(game_board) -> int: Returns the score of a board for the side to move.
+        bestMove(game_board) -> tuple: Returns the best (row, column) for the side to move.
+    """
+
+    def __init__(self):
+        """Initializes the Solver instance and solves every reachable position."""
+        self.scores = array('b', [UNSOLVED]) * NUM_POSITIONS
+        self.bestmoves = bytearray([NO_MOVE]) * NUM_POSITIONS
+        self.solve()
+
+
+    def solve(self):
+        """Fills the tables from the empty board."""
+        self.solvePosition(0, 0)
+
+
+    def solvePosition(self, xmask: int, omask: int) -> int:
+        """Solves one position and every position reachable from it.
+
+        Args:
+            xmask (int): 9-bit mask of the cells taken by 'X'.
+            omask (int): 9-bit mask of the cells taken by 'O'.
+
+        Returns:
+            int: The score of the position for the side to move.
+        """
+        index = positionIndex(xmask, omask)
+        score = self.scores[index]
+        if score != UNSOLVED:
+            return score
+        taken = xmask | omask
+        xtomove = bin(xmask).count('1') == bin(omask).count('1')
+        mover, waiting = (xmask, omask) if xtomove else (omask, xmask)
+        empties = 9 - bin(taken).count('1')
+        best = -100
+        bestcell = NO_MOVE
+        if taken == FULL_MASK:
+            best = 0
+        for cell in range(9):
+            bit = 1 << cell
+            if taken & bit:
+                continue
+            placed = mover | bit
+            if any(placed & line == line for line in CELL_LINES[cell]):
+                score = empties
+            elif empties == 1:
+                score = 0
+            elif xtomove:
+                score = -self.solvePosition(placed, waiting)
+            else:
+                score = -self.solvePosition(waiting, placed)
+            if score > best:
+                best = score
+                bestcell = cell
+        self.scores[index] = best
+        self.bestmoves[index] = bestcell
+        return best
+
+
+    def evaluate(self, game_board) -> int:
+        """Returns the score of a board for the side to move.
+
+        Args:
+            game_board (BoardClass): A position with no completed line.
+
+        Returns:
+            int: Positive if the side to move wins, negative if it loses, zero for a draw.
+        """
+        score = self.scores[positionIndex(*boardMasks(game_board))]
+        if score == UNSOLVED:
+            raise ValueError("position is not reachable in a legal game")
+        return score
+
+
+    def bestMove(self, game_board) -> tuple:
+        """Returns the best move for the side to move.
+
+        Args:
+            game_board (BoardClass): A position with no completed line and at least one empty cell.
+
+        Returns:
+            tuple: The (row, column) of the best move.
+        """
+        cell = self.bestmoves[positionIndex(*boardMasks(game_board))]
+        if cell == NO_MOVE:
+            raise ValueError("position has no move to play")
+        return cell // 3, cell % 3
+
+
+_solver = None
+
+
+def getSolver() -> Solver:
+    """Returns the shared Solver, solving the tables on first use.
+
+    Returns:
+        Solver: The shared solver.
+    """
+    global _solver
+    if _solver is None:
+        _solver = Solver()
+    return _solver
+
+
+class SolverBot():
+    """
+    Plays Player 2 with perfect play through the same calls Player1 makes on a remote opponent.
+
+    The bot stands in for both the socket (`sendall`) and the SocketReader (`start`/`send`/`drain`),
+    answering HELLO with its name and every MOVE with the solver's reply.
+
+    Attributes:
+        name (str): Username announced to Player 1.
+        solver (Solver): The solver choosing the bot's moves.
+        game_board (BitBoardClass): The bot's copy of the game.
+        decoder (protocol.FrameDecoder): Reassembles frames sent by Player 1.
+        replies (deque): (msgtype, payload) frames waiting to be drained by Player 1.
+
+    Methods:
+        start(): Does nothing; present for SocketReader compatibility.
+        keepAlive(): Does nothing; present for SocketReader compatibility.
+        sendall(data): Accepts frames sent by Player 1.
+        send(frame) -> bool: Accepts a frame sent by Player 1; present for SocketReader compatibility.
+        flush(timeout) -> int: Does nothing; present for SocketReader compatibility.
+        handleFrame(msgtype, payload): Reacts to one frame sent by Player 1.
+        drain() -> list: Returns the bot's replies since the last call.
+        close(): Does nothing; present for socket compatibility.
+    """
+
+    def __init__(self, name: str = "Computer", solver: Solver = None):
+        """Initializes the SolverBot instance.
+
+        Args:
+            name (str): Username announced to Player 1.
+            solver (Solver, optional): Solver to use instead of the shared one.
+        """
+        self.name = name
+        self.solver = solver if solver is not None else getSolver()
+        self.game_board = BitBoardClass()
+        self.decoder = protocol.FrameDecoder()
+        self.replies = deque()
+
+
+    def start(self):
+        """Does nothing; the bot needs no reader thread."""
+
+
+    def keepAlive(self):
+        """Does nothing; the bot never goes silent."""
+
+
+    def sendall(self, data: bytes):
+        """Accepts frames sent by Player 1.
+
+        Args:
+            data (bytes): One or more encoded frames.
+        """
+        self.decoder.feed(data)
+        while self.decoder.frames:
+            self.handleFrame(*self.decoder.frames.popleft())
+
+
+    def send(self, frame: bytes) -> bool:
+        """Accepts a frame sent by Player 1.
+
+        Args:
+            frame (bytes): The encoded frame.
+
+        Returns:
+            bool: Always True; the bot never falls behind.
+        """
+        self.sendall(frame)
+        return True
+
+
+    def flush(self, timeout: float = 0.0) -> int:
+        """Does nothing; frames sent to the bot are handled at once.
+
+        Returns:
+            int: Always 0 bytes queued.
+        """
+        return 0
+
+
+    def handleFrame(self, msgtype: int, payload: bytes):
+        """Reacts to one frame sent by Player 1.
+
+        Args:
+            msgtype (int): The frame's message type.
+            payload (bytes): The frame's payload.
+        """
+        if msgtype == protocol.HELLO:
+            p1user = protocol.decodeHello(payload)
+            if p1user == self.name:
+                self.name = f"{self.name} (2)"
+            self.game_board.setPlayer1Name(p1user)
+            self.game_board.setPlayer2Name(self.name)
+            self.game_board.resetDefaultTurn()
+            self.replies.append((protocol.HELLO, self.name.encode()))
+        elif msgtype == protocol.MOVE:
+            self.game_board.applyMove(*protocol.decodeMove(payload))
+            if self.game_board.outcome() is not None:
+                return
+            self.game_board.changePlayerTurn()
+            row, col = self.solver.bestMove(self.game_board)
+            self.game_board.applyMove(row, col)
+            self.replies.append((protocol.MOVE, protocol.encodeMoveBytes(row, col) + protocol.DIGEST.pack(self.game_board.digest())))
+            if self.game_board.outcome() is None:
+                self.game_board.changePlayerTurn()
+        elif msgtype == protocol.REMATCH:
+            self.game_board.resetGameBoard()
+            self.game_board.resetDefaultTurn()
+
+
+    def drain(self) -> list:
+        """Returns the bot's replies since the last call.
+
+        Returns:
+            list: (msgtype, payload) tuples.
+        """
+        drained = list(self.replies)
+        self.replies.clear()
+        return drained
+
+
+    def close(self):
+        """Does nothing; the bot holds no connection."""
+
+
+if __name__ == "__main__":
+    pass
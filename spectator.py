@@ -0,0 +1,167 @@
+"""This module contains a console client that watches a game hosted by the headless server.
+
+The spectator sends a WATCH frame naming a player, rebuilds the session from the SNAPSHOT it
+receives and then applies the MOVE, RESULT and REMATCH frames that follow to its own
+BoardClass, printing the board after every change. CLOCK frames of timed games are printed as
+they arrive, and the server's PINGs are answered so the spectator is not timed out.
+
+Dependencies:
+    - socket: Provides the networking functionality for communication.
+    - protocol: A module providing the framed wire format.
+    - gameboard: A module providing the BoardClass for maintaining game state.
+
+Usage:
+    python spectator.py --host localhost --port 5000 alice
+"""
+import argparse
+import socket
+import protocol
+from gameboard import BoardClass
+
+
+class Spectator():
+    """
+    Follows one server session and mirrors it on a local board.
+
+    Attributes:
+        sock (socket.socket): Connection to the server.
+        decoder (protocol.FrameDecoder): Reassembles frames received from the server.
+        game_board (BoardClass): Local copy of the watched game, or None before the snapshot.
+
+    Methods:
+        watch(name): Asks the server to spectate a player's session.
+        run(): Applies frames until the session ends.
+        handleFrame(msgtype, payload) -> bool: Applies one frame to the local board.
+        loadSnapshot(state): Rebuilds the local board from a decoded snapshot.
+        applyMove(row, col): Applies a relayed move.
+        printBoard(): Prints the local board and the score.
+    """
+
+    def __init__(self, sock: socket.socket):
+        """Initializes the Spectator instance.
+
+        Args:
+            sock (socket.socket): A connected socket to the server.
+        """
+        self.sock = sock
+        self.decoder = protocol.FrameDecoder()
+        self.game_board = None
+
+
+    def watch(self, name: str):
+        """Asks the server to spectate a player's session.
+
+        Args:
+            name (str): The username of one of the players.
+        """
+        self.sock.sendall(protocol.encodeWatch(name))
+
+
+    def run(self):
+        """Applies frames until the session ends or the server closes the connection."""
+        try:
+            while self.handleFrame(*protocol.readFrame(self.sock, self.decoder)):
+                pass
+        except ConnectionError:
+            pass
+
+
+    def handleFrame(self, msgtype: int, payload: bytes) -> bool:
+        """Applies one frame to the local board.
+
+        Args:
+            msgtype (int): The frame's message type.
+            payload (bytes): The frame's payload.
+
+        Returns:
+            bool: False once the session is over, True otherwise.
+        """
+        if msgtype == protocol.SNAPSHOT:
+            self.loadSnapshot(protocol.decodeSnapshot(payload))
+        elif msgtype == protocol.MOVE:
+            self.applyMove(*protocol.decodeMove(payload))
+        elif msgtype == protocol.RESULT:
+            outcome = protocol.decodeResult(payload)
+            if outcome not in ('tie', self.game_board.currentMark()):
+                # The player to move lost on time.
+                self.game_board.changePlayerTurn()
+            print("It's a tie!" if outcome == 'tie' else f"{self.game_board.userturn} is the Winner!")
+            if outcome == 'tie':
+                self.game_board.recordTie()
+            else:
+                self.game_board.recordWin()
+            self.game_board.updateGamesPlayed()
+            self.game_board.resetGameBoard()
+            self.game_board.resetDefaultTurn()
+        elif msgtype == protocol.REMATCH:
+            print("A new game has started.")
+            self.printBoard()
+        elif msgtype == protocol.CLOCK:
+            xremaining, oremaining = protocol.decodeClock(payload)
+            print(f"Clock: X {xremaining:.1f} s, O {oremaining:.1f} s")
+        elif msgtype == protocol.PING:
+            self.sock.sendall(protocol.encodePong())
+        elif msgtype == protocol.QUIT:
+            print("The session has ended.")
+            return False
+        return True
+
+
+    def loadSnapshot(self, state: dict):
+        """Rebuilds the local board from a decoded snapshot.
+
+        Args:
+            state (dict): A state returned by protocol.decodeSnapshot().
+        """
+        self.game_board = BoardClass(state['rows'], state['columns'], state['winlength'])
+        self.game_board.setPlayer1Name(state['player1'])
+        self.game_board.setPlayer2Name(state['player2'])
+        self.game_board.numwins = state['numwins']
+        self.game_board.numlosses = state['numlosses']
+        self.game_board.numties = state['numties']
+        self.game_board.gamesplayed = state['gamesplayed']
+        self.game_board.resetDefaultTurn()
+        for row, col in state['history']:
+            self.game_board.applyMove(row, col)
+            self.game_board.changePlayerTurn()
+        self.printBoard()
+
+
+    def applyMove(self, row: int, col: int):
+        """Applies a relayed move.
+
+        Args:
+            row (int): Row index of the move.
+            col (int): Column index of the move.
+        """
+        self.game_board.applyMove(row, col)
+        if self.game_board.outcome() is None:
+            self.game_board.changePlayerTurn()
+        self.printBoard()
+
+
+    def printBoard(self):
+        """Prints the local board and the score."""
+        player1, player2 = self.game_board.player1, self.game_board.player2
+        print(f"{player1} (X) {self.game_board.numwins[player1]} - {self.game_board.numwins[player2]} {player2} (O), "
+              f"{self.game_board.numties} ties")
+        for row in range(self.game_board.rows):
+            print('|'.join(self.game_board.getCell(row, col) for col in range(self.game_board.columns)))
+        print()
+
+
+def main():
+    """Parses the command line and watches a player's session."""
+    parser = argparse.ArgumentParser(description="Watch a game hosted by the Tic Tac Toe server.")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('player', help="username of one of the players to watch")
+    args = parser.parse_args()
+    spectator = Spectator(socket.create_connection((args.host, args.port)))
+    spectator.watch(args.player)
+    spectator.run()
+    spectator.sock.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""This module contains a durable store of per-player Tic Tac Toe statistics.
+
+Results are kept in a local SQLite database in WAL mode. Recorded results are first summed per
+player in memory and written in one transaction per batch, either when enough results are
+pending or when the store is flushed or closed, so finishing a game costs no disk write. Each
+flush appends the batch to the results log and folds it into the players table, whose primary
+key answers per-player lookups and whose (wins, name) index answers top-N leaderboards,
+neither of which scans the log.
+
+Dependencies:
+    - sqlite3: Provides the database.
+
+Usage:
+    stats = StatsStore()
+    stats.recordGame("alice", "bob", 'X')
+    print(stats.leaderboard(10))
+    stats.close()
+"""
+import os
+import sqlite3
+import time
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.tictactoe_stats.db')
+DEFAULT_BATCH = 64
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    name TEXT PRIMARY KEY,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    ties INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS players_leaderboard ON players (wins DESC, name);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    recorded REAL NOT NULL
+);
+"""
+
+UPSERT = """
+INSERT INTO players (name, wins, losses, ties) VALUES (?, ?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses,
+    ties = ties + excluded.ties
+"""
+
+
+class StatsStore():
+    """
+    Persists win, loss and tie counts per player, committing them in batches.
+
+    Attributes:
+        path (str): Location of the SQLite database file.
+        batchsize (int): Number of pending results that triggers a flush.
+        connection (sqlite3.Connection): The open database connection.
+        pending (dict): Maps a player name to its unwritten [wins, losses, ties].
+        numpending (int): Number of results recorded since the last flush.
+
+    Methods:
+        recordResults(name, wins, losses, ties): Adds results for a player to the pending batch.
+        recordGame(player1, player2, outcome): Records a finished game for both players.
+        flush(): Writes the pending batch in one transaction.
+        lookup(name) -> dict: Returns a player's totals.
+        leaderboard(limit) -> list: Returns the players with the most wins.
+        totals(name, wins, losses, ties) -> dict: Builds the dict describing one player's totals.
+        close(): Flushes pending results and closes the database.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, batchsize: int = DEFAULT_BATCH):
+        """Initializes the StatsStore instance, creating the database if needed.
+
+        Args:
+            path (str): Location of the SQLite database file.
+            batchsize (int): Number of pending results that triggers a flush.
+        """
+        self.path = path
+        self.batchsize = batchsize
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.pending = {}
+        self.numpending = 0
+
+
+    def recordResults(self, name: str, wins: int = 0, losses: int = 0, ties: int = 0):
+        """Adds results for a player to the pending batch.
+
+        Args:
+            name (str): The player's name.
+            wins (int): Number of wins to add.
+            losses (int): Number of losses to add.
+            ties (int): Number of ties to add.
+        """
+        counts = self.pending.setdefault(name, [0, 0, 0])
+        counts[0] += wins
+        counts[1] += losses
+        counts[2] += ties
+        self.numpending += wins + losses + ties
+        if self.numpending >= self.batchsize:
+            self.flush()
+
+
+    def recordGame(self, player1: str, player2: str, outcome: str):
+        """Records a finished game for both players.
+
+        Args:
+            player1 (str): The player who played 'X'.
+            player2 (str): The player who played 'O'.
+            outcome (str): 'X', 'O' or 'tie'.
+        """
+        if outcome == 'tie':
+            self.recordResults(player1, ties=1)
+            self.recordResults(player2, ties=1)
+        else:
+            winner, loser = (player1, player2) if outcome == 'X' else (player2, player1)
+            self.recordResults(winner, wins=1)
+            self.recordResults(loser, losses=1)
+
+
+    def flush(self):
+        """Writes the pending batch in one transaction."""
+        if not self.pending:
+            return
+        now = time.time()
+        rows = [(name, *counts) for name, counts in self.pending.items()]
+        with self.connection:
+            self.connection.executemany(UPSERT, rows)
+            self.connection.executemany(
+                "INSERT INTO results (name, wins, losses, ties, recorded) VALUES (?, ?, ?, ?, ?)",
+                [row + (now,) for row in rows])
+        self.pending = {}
+        self.numpending = 0
+
+
+    def lookup(self, name: str) -> dict:
+        """Returns a player's totals, including results not yet flushed.
+
+        Args:
+            name (str): The player's name.
+
+        Returns:
+            dict: The player's name, wins, losses, ties and games played.
+        """
+        row = self.connection.execute("SELECT wins, losses, ties FROM players WHERE name = ?", (name,)).fetchone()
+        wins, losses, ties = row or (0, 0, 0)
+        pending = self.pending.get(name, (0, 0, 0))
+        return self.totals(name, wins + pending[0], losses + pending[1], ties + pending[2])
+
+
+    def leaderboard(self, limit: int = 10) -> list:
+        """Returns the players with the most wins.
+
+        Args:
+            limit (int): Number of players to return.
+
+        Returns:
+            list: Dicts as returned by lookup(), best first.
+        """
+        self.flush()
+        rows = self.connection.execute(
+            "SELECT name, wins, losses, ties FROM players ORDER BY wins DESC, name LIMIT ?", (limit,))
+        return [self.totals(*row) for row in rows]
+
+
+    @staticmethod
+    def totals(name: str, wins: int, losses: int, ties: int) -> dict:
+        """Builds the dict describing one player's totals."""
+        return {'name': name, 'wins': wins, 'losses': losses, 'ties': ties, 'gamesplayed': wins + losses + ties}
+
+
+    def close(self):
+        """Flushes pending results and closes the database."""
+        self.flush()
+        self.connection.close()
+
+
+if __name__ == "__main__":
+    stats = StatsStore()
+    for entry in stats.leaderboard():
+        print(f"{entry['name']}: {entry['wins']} wins, {entry['losses']} losses, {entry['ties']} ties")
+    stats.close()
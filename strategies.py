@@ -0,0 +1,98 @@
+"""This module contains move-choosing strategies for headless bots.
+
+A strategy is a function ``strategy(game_board, rng) -> (row, column)`` choosing a move for the
+player whose turn it is on a BoardClass that still has an empty cell. Strategies never change
+the board they are given.
+
+Usage:
+    row, col = STRATEGIES['heuristic'](game_board, random.Random())
+"""
+from solver import getSolver
+
+
+def emptyCells(game_board) -> list:
+    """Returns the empty cells of a board.
+
+    Args:
+        game_board (BoardClass): The board to inspect.
+
+    Returns:
+        list: (row, column) tuples of the empty cells.
+    """
+    return [(row, col) for row in range(game_board.rows) for col in range(game_board.columns)
+            if game_board.getCell(row, col) == ' ']
+
+
+def completesLine(game_board, row: int, col: int, mark: str) -> bool:
+    """Checks if placing a mark in a cell would complete a line for it.
+
+    Args:
+        game_board (BoardClass): The board to inspect; it is left unchanged.
+        row (int): Row index of the cell.
+        col (int): Column index of the cell.
+        mark (str): 'X' or 'O'.
+
+    Returns:
+        bool: True if the mark would win by playing there.
+    """
+    game_board.setCell(row, col, mark)
+    won = game_board.winningMark() == mark
+    game_board.setCell(row, col, ' ')
+    return won
+
+
+def randomStrategy(game_board, rng) -> tuple:
+    """Plays a uniformly random empty cell.
+
+    Args:
+        game_board (BoardClass): The board to play on.
+        rng (random.Random): Source of randomness.
+
+    Returns:
+        tuple: The chosen (row, column).
+    """
+    return rng.choice(emptyCells(game_board))
+
+
+def heuristicStrategy(game_board, rng) -> tuple:
+    """Wins if possible, otherwise blocks, otherwise prefers the centre, then corners.
+
+    Args:
+        game_board (BoardClass): The board to play on.
+        rng (random.Random): Source of randomness for ties between equal cells.
+
+    Returns:
+        tuple: The chosen (row, column).
+    """
+    cells = emptyCells(game_board)
+    mark = game_board.currentMark()
+    opponent = 'O' if mark == 'X' else 'X'
+    for target in (mark, opponent):
+        for row, col in cells:
+            if completesLine(game_board, row, col, target):
+                return row, col
+    centre = (game_board.rows // 2, game_board.columns // 2)
+    if centre in cells:
+        return centre
+    corners = [cell for cell in cells if cell[0] in (0, game_board.rows - 1) and cell[1] in (0, game_board.columns - 1)]
+    return rng.choice(corners or cells)
+
+
+def solverStrategy(game_board, rng) -> tuple:
+    """Plays perfectly using the precomputed solver table; 3x3 boards only.
+
+    Args:
+        game_board (BoardClass): The board to play on.
+        rng (random.Random): Unused; the solver is deterministic.
+
+    Returns:
+        tuple: The chosen (row, column).
+    """
+    return getSolver().bestMove(game_board)
+
+
+STRATEGIES = {
+    'random': randomStrategy,
+    'heuristic': heuristicStrategy,
+    'solver': solverStrategy,
+}
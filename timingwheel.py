@@ -0,0 +1,189 @@
+"""This module contains a hierarchical timing wheel for the server's many timers.
+
+Every session on the server has a move clock and every connection an idle check, so the
+server holds a timer for each of them at all times. Instead of one event-loop handle per
+timer, all of them live in one TimingWheel driven by a single loop callback per tick.
+
+Time is counted in ticks of a fixed length. The wheel has a few levels of WHEEL_SIZE slots
+each: level 0 covers the next WHEEL_SIZE ticks one slot per tick, level 1 the next
+WHEEL_SIZE ** 2 ticks one slot per WHEEL_SIZE ticks, and so on. A timer goes into the slot of
+its deadline on the level of the highest base-WHEEL_SIZE digit in which its deadline differs
+from the current tick. Whenever the current tick crosses the boundary of a slot on a higher
+level, that slot's timers are moved down a level, and each tick fires the timers in the
+level-0 slot of that tick. Scheduling and cancelling are a set insertion and a set removal,
+whatever the number of timers, and every timer is moved at most once per level.
+
+Usage:
+    wheel = TimingWheel()
+    timer = wheel.schedule(30.0, connection.close)
+    timer.cancel()
+"""
+import asyncio
+import math
+import time
+
+TICK_S = 0.05
+WHEEL_BITS = 6
+WHEEL_SIZE = 1 << WHEEL_BITS
+LEVELS = 4
+
+
+class Timer():
+    """
+    A callback scheduled on a TimingWheel.
+
+    Attributes:
+        wheel (TimingWheel): The wheel the timer is scheduled on.
+        deadline (int): Tick on which the timer fires.
+        callback (callable): Called as callback(*args) when the timer fires.
+        args (tuple): Arguments passed to the callback.
+        bucket (set): Slot of the wheel holding the timer, or None once fired or cancelled.
+
+    Methods:
+        cancel(): Removes the timer from its wheel if it has not fired yet.
+    """
+
+    __slots__ = ('wheel', 'deadline', 'callback', 'args', 'bucket')
+
+    def __init__(self, wheel, deadline: int, callback, args: tuple):
+        """Initializes the Timer instance.
+
+        Args:
+            wheel (TimingWheel): The wheel the timer is scheduled on.
+            deadline (int): Tick on which the timer fires.
+            callback (callable): Called as callback(*args) when the timer fires.
+            args (tuple): Arguments passed to the callback.
+        """
+        self.wheel = wheel
+        self.deadline = deadline
+        self.callback = callback
+        self.args = args
+        self.bucket = None
+
+
+    def cancel(self):
+        """Removes the timer from its wheel if it has not fired yet."""
+        if self.bucket is not None:
+            self.bucket.discard(self)
+            self.bucket = None
+            self.wheel.count -= 1
+
+
+class TimingWheel():
+    """
+    Schedules many timers on levels of slots, driven by one event-loop callback per tick.
+
+    Attributes:
+        tick (float): Length of a tick in seconds.
+        levels (list): One list of WHEEL_SIZE slots per level, each slot a set of Timers.
+        current (int): Tick the wheel has advanced to.
+        count (int): Number of scheduled timers.
+        handle (asyncio.TimerHandle): Loop callback advancing the wheel, or None while it is empty.
+
+    Methods:
+        schedule(delay, callback, *args) -> Timer: Schedules a callback after a delay.
+        place(timer): Puts a timer into the slot of its deadline.
+        advance(now): Fires every timer due by a time.monotonic() reading.
+        cascade(level): Moves the timers of the current slot of a level down the wheel.
+        onTick(): Advances the wheel from the event loop and schedules the next tick.
+        __len__() -> int: Returns the number of scheduled timers.
+    """
+
+    def __init__(self, tick: float = TICK_S, numlevels: int = LEVELS):
+        """Initializes the TimingWheel instance.
+
+        Args:
+            tick (float): Length of a tick in seconds.
+            numlevels (int): Number of levels; the last one also holds every timer beyond its range.
+        """
+        self.tick = tick
+        self.levels = [[set() for slot in range(WHEEL_SIZE)] for level in range(numlevels)]
+        self.current = math.floor(time.monotonic() / tick)
+        self.count = 0
+        self.handle = None
+
+
+    def __len__(self) -> int:
+        """Returns the number of scheduled timers."""
+        return self.count
+
+
+    def schedule(self, delay: float, callback, *args) -> Timer:
+        """Schedules a callback to run after a delay, rounded up to the next tick.
+
+        The wheel starts driving itself from the running event loop when it holds its first timer.
+
+        Args:
+            delay (float): Seconds to wait.
+            callback (callable): Called as callback(*args) when the timer fires.
+            *args: Arguments passed to the callback.
+
+        Returns:
+            Timer: The scheduled timer, which can be cancelled.
+        """
+        now = time.monotonic()
+        if self.count == 0:
+            self.current = max(self.current, math.floor(now / self.tick))
+        timer = Timer(self, max(math.ceil((now + delay) / self.tick), self.current + 1), callback, args)
+        self.place(timer)
+        self.count += 1
+        if self.handle is None:
+            self.handle = asyncio.get_running_loop().call_later(self.tick, self.onTick)
+        return timer
+
+
+    def place(self, timer: Timer):
+        """Puts a timer into the slot of its deadline on the level the deadline falls in.
+
+        Args:
+            timer (Timer): A timer whose deadline is not before the current tick.
+        """
+        level = min(max((timer.deadline ^ self.current).bit_length() - 1, 0) // WHEEL_BITS, len(self.levels) - 1)
+        bucket = self.levels[level][(timer.deadline >> (WHEEL_BITS * level)) & (WHEEL_SIZE - 1)]
+        bucket.add(timer)
+        timer.bucket = bucket
+
+
+    def advance(self, now: float):
+        """Fires every timer whose deadline has passed by a time.monotonic() reading.
+
+        Args:
+            now (float): The current time.monotonic() reading.
+        """
+        target = math.floor(now / self.tick)
+        while self.current < target and self.count:
+            self.current += 1
+            for level in range(len(self.levels) - 1, 0, -1):
+                if self.current & ((1 << (WHEEL_BITS * level)) - 1) == 0:
+                    self.cascade(level)
+            bucket = self.levels[0][self.current & (WHEEL_SIZE - 1)]
+            while bucket:
+                timer = bucket.pop()
+                timer.bucket = None
+                self.count -= 1
+                timer.callback(*timer.args)
+        self.current = max(self.current, target)
+
+
+    def cascade(self, level: int):
+        """Moves the timers of a level's slot for the current tick down to the lower levels.
+
+        Args:
+            level (int): The level whose slot boundary the current tick has reached.
+        """
+        slots = self.levels[level]
+        index = (self.current >> (WHEEL_BITS * level)) & (WHEEL_SIZE - 1)
+        bucket = slots[index]
+        slots[index] = set()
+        for timer in bucket:
+            self.place(timer)
+
+
+    def onTick(self):
+        """Advances the wheel from the event loop and schedules the next tick while timers remain."""
+        self.handle = None
+        try:
+            self.advance(time.monotonic())
+        finally:
+            if self.count and self.handle is None:
+                self.handle = asyncio.get_running_loop().call_later(self.tick, self.onTick)
@@ -0,0 +1,177 @@
+"""This module runs headless self-play tournaments between bot strategies.
+
+Games are split into batches that are played across a process pool. Each batch plays on its
+own BoardClass and keeps score with the same bookkeeping the GUI uses (`isWinner()`,
+`boardIsFull()`, `updateGamesPlayed()`), and the per-batch counters are merged at the end, so
+the totals match what `computeStats()` would report for the two players.
+
+Usage:
+    python tournament.py solver random --games 100000
+    python tournament.py heuristic heuristic --games 20000 --workers 4 --json
+"""
+import argparse
+import json
+import os
+import random
+from multiprocessing import Pool
+from gameboard import BoardClass
+from strategies import STRATEGIES
+
+
+def playerNames(strategy1: str, strategy2: str) -> tuple:
+    """Returns distinct player names for two strategies.
+
+    Args:
+        strategy1 (str): Strategy playing 'X'.
+        strategy2 (str): Strategy playing 'O'.
+
+    Returns:
+        tuple: The names of Player 1 and Player 2.
+    """
+    if strategy1 == strategy2:
+        return f"{strategy1} (X)", f"{strategy2} (O)"
+    return strategy1, strategy2
+
+
+def playGame(game_board: BoardClass, movers: dict, rng: random.Random):
+    """Plays one game to the end, recording the result on the board's statistics.
+
+    Args:
+        game_board (BoardClass): The board to play on, already reset.
+        movers (dict): Maps each player name to its strategy function.
+        rng (random.Random): Source of randomness passed to the strategies.
+    """
+    while True:
+        row, col = movers[game_board.userturn](game_board, rng)
+        game_board.applyMove(row, col)
+        if game_board.isWinner() or game_board.boardIsFull():
+            return
+        game_board.changePlayerTurn()
+
+
+def runBatch(task: tuple) -> dict:
+    """Plays a batch of games in a worker process.
+
+    Args:
+        task (tuple): (strategy1, strategy2, games, seed, rows, columns, winlength).
+
+    Returns:
+        dict: Games played, wins and losses per player, and ties for the batch.
+    """
+    strategy1, strategy2, games, seed, rows, columns, winlength = task
+    player1, player2 = playerNames(strategy1, strategy2)
+    game_board = BoardClass(rows, columns, winlength)
+    game_board.setPlayer1Name(player1)
+    game_board.setPlayer2Name(player2)
+    game_board.addWinLoss(player1)
+    game_board.addWinLoss(player2)
+    movers = {player1: STRATEGIES[strategy1], player2: STRATEGIES[strategy2]}
+    rng = random.Random(seed)
+    for _ in range(games):
+        game_board.resetGameBoard()
+        game_board.resetDefaultTurn()
+        playGame(game_board, movers, rng)
+        game_board.updateGamesPlayed()
+    return {
+        'gamesplayed': game_board.gamesplayed,
+        'numwins': game_board.numwins,
+        'numlosses': game_board.numlosses,
+        'numties': game_board.numties,
+    }
+
+
+def mergeStats(results: list) -> dict:
+    """Adds up the counters of several batches.
+
+    Args:
+        results (list): Dicts returned by runBatch().
+
+    Returns:
+        dict: The combined counters.
+    """
+    merged = {'gamesplayed': 0, 'numwins': {}, 'numlosses': {}, 'numties': 0}
+    for result in results:
+        merged['gamesplayed'] += result['gamesplayed']
+        merged['numties'] += result['numties']
+        for key in ('numwins', 'numlosses'):
+            for player, count in result[key].items():
+                merged[key][player] = merged[key].get(player, 0) + count
+    return merged
+
+
+def runTournament(strategy1: str, strategy2: str, games: int, workers: int = None, seed: int = None,
+                  rows: int = 3, columns: int = None, winlength: int = None) -> dict:
+    """Plays games between two strategies across a process pool.
+
+    Args:
+        strategy1 (str): Name of the strategy playing 'X'.
+        strategy2 (str): Name of the strategy playing 'O'.
+        games (int): Total number of games.
+        workers (int, optional): Number of worker processes, defaulting to the CPU count.
+        seed (int, optional): Base seed for reproducible runs.
+        rows (int): Number of rows on the board.
+        columns (int, optional): Number of columns, defaulting to rows.
+        winlength (int, optional): Marks in a row needed to win, defaulting to the shorter side.
+
+    Returns:
+        dict: The merged counters, as returned by mergeStats().
+
+    Raises:
+        ValueError: If a strategy is unknown, the board shape is invalid, or the solver is
+            asked to play anything but the standard 3x3 game.
+    """
+    columns = rows if columns is None else columns
+    winlength = min(rows, columns) if winlength is None else winlength
+    if rows < 1 or columns < 1:
+        raise ValueError(f"a board cannot be {rows}x{columns}")
+    # Checks the win length here rather than in every worker.
+    BoardClass(rows, columns, winlength)
+    for name in (strategy1, strategy2):
+        if name not in STRATEGIES:
+            raise ValueError(f"unknown strategy {name!r}")
+        if name == 'solver' and (rows, columns, winlength) != (3, 3, 3):
+            raise ValueError("the solver strategy only plays 3x3 boards with a win length of 3")
+    workers = workers or os.cpu_count() or 1
+    numbatches = min(games, workers * 4) or 1
+    if seed is None:
+        seed = random.randrange(1 << 32)
+    tasks = []
+    for index in range(numbatches):
+        batchgames = games // numbatches + (1 if index < games % numbatches else 0)
+        tasks.append((strategy1, strategy2, batchgames, seed + index, rows, columns, winlength))
+    if workers == 1:
+        return mergeStats(map(runBatch, tasks))
+    with Pool(workers) as pool:
+        return mergeStats(pool.imap_unordered(runBatch, tasks))
+
+
+def main():
+    """Parses the command line, runs a tournament and prints the statistics."""
+    parser = argparse.ArgumentParser(description="Headless self-play tournament between bot strategies.")
+    parser.add_argument('strategy1', choices=sorted(STRATEGIES), help="strategy playing 'X'")
+    parser.add_argument('strategy2', choices=sorted(STRATEGIES), help="strategy playing 'O'")
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--rows', type=int, default=3)
+    parser.add_argument('--columns', type=int)
+    parser.add_argument('--winlength', type=int)
+    parser.add_argument('--json', action='store_true', help="print the counters as JSON")
+    args = parser.parse_args()
+    try:
+        stats = runTournament(args.strategy1, args.strategy2, args.games, args.workers, args.seed,
+                              args.rows, args.columns, args.winlength)
+    except ValueError as error:
+        parser.error(str(error))
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Games Played: {stats['gamesplayed']}")
+    for player in playerNames(args.strategy1, args.strategy2):
+        print(f"Number of Wins ({player}): {stats['numwins'][player]}")
+        print(f"Number of Losses ({player}): {stats['numlosses'][player]}")
+    print(f"Number of Ties: {stats['numties']}")
+
+
+if __name__ == "__main__":
+    main()
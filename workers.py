@@ -0,0 +1,447 @@
+"""This module runs the headless game server as one process per core.
+
+A single GameServer runs every connection on one event loop, and the GIL keeps a process on a
+single core. A WorkerPool instead forks one WorkerServer per core. Each worker opens its own
+listening socket on the shared port with SO_REUSEPORT, so the kernel spreads new connections
+across the workers, and each runs its own event loop, lobby and sessions. A session lives and
+dies in the worker that paired its players, so no game state is shared between processes.
+
+Workers pass clients to each other by sending the client's socket over a Unix datagram socket
+(SCM_RIGHTS) together with the token the client holds, the client's first frame and every byte
+it has sent since; the receiving worker serves it as if the client had connected to it
+directly. Two cases need this:
+
+    - A RESUME may reach the wrong worker, since a reconnecting client gets a new connection.
+      Tokens start with the index of the worker that issued them, and a worker receiving
+      another worker's token hands the client to that worker. A worker that issued a token
+      but no longer knows it passes the client on to worker 0, where it may have moved.
+    - Each worker has its own lobby, so two players could wait alone in two workers. A player
+      who has waited LOBBY_HANDOFF_S seconds in any worker but the first is handed to worker 0,
+      which keeps the player's token, so lone players always meet there.
+
+WATCH requests stay per worker: spectators find the players of the worker they landed on.
+
+The supervisor restarts any worker that exits, and every worker reports its computeStats() to
+the supervisor once a second over a pipe. The supervisor adds them up, keeping the game counts
+of workers that have exited. With --metrics-port, worker N serves its own metrics on that port
+plus N.
+
+Dependencies:
+    - multiprocessing: Forks and supervises the worker processes.
+    - socket: Passes resumed connections between workers.
+    - server: A module providing the GameServer each worker runs.
+
+Usage:
+    python server.py --port 5000 --workers 0
+    python server.py --port 5000 --workers 4 --stats-interval 10
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import secrets
+import signal
+import socket
+import time
+from multiprocessing.connection import wait
+import protocol
+from server import Connection, GameServer
+
+STATS_INTERVAL_S = 1.0
+RESTART_DELAY_S = 1.0
+LOBBY_HANDOFF_S = 2.0
+HANDOFF_SIZE = protocol.TOKEN_SIZE + 2 * (protocol.HEADER.size + protocol.MAX_PAYLOAD)
+NO_TOKEN = bytes(protocol.TOKEN_SIZE)
+MAX_WORKERS = 256
+COUNTERS = ('gamesplayed', 'numties')
+
+
+class WorkerServer(GameServer):
+    """
+    Runs one worker of a WorkerPool: a GameServer sharing its port with the other workers.
+
+    Attributes:
+        index (int): Position of the worker in the pool; the first byte of its tokens.
+        outboxes (list): Datagram sockets delivering to each worker's inbox, by index.
+        inbox (socket.socket): Datagram socket other workers pass connections to this one on.
+        statspipe (multiprocessing.connection.Connection): Pipe statistics are reported on.
+
+    Methods:
+        newToken() -> bytes: Returns a fresh session token tagged with the worker's index.
+        resume(connection, token): Resumes a session here or hands the client to its owner.
+        waitForOpponent(connection): Keeps a player in the lobby, moving it to worker 0 if it waits alone.
+        handOff(connection, frame, worker): Passes a client's socket, token and unread frames to another worker.
+        receiveHandoff(): Accepts a socket passed by another worker.
+        adopt(token, data, sock): Serves a client passed by another worker.
+        reportStats(interval): Sends computeStats() to the supervisor periodically.
+        serveWorker(): Serves until the supervisor stops the worker.
+    """
+
+    def __init__(self, index: int, outboxes: list, inbox: socket.socket, statspipe, host: str, port: int, **options):
+        """Initializes the WorkerServer instance.
+
+        Args:
+            index (int): Position of the worker in the pool.
+            outboxes (list): Datagram sockets delivering to each worker's inbox, by index.
+            inbox (socket.socket): Datagram socket other workers pass connections to this one on.
+            statspipe (multiprocessing.connection.Connection): Pipe statistics are reported on.
+            host (str): Host/IP address to listen on.
+            port (int): Port number shared by every worker.
+            **options: Further GameServer arguments.
+        """
+        super().__init__(host, port, reuseport=True, **options)
+        self.index = index
+        self.outboxes = outboxes
+        self.inbox = inbox
+        self.statspipe = statspipe
+
+
+    def newToken(self) -> bytes:
+        """Returns a fresh session token whose first byte is the worker's index.
+
+        Returns:
+            bytes: TOKEN_SIZE bytes.
+        """
+        return bytes((self.index,)) + secrets.token_bytes(protocol.TOKEN_SIZE - 1)
+
+
+    def resume(self, connection: Connection, token: bytes):
+        """Resumes a session here, or hands the client to the worker that may hold its session.
+
+        An unknown token goes to the worker that issued it, and from there to worker 0, which
+        takes in the players other workers' lobbies give up on. A client handed over already
+        carries its token on the connection, so it is never sent back the way it came.
+
+        Args:
+            connection (Connection): The new connection, which sent a RESUME frame.
+            token (bytes): The token carried by the RESUME frame.
+        """
+        owner = token[0]
+        if token not in self.tokens:
+            if owner == self.index and owner != 0:
+                self.handOff(connection, protocol.encodeResume(token), 0)
+                return
+            if owner != self.index and owner < len(self.outboxes) and connection.token is None:
+                self.handOff(connection, protocol.encodeResume(token), owner)
+                return
+        super().resume(connection, token)
+
+
+    async def waitForOpponent(self, connection: Connection):
+        """Keeps a queued player in the lobby, handing it to worker 0 if nobody pairs with it in time.
+
+        Bytes the stream has received but the lobby has not read yet are moved to the decoder
+        first, so they travel with the handoff.
+
+        Args:
+            connection (Connection): A connection queued by enqueue().
+        """
+        if self.index == 0:
+            await super().waitForOpponent(connection)
+            return
+        try:
+            await asyncio.wait_for(super().waitForOpponent(connection), LOBBY_HANDOFF_S)
+        except asyncio.TimeoutError:
+            if connection.session is None and not connection.isClosed():
+                self.matchmaker.cancel(connection)
+                self.tokens.pop(connection.token, None)
+                connection.reader.feed_eof()
+                try:
+                    connection.decoder.feed(await connection.reader.read())
+                except protocol.ProtocolError:
+                    connection.close()
+                    return
+                self.handOff(connection, protocol.encodeHello(connection.name, connection.rating), 0)
+
+
+    def handOff(self, connection: Connection, frame: bytes, worker: int):
+        """Passes a client's socket to another worker along with its token and unread frames.
+
+        The frame the client opened with is followed by every byte it has sent since that has
+        not been acted on, so nothing the client sent is lost. A client with more unread bytes
+        than a handoff holds is sent QUIT instead.
+
+        Args:
+            connection (Connection): The connection to hand off.
+            frame (bytes): The encoded HELLO or RESUME frame the other worker should act on.
+            worker (int): Index of the receiving worker.
+        """
+        sock = connection.writer.get_extra_info('socket')
+        if connection.token is not None:
+            token = connection.token
+        elif frame[1] == protocol.RESUME:
+            token = protocol.decodeToken(frame[protocol.HEADER.size:])
+        else:
+            token = NO_TOKEN
+        data = token + frame + connection.decoder.drain()
+        connection.flush()
+        try:
+            if len(data) > HANDOFF_SIZE:
+                raise OSError("too many unread bytes to hand off")
+            socket.send_fds(self.outboxes[worker], [data], [sock.fileno()])
+        except OSError:
+            connection.send(protocol.encodeQuit())
+        connection.close()
+
+
+    def receiveHandoff(self):
+        """Accepts a socket passed by another worker and schedules serving it."""
+        try:
+            data, fds, _, _ = socket.recv_fds(self.inbox, HANDOFF_SIZE, 1)
+        except (BlockingIOError, InterruptedError):
+            return
+        if fds:
+            token, data = data[:protocol.TOKEN_SIZE], data[protocol.TOKEN_SIZE:]
+            asyncio.create_task(self.adopt(None if token == NO_TOKEN else token, data, socket.socket(fileno=fds[0])))
+
+
+    async def adopt(self, token: bytes, data: bytes, sock: socket.socket):
+        """Serves a client passed by another worker, starting from the frame it opened with.
+
+        A client handed over from another worker's lobby keeps the token it was issued there.
+
+        Args:
+            token (bytes): The token the client holds, or None.
+            data (bytes): The encoded HELLO or RESUME frame followed by the client's unread bytes.
+            sock (socket.socket): The client's socket.
+        """
+        reader, writer = await asyncio.open_connection(sock=sock)
+        connection = Connection(reader, writer)
+        connection.token = token
+        try:
+            connection.decoder.feed(data)
+        except protocol.ProtocolError:
+            connection.close()
+            return
+        await self.serveClient(connection)
+
+
+    async def reportStats(self, interval: float):
+        """Sends computeStats() to the supervisor periodically.
+
+        Args:
+            interval (float): Seconds between reports.
+        """
+        while True:
+            self.statspipe.send((self.index, self.computeStats()))
+            await asyncio.sleep(interval)
+
+
+    async def serveWorker(self):
+        """Serves until the supervisor stops the worker with SIGTERM, then reports final statistics."""
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        self.inbox.setblocking(False)
+        loop.add_reader(self.inbox.fileno(), self.receiveHandoff)
+        reporter = asyncio.create_task(self.reportStats(STATS_INTERVAL_S))
+        try:
+            await self.serveForever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            reporter.cancel()
+            loop.remove_reader(self.inbox.fileno())
+            self.statspipe.send((self.index, self.computeStats()))
+
+
+def runWorker(index: int, host: str, port: int, options: dict, handoffs: list, statspipe):
+    """Runs one worker process.
+
+    Args:
+        index (int): Position of the worker in the pool.
+        host (str): Host/IP address to listen on.
+        port (int): Port number shared by every worker.
+        options (dict): Further GameServer arguments.
+        handoffs (list): (inbox, outbox) datagram socket pairs of every worker.
+        statspipe (multiprocessing.connection.Connection): Pipe statistics are reported on.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    options = dict(options)
+    if options.get('metricsport') is not None:
+        options['metricsport'] += index
+    outboxes = [outbox for inbox, outbox in handoffs]
+    server = WorkerServer(index, outboxes, handoffs[index][0], statspipe, host, port, **options)
+    asyncio.run(server.serveWorker())
+
+
+class WorkerPool():
+    """
+    Supervises one WorkerServer process per core on a shared port.
+
+    Attributes:
+        host (str): Host/IP address the workers listen on.
+        port (int): Port number shared by every worker.
+        numworkers (int): Number of worker processes.
+        options (dict): Further GameServer arguments for every worker.
+        interval (float): Seconds between printed statistics, or None to print them only at exit.
+        context (multiprocessing.context.BaseContext): Forking context the workers are started in.
+        handoffs (list): (inbox, outbox) datagram socket pairs, one per worker, kept for restarts.
+        processes (list): The process running each worker, or None while it waits to restart.
+        pipes (list): The supervisor's end of each worker's statistics pipe, or None.
+        restartat (dict): Maps the index of an exited worker to the time.monotonic() it restarts at.
+        workerstats (dict): Maps a live worker's index to its latest statistics.
+        retired (dict): Game counts of workers that have exited.
+        restarts (int): Number of times a worker has been restarted.
+        stopping (bool): True once the pool has been asked to stop.
+
+    Methods:
+        run(): Starts the workers and supervises them until interrupted.
+        spawn(index): Starts the worker of an index.
+        supervise(): Collects statistics and restarts exited workers until stopped.
+        collectStats(index): Reads every report waiting on a worker's pipe.
+        workerExited(index): Retires an exited worker and schedules its restart.
+        requestStop(signum, frame): Signal handler asking the pool to stop.
+        stop(): Stops every worker and collects their final statistics.
+        computeStats() -> dict: Returns the statistics of the whole pool.
+    """
+
+    def __init__(self, host: str, port: int, numworkers: int = 0, options: dict = None, interval: float = None):
+        """Initializes the WorkerPool instance.
+
+        Args:
+            host (str): Host/IP address the workers listen on.
+            port (int): Port number shared by every worker.
+            numworkers (int): Number of worker processes; 0 for one per core.
+            options (dict, optional): Further GameServer arguments for every worker.
+            interval (float, optional): Seconds between printed statistics.
+        """
+        self.host = host
+        self.port = port
+        self.numworkers = min(numworkers or os.cpu_count() or 1, MAX_WORKERS)
+        self.options = options or {}
+        self.interval = interval
+        self.context = multiprocessing.get_context('fork')
+        self.handoffs = [socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM) for _ in range(self.numworkers)]
+        self.processes = [None] * self.numworkers
+        self.pipes = [None] * self.numworkers
+        self.restartat = {}
+        self.workerstats = {}
+        self.retired = dict.fromkeys(COUNTERS, 0)
+        self.restarts = 0
+        self.stopping = False
+
+
+    def run(self):
+        """Starts the workers and supervises them until interrupted, then prints the final statistics."""
+        signal.signal(signal.SIGTERM, self.requestStop)
+        for index in range(self.numworkers):
+            self.spawn(index)
+        try:
+            self.supervise()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            print(json.dumps(self.computeStats()), flush=True)
+
+
+    def spawn(self, index: int):
+        """Starts the worker of an index.
+
+        Args:
+            index (int): Position of the worker in the pool.
+        """
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(target=runWorker, name=f"tictactoe-worker-{index}", daemon=True,
+                                       args=(index, self.host, self.port, self.options, self.handoffs, sender))
+        process.start()
+        sender.close()
+        self.processes[index] = process
+        self.pipes[index] = receiver
+
+
+    def supervise(self):
+        """Collects statistics and restarts exited workers until the pool is stopped."""
+        nextprint = None if self.interval is None else time.monotonic() + self.interval
+        while not self.stopping:
+            waitables = [pipe for pipe in self.pipes if pipe is not None]
+            waitables += [process.sentinel for process in self.processes if process is not None]
+            wait(waitables, timeout=0.5)
+            for index in range(self.numworkers):
+                self.collectStats(index)
+                process = self.processes[index]
+                if process is not None and not process.is_alive():
+                    self.workerExited(index)
+            now = time.monotonic()
+            for index, when in list(self.restartat.items()):
+                if when <= now and not self.stopping:
+                    del self.restartat[index]
+                    self.restarts += 1
+                    self.spawn(index)
+            if nextprint is not None and now >= nextprint:
+                print(json.dumps(self.computeStats()), flush=True)
+                nextprint = now + self.interval
+
+
+    def collectStats(self, index: int):
+        """Reads every report waiting on a worker's pipe.
+
+        Args:
+            index (int): Position of the worker in the pool.
+        """
+        pipe = self.pipes[index]
+        try:
+            while pipe is not None and pipe.poll():
+                reported, stats = pipe.recv()
+                self.workerstats[reported] = stats
+        except (EOFError, OSError):
+            pipe.close()
+            self.pipes[index] = None
+
+
+    def workerExited(self, index: int):
+        """Retires an exited worker, keeping its game counts, and schedules its restart.
+
+        Args:
+            index (int): Position of the worker in the pool.
+        """
+        self.processes[index].join()
+        self.processes[index] = None
+        self.collectStats(index)
+        if self.pipes[index] is not None:
+            self.pipes[index].close()
+            self.pipes[index] = None
+        stats = self.workerstats.pop(index, None)
+        if stats is not None:
+            for key in COUNTERS:
+                self.retired[key] += stats[key]
+        if not self.stopping:
+            self.restartat[index] = time.monotonic() + RESTART_DELAY_S
+
+
+    def requestStop(self, signum: int, frame):
+        """Signal handler asking the pool to stop."""
+        self.stopping = True
+
+
+    def stop(self):
+        """Stops every worker with SIGTERM, killing those that do not exit, and collects their final statistics."""
+        self.stopping = True
+        self.restartat.clear()
+        for process in self.processes:
+            if process is not None:
+                process.terminate()
+        for index, process in enumerate(self.processes):
+            if process is None:
+                continue
+            process.join(5.0)
+            if process.is_alive():
+                process.kill()
+            self.workerExited(index)
+
+
+    def computeStats(self) -> dict:
+        """Returns the statistics of the whole pool.
+
+        Returns:
+            dict: The workers' computeStats() added up, with the game counts of exited workers
+                included, plus the number of live workers and of restarts.
+        """
+        totals = {'sessions': 0, 'spectators': 0, 'waiting': 0}
+        totals.update(self.retired)
+        for stats in self.workerstats.values():
+            for key, value in stats.items():
+                totals[key] = totals.get(key, 0) + value
+        totals['workers'] = sum(1 for process in self.processes if process is not None)
+        totals['restarts'] = self.restarts
+        return totals